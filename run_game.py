@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
 """Standalone script to run Tic-Tac-Toe game."""
 
+import argparse
 import sys
 import os
 
@@ -10,10 +11,14 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 from tic_tac_toe.game_coordinator import play_game
 
 
-def main():
+def main(argv=None):
     """Main entry point."""
+    parser = argparse.ArgumentParser(description="Play Tic-Tac-Toe against the computer.")
+    parser.add_argument('--trace', metavar='FILE',
+                        help="record the game loop and write a Chrome trace to FILE on exit")
+    args = parser.parse_args(argv)
     try:
-        play_game()
+        play_game(trace_file=args.trace)
     except KeyboardInterrupt:
         print("\n\nGame interrupted. Thanks for playing!")
         sys.exit(0)
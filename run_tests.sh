@@ -6,5 +6,5 @@ if [ ! -d ".venv" ]; then
 fi
 
 source .venv/bin/activate
-python -m pip install -U pip pytest
+python -m pip install -U pip pytest numpy
 pytest
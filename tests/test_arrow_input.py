@@ -2,7 +2,7 @@ import pytest
 
 from tic_tac_toe.constants import PLAYER, COMPUTER, GameResult
 from tic_tac_toe.game_coordinator import TicTacToeGame
-from tic_tac_toe.input import get_arrow_move
+from tic_tac_toe.input import REDO, UNDO, get_arrow_move
 from tic_tac_toe.score_tracker import ScoreTracker, InMemoryScoreStorage
 
 
@@ -185,3 +185,15 @@ def test_draw_via_arrow_move(monkeypatch):
     assert result is not None
     assert result["reason"] == "draw"
     assert result["result"] == GameResult.DRAW
+
+
+def test_undo_and_redo_keys_only_when_offered(monkeypatch):
+    board = [[" "] * 3 for _ in range(3)]
+    key_queue = [ord("u"), ord("r")]
+    patch_curses(monkeypatch, key_queue)
+    stdscr = FakeWindow(key_queue)
+    assert get_arrow_move(stdscr, board, can_redo=True) == REDO
+
+    key_queue = [ord("u")]
+    patch_curses(monkeypatch, key_queue)
+    assert get_arrow_move(FakeWindow(key_queue), board, can_undo=True) == UNDO
@@ -0,0 +1,85 @@
+import io
+import random
+
+from tic_tac_toe.ai_strategy import HardStrategy, MediumStrategy, RandomMoveStrategy
+from tic_tac_toe.blunders import analyze_game, analyze_log, format_report
+from tic_tac_toe.constants import COMPUTER, PLAYER, Difficulty
+from tic_tac_toe.game_coordinator import TicTacToeGame
+from tic_tac_toe.game_log import append_games, game_record, iter_games
+from tic_tac_toe.headless import play_headless_game
+from tic_tac_toe.score_tracker import InMemoryScoreStorage, ScoreTracker
+from tic_tac_toe.solver import DRAW, UNREACHABLE, perfect_table
+from tic_tac_toe.tournament import run_tournament
+
+
+def test_perfect_table_solves_reachable_positions():
+    table = perfect_table()
+    assert table[0] == DRAW
+    assert sum(1 for value in table if value != UNREACHABLE) == 5478
+
+
+def test_analyze_game_grades_moves():
+    # X opens in a corner, O answers on an edge (loses), X wins via the centre.
+    moves = [[0, 0], [0, 1], [1, 1], [2, 2], [1, 0], [2, 0], [1, 2]]
+    graded = analyze_game({'moves': moves})
+    assert graded[1] == (COMPUTER, 'lost_draw')
+    assert all(kind is None for side, kind in graded if side == PLAYER)
+
+    # X's last move leaves O a winning reply on the bottom row.
+    moves = [[1, 1], [0, 1], [0, 0], [2, 2], [1, 0], [2, 1], [0, 2]]
+    assert analyze_game({'moves': moves})[6] == (PLAYER, 'threw_win')
+    # X's centre move passes up a win; X's next move then loses the draw.
+    moves = [[2, 0], [0, 0], [1, 1], [0, 2], [2, 2], [0, 1]]
+    assert [kind for _, kind in analyze_game({'moves': moves})] == [
+        None, 'lost_draw', 'missed_win', None, 'lost_draw', None]
+
+
+def test_analyze_log_reports_per_player_and_difficulty(tmp_path):
+    random.seed(36)
+    path = tmp_path / "games.jsonl"
+    records = []
+    for _ in range(20):
+        outcome = play_headless_game(HardStrategy(), MediumStrategy())
+        records.append(game_record(outcome['moves'], 'hard', 'medium', difficulty='medium'))
+        outcome = play_headless_game(RandomMoveStrategy(), HardStrategy())
+        records.append(game_record(outcome['moves'], 'easy', 'hard', difficulty='hard'))
+    append_games(path, records)
+    assert len(list(iter_games(path))) == 40
+    with open(path, 'a') as f:
+        f.write("not json\n")
+        f.write('{"x": "a", "o": "b", "moves": [[0, 0], [0, 0]]}\n')
+
+    progress = io.StringIO()
+    serial = analyze_log(path, workers=0, chunk_size=7, progress=progress)
+    assert serial['games'] == 40 and serial['skipped'] == 2
+    assert serial['players']['hard']['blunders'] == 0
+    assert serial['players']['hard']['games'] == 40
+    assert serial['difficulties']['medium']['games'] == 20
+    # Only O, the side named after the difficulty, is graded for it.
+    assert serial['difficulties']['medium']['moves'] == serial['players']['medium']['moves']
+    assert serial['difficulties']['hard']['moves'] == sum(
+        len(record['moves']) // 2 for record in records if record['difficulty'] == 'hard')
+    assert "Analyzed 40 games" in progress.getvalue()
+
+    parallel = analyze_log(path, workers=2, chunk_size=5)
+    assert parallel == serial
+    text = format_report(serial)
+    assert "medium" in text and "missed_win" in text
+
+
+def test_games_are_recorded_by_coordinator_and_tournament(tmp_path):
+    game = TicTacToeGame(score_tracker=ScoreTracker(storage=InMemoryScoreStorage()))
+    game.set_difficulty(Difficulty.HARD)
+    game.game_state.make_move(1, 1, PLAYER)
+    game.game_state.switch_player()
+    game.play_turn()
+    record = game.game_record()
+    assert record['moves'][0] == [1, 1] and len(record['moves']) == 2
+    assert record['o'] == Difficulty.HARD and record['rules'] == 'standard'
+    assert analyze_game(record)[1] == (COMPUTER, None)
+
+    random.seed(36)
+    path = tmp_path / "tournament.jsonl"
+    run_tournament(entrants={'easy': RandomMoveStrategy, 'hard': HardStrategy},
+                   games_per_pair=4, workers=0, log_path=path)
+    assert analyze_log(path, workers=0)['players']['hard']['blunders'] == 0
@@ -0,0 +1,70 @@
+import io
+
+import pytest
+
+from tic_tac_toe.ai_strategy import HardStrategy
+from tic_tac_toe.bulk_eval import evaluate_stream, main, parse_position
+
+
+def test_parse_position_validates():
+    assert parse_position("X.O..X...")[0] == ['X', ' ', 'O']
+    for text, reason in [("X.O", "square"), ("x........", "invalid cell"),
+                         ("XX.......", "one more")]:
+        with pytest.raises(ValueError, match=reason):
+            parse_position(text)
+
+
+def test_stream_keeps_input_order_and_reports_errors():
+    lines = ["X.O..X...", "", "XXX.OO...", "XOXXOOOXX", "XX.OO....", "OO.XX.X.."] * 5
+    serial = io.StringIO()
+    assert evaluate_stream(lines, serial, workers=0, chunk_size=2) == 25
+    rows = [line.split("\t") for line in serial.getvalue().splitlines()]
+    assert [row[0] for row in rows] == [line for line in lines if line]
+    assert rows[1][1:] == ["error", "the game is already over"]
+    assert rows[2][1:] == ["error", "no legal move"]
+    # X and O to move both take their win.
+    assert rows[3][1:] == ["0,2", "win"]
+    assert rows[4][1:] == ["0,2", "win"]
+
+    parallel = io.StringIO()
+    evaluate_stream(lines, parallel, workers=2, chunk_size=3)
+    assert parallel.getvalue() == serial.getvalue()
+
+
+def test_cli_reads_a_file(tmp_path, capsys):
+    path = tmp_path / "positions.txt"
+    path.write_text(".........\n" + "." * 16 + "\n")
+    main([str(path), "--strategy", "medium", "--workers", "0", "--win-length", "3"])
+    out = capsys.readouterr().out.splitlines()
+    assert out[0].startswith(".........\t") and out[0].split("\t")[2] in ("win", "draw", "loss")
+    assert out[1].split("\t")[2] == "unsolved"
+
+
+def test_win_length_applies_to_the_strategy_and_the_value():
+    out = io.StringIO()
+    evaluate_stream(["..X.O....", "X.X.O...."], out, "hard", win_length=2, workers=0)
+    rows = [line.split("\t") for line in out.getvalue().splitlines()]
+    # X and O to move both complete a pair.
+    assert rows[0][1:] in (["0,1", "win"], ["1,2", "win"])
+    assert rows[1][2] == "win"
+
+
+def test_board_size_and_strategy_failures_become_error_lines(monkeypatch):
+    for difficulty, reason in [("qubic", "Qubic rules only"), ("trained", "standard rules")]:
+        out = io.StringIO()
+        evaluate_stream(["X.O..X..."], out, difficulty, win_length=2, workers=0)
+        assert out.getvalue().split("\t")[1] == "error"
+        assert reason in out.getvalue().split("\t")[2]
+
+    monkeypatch.setattr(HardStrategy, "get_move", lambda self, board: board[9])
+    out = io.StringIO()
+    evaluate_stream(["X.O..X...", "........."], out, workers=0)
+    assert [line.split("\t")[1] for line in out.getvalue().splitlines()] == ["error", "error"]
+    assert "IndexError" in out.getvalue()
+
+
+def test_last_move_modes_are_rejected_up_front():
+    with pytest.raises(ValueError, match="previous move"):
+        evaluate_stream(["X.O..X..."], io.StringIO(), "ultimate", workers=0)
+    with pytest.raises(SystemExit):
+        main(["--strategy", "ultimate", "--workers", "0"])
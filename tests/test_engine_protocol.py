@@ -0,0 +1,72 @@
+import io
+import time
+
+from tic_tac_toe.engine_protocol import EngineProtocol
+
+
+def run(*commands):
+    out = io.StringIO()
+    EngineProtocol(out=out).run(commands)
+    return out.getvalue().splitlines()
+
+
+def test_go_blocks_threats_and_reuses_the_strategy():
+    engine = EngineProtocol(out=io.StringIO())
+    strategy = engine.strategy
+    engine.run(["isready", "position 0,0 1,1 0,1", "go", "isready",
+                "position 0,0 1,1 0,1 0,2 2,0", "go movetime 100"])
+    assert engine.out.getvalue().splitlines() == [
+        "readyok", "bestmove 0,2", "readyok", "bestmove 1,0"]
+    assert engine.strategy is strategy
+
+
+def test_errors_do_not_end_the_session():
+    assert run("bogus", "position 1,1 1,1", "position 1,1 x", "go movetime soon",
+               "strategy nope", "rules line 4", "go") == [
+        "error unknown command 'bogus'",
+        "error illegal move 1,1,O",
+        "error bad move 'x'",
+        "error invalid literal for int() with base 10: 'soon'",
+        "error unknown strategy 'nope'",
+        "error usage: rules <name> | rules line <size> <k>",
+        "bestmove 0,0",
+    ]
+    assert run("position 0,0 1,0 0,1 1,1 0,2", "go") == ["bestmove none"]
+
+
+def test_analyze_lists_move_values():
+    lines = run("position 0,0 1,1 0,1", "analyze")
+    assert "info move 0,2 value draw" in lines
+    assert "info move 2,2 value loss" in lines
+    assert lines[-1] == "info analyze done"
+
+
+def test_modes_switch_rules_and_stop_ends_the_search():
+    out = io.StringIO()
+    engine = EngineProtocol(out=out)
+    engine.run(["strategy qubic", "position 0,0"])
+    engine.strategy.max_time = None
+    start = time.perf_counter()
+    engine.handle("go")
+    engine.handle("stop")
+    assert time.perf_counter() - start < 2.0
+    assert out.getvalue().startswith("bestmove ")
+
+    lines = run("rules wild", "position 1,1,O", "go", "strategy ultimate", "position 4,4",
+                "go movetime 100", "rules line 4 3", "ponder", "stop")
+    assert lines[0].startswith("bestmove ") and lines[1].startswith("bestmove ")
+    assert lines[2] == "error The Ultimate engine supports the Ultimate rules only"
+    assert lines[3] == "info ponder done"
+
+
+def test_bad_rules_and_unexpected_errors_are_reported(monkeypatch):
+    monkeypatch.setattr(EngineProtocol, "cmd_isready",
+                        lambda self, args: [][0], raising=False)
+    lines = run("rules line -1 3", "rules line 2 5", "rules ultimate", "isready", "go")
+    assert lines == [
+        "error rules line needs size >= 1 and 1 <= k <= size",
+        "error rules line needs size >= 1 and 1 <= k <= size",
+        "error strategy hard cannot play ultimate rules",
+        "error list index out of range",
+        "bestmove 0,0",
+    ]
@@ -0,0 +1,73 @@
+import random
+
+import numpy as np
+
+from tic_tac_toe.constants import COMPUTER, PLAYER
+from tic_tac_toe.evaluation import (
+    evaluate,
+    evaluate_batch,
+    evaluate_children,
+    line_counts,
+    to_array,
+)
+
+
+def brute_force_counts(board, k, marker):
+    size = len(board)
+    other = PLAYER if marker == COMPUTER else COMPUTER
+    counts = [0] * (k + 1)
+    for dr, dc in ((0, 1), (1, 0), (1, 1), (1, -1)):
+        for r in range(size):
+            for c in range(size):
+                cells = [(r + t * dr, c + t * dc) for t in range(k)]
+                if not all(0 <= i < size and 0 <= j < size for i, j in cells):
+                    continue
+                values = [board[i][j] for i, j in cells]
+                if other in values:
+                    continue
+                n = values.count(marker)
+                if n:
+                    counts[n] += 1
+    return counts
+
+
+def random_board(rng, size, fill):
+    return [[rng.choice((PLAYER, COMPUTER)) if rng.random() < fill else " "
+             for _ in range(size)] for _ in range(size)]
+
+
+def test_line_counts_match_brute_force():
+    rng = random.Random(3)
+    for size, k in ((3, 3), (6, 4), (9, 5)):
+        boards = [random_board(rng, size, 0.3) for _ in range(5)]
+        player_counts, computer_counts = line_counts(np.stack([to_array(b) for b in boards]), k)
+        for i, board in enumerate(boards):
+            assert list(player_counts[i]) == brute_force_counts(board, k, PLAYER)
+            assert list(computer_counts[i]) == brute_force_counts(board, k, COMPUTER)
+
+
+def test_evaluation_is_antisymmetric_and_prefers_longer_lines():
+    board = [[" "] * 7 for _ in range(7)]
+    board[3][2] = board[3][3] = COMPUTER
+    board[0][0] = PLAYER
+    assert evaluate(board, 5) > 0
+    assert evaluate(board, 5, player=PLAYER) == -evaluate(board, 5)
+
+
+def test_children_match_individual_evaluation():
+    rng = random.Random(8)
+    board = random_board(rng, 9, 0.2)
+    moves = [(i, j) for i in range(9) for j in range(9) if board[i][j] == " "]
+    batched = evaluate_children(board, moves, COMPUTER, 5)
+    for move, score in zip(moves, batched):
+        child = [row[:] for row in board]
+        child[move[0]][move[1]] = COMPUTER
+        assert score == evaluate(child, 5)
+
+
+def test_completed_line_dominates():
+    board = to_array([[COMPUTER] * 3, [PLAYER, PLAYER, " "], [" ", " ", " "]])
+    empty = np.zeros((3, 3), dtype=np.int8)
+    scores = evaluate_batch(np.stack([board, empty]), 3)
+    assert scores[0] > 1e8
+    assert scores[1] == 0
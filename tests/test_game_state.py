@@ -0,0 +1,114 @@
+import pytest
+
+from tic_tac_toe.constants import COMPUTER, PLAYER
+from tic_tac_toe.game_coordinator import TicTacToeGame
+from tic_tac_toe.game_state import GameState
+from tic_tac_toe.input import REDO, UNDO
+from tic_tac_toe.score_tracker import InMemoryScoreStorage, ScoreTracker
+
+
+class FixedMoveStrategy:
+    def __init__(self, move):
+        self._move = move
+
+    def get_move(self, board):
+        return self._move
+
+
+def test_make_and_undo_restore_position():
+    state = GameState()
+    before = state.snapshot()
+    assert state.make_move(1, 1, PLAYER)
+    assert not state.make_move(1, 1, COMPUTER)
+    assert state.board[1][1] == PLAYER
+    assert state.last_move == (1, 1)
+
+    assert state.undo() == (1, 1)
+    assert state.snapshot() == before
+    assert state.last_move is None
+    assert state.undo() is None
+
+
+def test_redo_replays_undone_move_and_new_move_clears_redo():
+    state = GameState()
+    state.make_move(0, 0, PLAYER)
+    state.undo()
+    assert state.redo() == (0, 0)
+    assert state.cell(0, 0) == PLAYER
+
+    state.undo()
+    state.make_move(2, 2, PLAYER)
+    assert not state.can_redo()
+
+
+def test_value_equality_and_hash():
+    a = GameState()
+    b = GameState()
+    a.make_move(0, 1, PLAYER)
+    b.board = [[" ", PLAYER, " "], [" ", " ", " "], [" ", " ", " "]]
+    assert a == b
+    assert hash(a.snapshot()) == hash(b.snapshot())
+    assert GameState.from_snapshot(a.snapshot()) == a
+    with pytest.raises(TypeError):
+        hash(a)
+
+
+def test_board_property_returns_copy():
+    state = GameState()
+    board = state.board
+    board[0][0] = PLAYER
+    assert state.cell(0, 0) == " "
+
+
+def test_reset_clears_loaded_board():
+    state = GameState()
+    state.board = [[PLAYER] * 3 for _ in range(3)]
+    state.reset()
+    assert state.board == [[" "] * 3 for _ in range(3)]
+
+
+def test_coordinator_undo_and_redo_turn():
+    game = TicTacToeGame(score_tracker=ScoreTracker(storage=InMemoryScoreStorage()))
+    state = game.game_state
+    state.make_move(0, 0, PLAYER)
+    game._judge_move(PLAYER)
+    game.current_strategy = FixedMoveStrategy((1, 1))
+    assert game.play_turn()["reason"] == "continue"
+    assert state.is_player_turn()
+
+    assert game.undo_turn() == [(1, 1), (0, 0)]
+    assert state.is_player_turn()
+    assert state.move_count == 0
+
+    result = game.redo_turn()
+    assert result["reason"] == "continue"
+    assert state.cell(0, 0) == PLAYER
+    assert state.cell(1, 1) == COMPUTER
+    assert state.is_player_turn()
+
+
+def test_redo_restores_side_to_move():
+    state = GameState()
+    state.make_move(1, 1, PLAYER)
+    state.switch_player()
+    state.undo()
+    assert state.is_player_turn()
+    state.redo()
+    assert state.current_player == COMPUTER
+    assert state.undo() == (1, 1) and state.is_player_turn()
+
+
+def test_player_can_undo_and_redo_at_the_move_prompt():
+    answers = iter([(0, 0), UNDO, REDO])
+    game = TicTacToeGame(score_tracker=ScoreTracker(storage=InMemoryScoreStorage()),
+                         player_input=lambda board, last_move=None: next(answers))
+    game.current_strategy = FixedMoveStrategy((1, 1))
+    state = game.game_state
+    game.play_turn()
+    game.play_turn()
+
+    assert game.play_turn() == {"reason": "undo", "result": None}
+    assert state.move_count == 0 and state.is_player_turn()
+    assert game.play_turn()["reason"] == "continue"
+    assert state.moves == [(0, 0), (1, 1)]
+    assert state.is_player_turn()
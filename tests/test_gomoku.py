@@ -0,0 +1,110 @@
+import random
+
+from tic_tac_toe.ai_strategy import AIStrategyFactory, GomokuStrategy
+from tic_tac_toe.constants import COMPUTER, GOMOKU_SIZE, PLAYER, Difficulty
+from tic_tac_toe.game_coordinator import TicTacToeGame
+from tic_tac_toe.gomoku import ThreatBoard, threat_space_search
+from tic_tac_toe.rules import TicTacToeRules
+from tic_tac_toe.score_tracker import InMemoryScoreStorage, ScoreTracker
+
+
+def empty_board(size=GOMOKU_SIZE):
+    return [[" "] * size for _ in range(size)]
+
+
+def brute_force_fours(board, marker, k=5):
+    size = len(board)
+    cells = set()
+    for i in range(size):
+        for j in range(size):
+            if board[i][j] == " ":
+                board[i][j] = marker
+                if TicTacToeRules.get_line_through(board, i, j, marker, k):
+                    cells.add(i * size + j)
+                board[i][j] = " "
+    return cells
+
+
+def test_five_in_a_row_rules():
+    board = empty_board()
+    for col in range(3, 8):
+        board[4][col] = PLAYER
+    assert TicTacToeRules.get_winning_line(board, PLAYER, 5) == [(4, c) for c in range(3, 8)]
+    assert not TicTacToeRules.check_winner(board, PLAYER)
+    board[4][7] = " "
+    assert TicTacToeRules.get_winning_line(board, PLAYER, 5) is None
+
+
+def test_incremental_fours_match_brute_force():
+    rng = random.Random(11)
+    board = empty_board()
+    threats = ThreatBoard(board)
+    placed = []
+    for n in range(60):
+        index = rng.choice([i for i, c in enumerate(threats.cells) if c == " "])
+        marker = PLAYER if n % 2 else COMPUTER
+        threats.place(index, marker)
+        board[index // GOMOKU_SIZE][index % GOMOKU_SIZE] = marker
+        placed.append(index)
+        if n % 7 == 6:
+            index = placed.pop(rng.randrange(len(placed)))
+            threats.remove(index)
+            board[index // GOMOKU_SIZE][index % GOMOKU_SIZE] = " "
+        for side in (PLAYER, COMPUTER):
+            assert set(threats.fours[side]) == brute_force_fours(board, side)
+
+
+def test_candidates_stay_near_stones():
+    board = empty_board()
+    assert ThreatBoard(board).candidates() == [7 * GOMOKU_SIZE + 7]
+    board[0][0] = PLAYER
+    candidates = {divmod(i, GOMOKU_SIZE) for i in ThreatBoard(board).candidates()}
+    assert candidates == {(r, c) for r in range(3) for c in range(3)} - {(0, 0)}
+
+
+def test_threat_space_search_finds_open_three_win():
+    board = empty_board()
+    for col in (5, 6, 7):
+        board[7][col] = COMPUTER
+    board[0][0] = PLAYER
+    threats = ThreatBoard(board)
+    before = list(threats.cells)
+    index = threat_space_search(threats, COMPUTER)
+    assert divmod(index, GOMOKU_SIZE) in {(7, 4), (7, 8)}
+    assert threats.cells == before
+
+
+def test_strategy_wins_and_blocks():
+    strategy = GomokuStrategy()
+    board = empty_board()
+    for col in range(4):
+        board[2][col] = COMPUTER
+    board[9][9] = PLAYER
+    assert strategy.get_move(board) == (2, 4)
+
+    board = empty_board()
+    for row in range(3, 7):
+        board[row][10] = PLAYER
+    board[2][10] = COMPUTER
+    board[0][0] = COMPUTER
+    assert strategy.get_move(board) == (7, 10)
+
+
+def test_gomoku_mode_switches_board_and_detects_five():
+    game = TicTacToeGame(score_tracker=ScoreTracker(storage=InMemoryScoreStorage()))
+    game.set_difficulty(Difficulty.GOMOKU)
+    assert game.game_state.size == GOMOKU_SIZE
+    assert isinstance(game.current_strategy, GomokuStrategy)
+
+    board = empty_board()
+    for col in range(4):
+        board[0][col] = COMPUTER
+    game.game_state.board = board
+    game.game_state.current_player = COMPUTER
+    result = game.play_turn()
+    assert result["reason"] == "win"
+    assert game.game_state.winning_line == [(0, c) for c in range(5)]
+
+    game.set_difficulty(Difficulty.HARD)
+    assert game.game_state.size == 3
+    assert isinstance(AIStrategyFactory.create(Difficulty.GOMOKU), GomokuStrategy)
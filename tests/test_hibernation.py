@@ -0,0 +1,85 @@
+import pytest
+
+from tic_tac_toe.constants import COMPUTER, PLAYER, Difficulty
+from tic_tac_toe.game_coordinator import TicTacToeGame
+from tic_tac_toe.hibernation import SessionStore, hibernate, restore
+from tic_tac_toe.rules import get_rule_set, line_rule_set
+from tic_tac_toe.score_tracker import InMemoryScoreStorage, ScoreTracker
+from tic_tac_toe.strategy_pool import StrategyPool
+
+
+def _tracker():
+    return ScoreTracker(InMemoryScoreStorage())
+
+
+def _game(difficulty, moves, rule_set=None):
+    game = TicTacToeGame(_tracker(), rule_set=rule_set, strategy_pool=StrategyPool(table_mb=0.5))
+    game.set_difficulty(difficulty)
+    for move in moves:
+        game.play_move(move, game.game_state.current_player)
+    return game
+
+
+def _same(game, restored):
+    state, other = game.game_state, restored.game_state
+    assert other == state
+    assert other.moves == state.moves
+    assert other.last_move == state.last_move
+    assert other.game_over_reason == state.game_over_reason
+    assert other.winning_line == state.winning_line
+    assert restored.difficulty == game.difficulty
+    assert restored.rule_set is game.rule_set
+
+
+@pytest.mark.parametrize('difficulty, moves, rule_set', [
+    (Difficulty.HARD, [(1, 1), (0, 0), (2, 2)], None),
+    (Difficulty.MEDIUM, [(0, 0), (1, 0), (0, 1), (1, 1), (0, 2)], None),
+    (Difficulty.EASY, [(0, 0), (1, 1, PLAYER), (2, 2, COMPUTER)], get_rule_set('wild')),
+    (Difficulty.HARD, [(0, 0), (3, 3)], line_rule_set(4, 3)),
+    (Difficulty.ULTIMATE, [(4, 4), (3, 3), (0, 0)], None),
+    (Difficulty.GOMOKU, [(7, 7), (14, 14)], None),
+])
+def test_round_trip(difficulty, moves, rule_set):
+    game = _game(difficulty, moves, rule_set)
+    data = hibernate(game)
+    assert len(data) <= 4 + len(difficulty) + len(moves)
+    _same(game, restore(data, _tracker()))
+
+
+def test_restored_game_plays_on():
+    game = _game(Difficulty.HARD, [(1, 1)])
+    restored = restore(hibernate(game), _tracker(), strategy_pool=StrategyPool(table_mb=0.5))
+    assert restored.game_state.current_player == COMPUTER
+    assert restored.play_turn()['reason'] == 'continue'
+    undone = restored.undo_turn()
+    assert len(undone) == 2 and undone[-1] == (1, 1)
+    assert restored.game_state.moves == []
+
+
+def test_idle_sessions_hibernate_and_restore():
+    now = [0.0]
+    store = SessionStore(_tracker(), idle_timeout=10, clock=lambda: now[0],
+                         strategy_pool=StrategyPool(table_mb=0.5))
+    first = store.open('a', Difficulty.HARD)
+    first.play_move((1, 1), PLAYER)
+    now[0] = 5
+    store.open('b', Difficulty.MEDIUM)
+    now[0] = 12
+    assert store.hibernate_idle() == 1
+    assert store.stats()['live'] == 1 and store.stats()['hibernated'] == 1
+    assert store.stats()['hibernated_bytes'] == 7
+
+    restored = store.get('a')
+    assert restored is not first
+    assert restored.game_state.moves == [(1, 1)]
+    assert store.get('a') is restored
+    assert store.stats()['restores'] == 1
+    # Using 'a' pushed 'b' past the timeout.
+    now[0] = 16
+    store.get('a')
+    assert store.stats()['hibernated'] == 1 and 'b' in store
+
+    store.close('b')
+    assert 'b' not in store and len(store) == 1
+    with pytest.raises(KeyError):
+        store.get('b')
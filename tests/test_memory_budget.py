@@ -0,0 +1,34 @@
+from tic_tac_toe.constants import Difficulty
+from tic_tac_toe.memory_budget import BUDGETS, check_budgets, measure, run_budgets
+from tic_tac_toe.transposition import TranspositionTable
+
+
+def test_strategies_stay_within_budgets():
+    results = run_budgets(repeat=3)
+    assert set(results) == set(BUDGETS)
+    assert check_budgets(results) == []
+
+
+def test_measure_reports_peaks_and_growth():
+    held = []
+
+    def leak():
+        held.append(bytearray(10_000))
+
+    result = measure(leak, repeat=5)
+    assert result['retained_bytes'] >= 10_000
+    assert result['peak_bytes'] >= 90_000
+
+    result = measure(lambda: bytearray(50_000), repeat=5)
+    assert result['retained_bytes'] < 1_000
+    assert result['peak_bytes'] >= 50_000
+
+    failures = check_budgets({(Difficulty.EASY, 'get_move'): result})
+    assert len(failures) == 1 and failures[0].startswith("easy/get_move: peak_bytes")
+
+
+def test_clearing_the_transposition_table_does_not_allocate():
+    table = TranspositionTable(max_mb=1.0)
+    table.store(12345, 1, 3)
+    assert measure(table.clear, repeat=3)['peak_bytes'] < 4_096
+    assert table.probe(12345) is None and table.filled == 0
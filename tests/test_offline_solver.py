@@ -0,0 +1,92 @@
+import os
+
+import pytest
+
+from tic_tac_toe.ai_strategy import HardStrategy, RandomMoveStrategy
+from tic_tac_toe.constants import COMPUTER, PLAYER
+from tic_tac_toe.headless import play_headless_game
+from tic_tac_toe.offline_solver import (TABLE_FILE, enumerate_prefixes, merge_parts,
+                                        part_path, read_part, solve_parts, solve_prefix)
+from tic_tac_toe.rules import get_rule_set, line_rule_set
+from tic_tac_toe.solver import (WIN, install_table, installed_table, load_table, save_table,
+                                solve)
+from tic_tac_toe.strategy_pool import StrategyPool
+
+
+def test_prefixes_are_distinct_positions():
+    rules = line_rule_set(3)
+    assert len(enumerate_prefixes(rules, 2)) == 72
+    # X-O-X and X'-O-X' orders reach the same position once.
+    assert len(enumerate_prefixes(rules, 3)) == 252
+
+
+def test_partitioned_solve_resumes_and_merges(tmp_path):
+    out = str(tmp_path / "solve")
+    assert solve_parts(3, 3, out, workers=0) == 72
+    os.remove(part_path(out, (4, 0)))
+    assert solve_parts(3, 3, out, workers=1) == 1
+    assert solve_parts(3, 3, out, workers=0) == 0
+
+    table = merge_parts(3, 3, out)
+    assert table == solve()
+    assert load_table(os.path.join(out, TABLE_FILE)) == table
+
+    with pytest.raises(ValueError):
+        solve_parts(3, 3, out, prefix_depth=3, workers=0)
+
+
+def test_small_board_win_for_first_player(tmp_path):
+    out = str(tmp_path / "solve")
+    solve_parts(3, 2, out, prefix_depth=1, workers=0)
+    assert merge_parts(3, 2, out, prefix_depth=1)[0] == WIN
+
+
+def test_hard_strategy_plays_from_solved_table():
+    strategy = HardStrategy(line_rule_set(3), solved=solve())
+    for _ in range(20):
+        assert play_headless_game(strategy, RandomMoveStrategy())['winner'] != COMPUTER
+        assert play_headless_game(RandomMoveStrategy(), strategy)['winner'] != PLAYER
+    with pytest.raises(ValueError):
+        HardStrategy(line_rule_set(4, 3), solved=solve())
+    with pytest.raises(ValueError):
+        HardStrategy(solved=solve())
+
+
+def test_saved_table_keeps_its_win_length(tmp_path):
+    path = str(tmp_path / "table.bin")
+    save_table(solve(line_rule_set(3, 2)), path)
+    table = load_table(path)
+    assert table.win_length == 2
+    HardStrategy(line_rule_set(3, 2), solved=table)
+    with pytest.raises(ValueError, match="win length"):
+        HardStrategy(line_rule_set(3), solved=table)
+
+    # Files without the header are not accepted.
+    with open(path, 'wb') as f:
+        solve().tofile(f)
+    with pytest.raises(ValueError):
+        load_table(path)
+
+
+def test_worker_table_is_kept_per_board_size(tmp_path):
+    # 2x2 and 3x3 two-in-a-row share a rule set name; a pool worker may
+    # solve prefixes of both.
+    solve_prefix(2, 2, (0,), str(tmp_path))
+    assert solve_prefix(3, 2, (4,), str(tmp_path)) > 0
+    table = solve(line_rule_set(3, 2))
+    codes, values = read_part(part_path(str(tmp_path), (4,)))
+    assert all(table[code] == value for code, value in zip(codes, values))
+
+
+def test_pool_gives_hard_the_installed_table(tmp_path):
+    rules = line_rule_set(3, 2)
+    directory = str(tmp_path / "solved")
+    assert installed_table(rules, directory) is None
+    install_table(solve(rules), directory)
+    assert installed_table(rules, directory).win_length == 2
+    assert installed_table(get_rule_set("misere"), directory) is None
+
+    pool = StrategyPool(table_mb=0.5, solved_dir=directory)
+    assert pool.create("hard", rules).solved is installed_table(rules, directory)
+    assert pool.create("hard").solved is None
+    assert StrategyPool(table_mb=0.5, solved_dir=None).create("hard", rules).solved is None
@@ -0,0 +1,100 @@
+import io
+import sys
+
+import pytest
+
+from tic_tac_toe.ai_strategy import MediumStrategy, RandomMoveStrategy
+from tic_tac_toe.constants import PLAYER
+from tic_tac_toe.game_log import append_games, game_record
+from tic_tac_toe.headless import new_board, play_headless_game
+from tic_tac_toe.position_index import PositionIndex, main
+
+
+def test_symmetric_openings_share_one_entry():
+    index = PositionIndex()
+    # X wins down the left column, then the same game mirrored to the right.
+    index.add_game(game_record([[0, 0], [1, 1], [1, 0], [0, 1], [2, 0]], 'a', 'b'))
+    index.add_game(game_record([[0, 2], [1, 1], [1, 2], [0, 1], [2, 2]], 'a', 'b'))
+    # X opens on an edge and the game is drawn.
+    index.add_game(game_record([[0, 1], [0, 0], [0, 2], [1, 1], [2, 2], [1, 2],
+                                [1, 0], [2, 0], [2, 1]], 'a', 'b'))
+
+    empty = index.stats(new_board())
+    assert (empty['games'], empty['x_wins'], empty['draws'], empty['o_wins']) == (3, 2, 1, 0)
+    assert [(move['move'], move['games']) for move in empty['moves']] == [((0, 0), 2), ((0, 1), 1)]
+
+    board = new_board()
+    board[2][2] = PLAYER  # Another corner: the same canonical position
+    corner = index.stats(board)
+    assert corner['games'] == 2 and corner['x_wins'] == 2
+    assert [move['move'] for move in corner['moves']] == [(1, 1)]
+    assert index.position_count() == 6 + 9
+
+
+def test_unfinished_illegal_and_unindexable_games_are_skipped():
+    index = PositionIndex()
+    assert not index.add_game(game_record([[0, 0], [1, 1]], 'a', 'b'))
+    assert not index.add_game(game_record([[0, 0], [0, 0]], 'a', 'b'))
+    assert not index.add_game(game_record([[0, 0]], 'a', 'b', rules='ultimate'))
+    assert not index.add_game({'moves': 'bad'})
+    assert index.games == 0 and index.skipped == 4
+
+
+def test_update_reads_only_new_games_and_filters_by_difficulty(tmp_path):
+    path = tmp_path / "games.jsonl"
+    index = PositionIndex()
+    records = []
+    for _ in range(30):
+        outcome = play_headless_game(RandomMoveStrategy(), MediumStrategy())
+        records.append(game_record(outcome['moves'], 'human', 'medium', difficulty='medium'))
+    append_games(path, records)
+    assert index.update(path) == 30
+    assert index.update(path) == 0
+
+    outcome = play_headless_game(RandomMoveStrategy(), RandomMoveStrategy())
+    append_games(path, [game_record(outcome['moves'], 'human', 'easy', difficulty='easy')])
+    with open(path, 'a') as f:
+        f.write('{"moves": [[1, 1]')  # Still being written
+    assert index.update(path) == 1
+    assert index.stats(new_board())['games'] == 31
+    medium = index.stats(new_board(), difficulty='medium')
+    assert medium['games'] == 30
+    assert sum(move['games'] for move in medium['moves']) == 30
+    assert index.stats(new_board(), rules='misere')['games'] == 0
+
+    with open(path, 'a') as f:
+        f.write(', [0, 0], [2, 2], [0, 2], [0, 1], [2, 1], [1, 0], [1, 2], [2, 0]]}\n')
+    assert index.update(path) == 1
+    assert index.games == 32
+
+
+def test_saved_index_continues_where_it_stopped(tmp_path, monkeypatch):
+    log = tmp_path / "games.jsonl"
+    saved = tmp_path / "index.json"
+    append_games(log, [game_record([[1, 1], [0, 0], [2, 2], [0, 2], [0, 1], [2, 1],
+                                    [1, 0], [1, 2], [2, 0]], 'a', 'b', difficulty='hard')])
+    index = PositionIndex()
+    index.update(log)
+    index.save(saved)
+    loaded = PositionIndex.load(saved)
+    assert loaded.stats(new_board()) == index.stats(new_board())
+    assert loaded.update(log) == 0
+
+    out = io.StringIO()
+    monkeypatch.setattr(sys, 'stdout', out)
+    main([str(log), '1,1', '--index', str(saved), '--difficulty', 'hard'])
+    lines = out.getvalue().splitlines()
+    assert lines[1].split()[:2] == ['(all)', '1']
+    assert lines[2].split()[0] in ('0,0', '0,2', '2,0', '2,2')
+
+
+@pytest.mark.parametrize('token, reason', [
+    ('1', 'not row,col'), ('a,b', 'not row,col'), ('3,0', 'off the 3x3 board'),
+    ('0,-1', 'off the 3x3 board'), ('1,1 1,1', 'occupied'),
+])
+def test_bad_moves_are_usage_errors(tmp_path, capsys, token, reason):
+    log = tmp_path / "games.jsonl"
+    log.write_text("")
+    with pytest.raises(SystemExit):
+        main([str(log), *token.split()])
+    assert reason in capsys.readouterr().err
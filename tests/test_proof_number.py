@@ -0,0 +1,75 @@
+import pytest
+
+from tic_tac_toe.ai_strategy import SolveStrategy
+from tic_tac_toe.constants import COMPUTER, GOMOKU_SIZE, PLAYER, Difficulty
+from tic_tac_toe.game_coordinator import TicTacToeGame
+from tic_tac_toe.proof_number import DISPROVEN, PROVEN, UNKNOWN, ProofNumberSearch
+from tic_tac_toe.rules import get_rule_set, line_rule_set
+from tic_tac_toe.score_tracker import InMemoryScoreStorage, ScoreTracker
+
+
+def empty_board(size=GOMOKU_SIZE):
+    return [[" "] * size for _ in range(size)]
+
+
+def test_standard_board_is_not_a_win():
+    search = ProofNumberSearch(get_rule_set('standard'))
+    assert search.search(empty_board(3)) == (DISPROVEN, None)
+
+
+def test_proven_move_wins_against_every_reply():
+    rules = line_rule_set(4, 3)
+    result, (row, col) = ProofNumberSearch(rules).search(empty_board(4))
+    assert result == PROVEN
+
+    board = empty_board(4)
+    board[row][col] = COMPUTER
+    for r in range(4):
+        for c in range(4):
+            if board[r][c] == " ":
+                board[r][c] = PLAYER
+                assert ProofNumberSearch(rules).search(board)[0] == PROVEN
+                board[r][c] = " "
+
+
+def test_open_three_on_gomoku_board():
+    board = empty_board()
+    for col in (5, 6, 7):
+        board[7][col] = COMPUTER
+    board[0][0] = PLAYER
+    result, move = ProofNumberSearch(line_rule_set(GOMOKU_SIZE, 5)).search(board)
+    assert result == PROVEN
+    assert move in {(7, 3), (7, 4), (7, 8), (7, 9)}
+
+
+def test_node_budget_and_stop_give_unknown():
+    rules = line_rule_set(5, 4)
+    assert ProofNumberSearch(rules, max_nodes=500).search(empty_board(5)) == (UNKNOWN, None)
+
+    search = ProofNumberSearch(rules)
+    assert search.search(empty_board(5), stop=lambda: True) == (UNKNOWN, None)
+    assert search.expanded < 100
+
+
+def test_unsupported_rules():
+    for name in ('misere', 'wild', 'ultimate', 'qubic'):
+        with pytest.raises(ValueError):
+            ProofNumberSearch(get_rule_set(name))
+
+
+def test_strategy_falls_back_to_blocking():
+    strategy = SolveStrategy(max_nodes=2000)
+    board = empty_board()
+    for row in range(3, 7):
+        board[row][10] = PLAYER
+    board[2][10] = COMPUTER
+    board[0][0] = COMPUTER
+    assert strategy.get_move(board) == (7, 10)
+    assert strategy.last_result != PROVEN
+
+
+def test_solve_mode_uses_gomoku_board():
+    game = TicTacToeGame(score_tracker=ScoreTracker(storage=InMemoryScoreStorage()))
+    game.set_difficulty(Difficulty.SOLVE)
+    assert game.game_state.size == GOMOKU_SIZE
+    assert isinstance(game.current_strategy, SolveStrategy)
@@ -0,0 +1,95 @@
+import random
+
+from tic_tac_toe.ai_strategy import AIStrategyFactory, QubicStrategy
+from tic_tac_toe.board import print_layers
+from tic_tac_toe.constants import COMPUTER, PLAYER, Difficulty, GameResult
+from tic_tac_toe.game_coordinator import TicTacToeGame
+from tic_tac_toe.headless import new_board
+from tic_tac_toe.qubic import (CELLS, GRID_SIZE, LINES, LINES_THROUGH, QubicBoard,
+                               cube_index, find_forced_win, grid_cell, search_move)
+from tic_tac_toe.rules import QUBIC, get_rule_set
+from tic_tac_toe.score_tracker import InMemoryScoreStorage, ScoreTracker
+
+
+def test_seventy_six_lines_indexed_by_cell():
+    assert len(LINES) == 76
+    assert len(set(LINES)) == 76
+    assert sum(len(lines) for lines in LINES_THROUGH) == 76 * 4
+    # Corners and the eight central cells lie on seven lines, the rest on four.
+    sevens = {index for index in range(CELLS) if len(LINES_THROUGH[index]) == 7}
+    assert len(sevens) == 16 and 0 in sevens and 21 in sevens
+    assert all(cube_index(*grid_cell(index)) == index for index in range(CELLS))
+
+
+def test_line_counts_and_threats_stay_incremental():
+    rng = random.Random(5)
+    position = QubicBoard()
+    played = []
+    for n in range(30):
+        index = rng.choice(position.moves())
+        marker = PLAYER if n % 2 == 0 else COMPUTER
+        position.play(index, marker)
+        played.append((index, marker))
+    for index, marker in reversed(played[10:]):
+        position.undo(index, marker)
+    fresh = QubicBoard()
+    for index, marker in played[:10]:
+        fresh.play(index, marker)
+    assert position.counts == fresh.counts and position.bits == fresh.bits
+
+
+def test_engine_wins_blocks_and_finds_forced_wins():
+    position = QubicBoard()
+    for index in (0, 1, 2):
+        position.play(index, COMPUTER)
+    assert search_move(position, COMPUTER, max_time=None, max_depth=2) == 3
+
+    position = QubicBoard()
+    for index in (0, 21, 42):
+        position.play(index, PLAYER)
+    position.play(5, COMPUTER)
+    assert search_move(position, COMPUTER, max_time=None, max_depth=2) == 63
+
+    # Two lines through cell 3 share it: playing there threatens both ends.
+    position = QubicBoard()
+    for index in (0, 1, 7, 11):
+        position.play(index, COMPUTER)
+    for index in (40, 50, 60, 33):
+        position.play(index, PLAYER)
+    index = find_forced_win(position, COMPUTER)
+    assert index is not None
+    position.play(index, COMPUTER)
+    assert len(position.threats(COMPUTER)) >= 2
+
+
+def test_qubic_mode_in_coordinator(capsys):
+    game = TicTacToeGame(score_tracker=ScoreTracker(storage=InMemoryScoreStorage()))
+    game.set_difficulty(Difficulty.QUBIC)
+    assert game.game_state.size == GRID_SIZE
+    assert isinstance(game.current_strategy, QubicStrategy)
+    assert isinstance(AIStrategyFactory.create(Difficulty.QUBIC), QubicStrategy)
+
+    # A vertical line through all four layers.
+    board = new_board(GRID_SIZE)
+    for layer in range(3):
+        row, col = grid_cell(layer * 16 + 5)
+        board[row][col] = COMPUTER
+    board[0][0] = board[0][1] = board[0][2] = PLAYER
+    game.game_state.board = board
+    game.game_state.current_player = COMPUTER
+    result = game.play_turn()
+    assert result["result"] == GameResult.COMPUTER_WIN
+    assert game.game_state.winning_line == sorted(grid_cell(l * 16 + 5) for l in range(4))
+
+    game.display_board()
+    out = capsys.readouterr().out
+    assert all(f"Layer {n}" in out for n in range(1, 5))
+    assert len(get_rule_set(QUBIC).lines) == 76
+
+
+def test_print_layers_splits_quadrants(capsys):
+    board = new_board(GRID_SIZE)
+    board[4][4] = PLAYER
+    print_layers(board, 4)
+    layers = capsys.readouterr().out.split("Layer")[1:]
+    assert [PLAYER in layer for layer in layers] == [False, False, False, True]
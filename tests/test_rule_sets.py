@@ -0,0 +1,117 @@
+from tic_tac_toe.ai_strategy import (HardStrategy, MediumStrategy, RandomMoveStrategy,
+                                     ValueTableStrategy, find_winning_move)
+from tic_tac_toe.constants import COMPUTER, PLAYER, Difficulty, GameResult
+from tic_tac_toe.game_coordinator import TicTacToeGame
+from tic_tac_toe.headless import new_board, play_headless_game
+from tic_tac_toe.rules import (MISERE, STANDARD, WILD, RuleSet, TicTacToeRules,
+                               get_rule_set, line_rule_set)
+from tic_tac_toe.score_tracker import InMemoryScoreStorage, ScoreTracker
+
+import pytest
+
+
+def new_game(rule_set=None):
+    return TicTacToeGame(score_tracker=ScoreTracker(storage=InMemoryScoreStorage()),
+                         rule_set=rule_set)
+
+
+def test_compiled_lines_match_rules():
+    rules = get_rule_set(STANDARD)
+    assert len(rules.lines) == 8
+    assert all(len(rules.masks_through[i]) == n
+               for i, n in enumerate((3, 2, 3, 2, 4, 2, 3, 2, 3)))
+    board = [["X", "O", " "], ["O", "X", " "], [" ", " ", "X"]]
+    assert rules.completed_line(board, 2, 2) == [(0, 0), (1, 1), (2, 2)]
+    assert rules.completed_line(board, 0, 1) is None
+    assert TicTacToeRules.get_winning_line(board, "X") == [(0, 0), (1, 1), (2, 2)]
+    assert line_rule_set() is rules
+    assert len(line_rule_set(4, 3).lines) == 24
+
+
+def test_legacy_win_checks_read_the_rule_set_tables():
+    board = new_board(4)
+    for row, col in ((0, 1), (1, 2), (2, 3)):
+        board[row][col] = "X"
+    assert TicTacToeRules.get_winning_line(board, "X", 3) == [(0, 1), (1, 2), (2, 3)]
+    assert TicTacToeRules.get_line_through(board, 1, 2, "X", 3) == \
+        line_rule_set(4, 3).completed_line(board, 1, 2)
+    assert TicTacToeRules.get_line_through(board, 1, 2, "O", 3) is None
+    assert not TicTacToeRules.check_winner(board, "X")
+
+
+def test_custom_lines_only_count_listed_cells():
+    corners = RuleSet("corners", lines=[[(0, 0), (0, 2), (2, 0), (2, 2)]])
+    board = [["O", "O", "O"], [" ", " ", " "], ["O", " ", "O"]]
+    assert corners.completed_line(board, 0, 1) is None
+    assert corners.completed_line(board, 2, 2) == [(0, 0), (0, 2), (2, 0), (2, 2)]
+    assert find_winning_move([["O", " ", "O"], [" "] * 3, ["O", " ", " "]],
+                             COMPUTER, rule_set=corners) == (2, 2)
+
+
+def test_misere_strategies_avoid_completing_lines():
+    board = [["O", "O", " "], ["X", "X", " "], [" ", " ", " "]]
+    rules = get_rule_set(MISERE)
+    assert MediumStrategy(rules).get_move(board) != (0, 2)
+    assert HardStrategy(rules).get_move(board) != (0, 2)
+
+
+def test_misere_perfect_play_draws_and_loser_completes_line():
+    rules = get_rule_set(MISERE)
+    outcome = play_headless_game(HardStrategy(rules), HardStrategy(rules), rule_set=rules)
+    assert outcome["winner"] is None
+
+    board = [["X", "X", " "], ["O", "O", "X"], ["O", "X", "O"]]
+    outcome = play_headless_game(HardStrategy(rules), HardStrategy(rules),
+                                 board=board, rule_set=rules)
+    assert outcome["reason"] == "win" and outcome["winner"] == COMPUTER
+
+
+def test_wild_first_player_wins_with_either_marker():
+    rules = get_rule_set(WILD)
+    outcome = play_headless_game(HardStrategy(rules), HardStrategy(rules), rule_set=rules)
+    assert outcome["reason"] == "win" and outcome["winner"] == PLAYER
+
+    board = [["X", "X", " "], [" ", " ", " "], [" ", " ", " "]]
+    move = HardStrategy(rules).get_move(board)
+    assert move == (0, 2, PLAYER)
+    random_moves = {RandomMoveStrategy(rules).get_move(new_board()) for _ in range(50)}
+    assert any(len(move) == 3 for move in random_moves)
+
+
+def test_headless_rejects_markers_the_rules_forbid():
+    class PlacesOpponentMarker:
+        def get_move(self, board):
+            return (0, 0, PLAYER)
+
+    outcome = play_headless_game(PlacesOpponentMarker(), HardStrategy())
+    assert outcome["reason"] == "forfeit" and outcome["winner"] == COMPUTER
+
+
+def test_coordinator_scores_misere_and_wild_results():
+    game = new_game(get_rule_set(MISERE))
+    game.set_difficulty(Difficulty.HARD)
+    assert game.current_strategy.rule_set is get_rule_set(MISERE)
+    game.game_state.board = [["O", "O", " "], ["X", "X", " "], [" ", " ", " "]]
+    game.game_state.current_player = COMPUTER
+    result = game.play_turn()
+    assert result["reason"] == "continue"
+    assert game.game_state.board[0][2] == " "
+
+    game.game_state.board = [["O", "O", " "], ["X", "X", "O"], ["X", "O", "X"]]
+    game.game_state.current_player = COMPUTER
+    result = game.play_turn()
+    assert result["result"] == GameResult.PLAYER_WIN
+
+    game = new_game(get_rule_set(WILD))
+    game.set_difficulty(Difficulty.HARD)
+    game.game_state.board = [["X", "X", " "], [" ", "O", " "], [" ", " ", "O"]]
+    game.game_state.current_player = COMPUTER
+    result = game.play_turn()
+    assert result["result"] == GameResult.COMPUTER_WIN
+    game.undo_turn()
+    assert game.game_state.current_player == COMPUTER
+
+
+def test_value_table_rejects_other_rules():
+    with pytest.raises(ValueError):
+        ValueTableStrategy(rule_set=get_rule_set(MISERE))
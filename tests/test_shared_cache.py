@@ -0,0 +1,99 @@
+import io
+import multiprocessing
+from multiprocessing import shared_memory
+
+import pytest
+
+from tic_tac_toe.ai_strategy import HardStrategy
+from tic_tac_toe.bulk_eval import evaluate_stream
+from tic_tac_toe.constants import COMPUTER, PLAYER
+from tic_tac_toe.shared_cache import SharedTranspositionTable
+from tic_tac_toe.transposition import EXACT, LOWER, NO_MOVE, UPPER
+
+
+@pytest.fixture
+def table():
+    with SharedTranspositionTable.create(max_mb=0.01, bucket_size=2) as shared:
+        yield shared
+
+
+def _store_from_child(name, keys):
+    shared = SharedTranspositionTable.attach(name)
+    for key in keys:
+        shared.store(key, -key % 7, 3, UPPER, 5)
+    shared.close()
+
+
+def test_entries_round_trip(table):
+    table.store(2 ** 64 - 1, -123456, 300, LOWER, NO_MOVE)
+    table.store(42, 2, 0, EXACT, 449)
+    assert table.probe(2 ** 64 - 1) == (-123456, 300, LOWER, NO_MOVE)
+    assert table.probe(42) == (2, 0, EXACT, 449)
+    assert table.probe(43) is None
+    table.store(42, -1, 1, UPPER, 3)
+    assert table.probe(42) == (-1, 1, UPPER, 3)
+    assert table.stats()['filled'] == 2
+
+
+def test_other_processes_share_the_entries(table):
+    keys = list(range(1000, 1100, 7))
+    child = multiprocessing.Process(target=_store_from_child, args=(table.name, keys))
+    child.start()
+    child.join()
+    assert child.exitcode == 0
+    reader = SharedTranspositionTable.attach(table.name)
+    assert all(reader.probe(key) == (-key % 7, 3, UPPER, 5) for key in keys)
+    reader.close()
+
+
+def test_torn_entry_reads_as_a_miss(table):
+    table.store(99, 1, 4)
+    slot = next(slot for slot in range(table.capacity) if table._meta[slot])
+    # A racing store of another result has replaced only the data word.
+    table._data[slot] ^= 1 << 40
+    assert table.probe(99) is None
+
+
+def test_earlier_generations_are_evicted_first(table):
+    bucket = table.bucket_count
+    table.store(bucket, 0, 9)
+    table.new_generation()
+    table.store(2 * bucket, 0, 1)
+    table.store(3 * bucket, 0, 5)
+    assert table.probe(bucket) is None
+    assert table.probe(2 * bucket) is not None
+    assert table.stats()['evictions'] == 1
+    table.clear()
+    assert table.stats()['filled'] == 0 and table.generation == 1
+
+
+def test_attach_rejects_other_blocks():
+    block = shared_memory.SharedMemory(create=True, size=4096)
+    try:
+        with pytest.raises(ValueError):
+            SharedTranspositionTable.attach(block.name)
+    finally:
+        block.close()
+        block.unlink()
+
+
+def test_hard_strategy_searches_with_shared_table():
+    with SharedTranspositionTable.create(max_mb=1.0) as shared:
+        strategy = HardStrategy(table=shared, keep_cache=True)
+        board = [[PLAYER, PLAYER, ' '],
+                 [COMPUTER, ' ', ' '],
+                 [' ', ' ', ' ']]
+        assert strategy.get_move(board) == (0, 2)
+        assert shared.stats()['stores'] > 0
+        second = HardStrategy(table=SharedTranspositionTable.attach(shared.name))
+        assert second.get_move(board) == (0, 2)
+        assert second.table.stats()['misses'] == 0
+        second.table.close()
+
+
+def test_bulk_eval_workers_share_one_cache():
+    lines = ["X.O..X...", "XO.......", "X...O....", ".........", "X.O..X..."] * 4
+    private, shared = io.StringIO(), io.StringIO()
+    evaluate_stream(lines, private, workers=2, chunk_size=3)
+    evaluate_stream(lines, shared, workers=2, chunk_size=3, shared_cache_mb=1.0)
+    assert shared.getvalue() == private.getvalue()
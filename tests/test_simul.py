@@ -0,0 +1,72 @@
+import random
+
+from tic_tac_toe.ai_strategy import HardStrategy, UltimateStrategy
+from tic_tac_toe.constants import Difficulty, GameResult
+from tic_tac_toe.headless import new_board
+from tic_tac_toe.rules import get_rule_set
+from tic_tac_toe.score_tracker import InMemoryScoreStorage, ScoreTracker
+from tic_tac_toe.simul import SimulGame
+from tic_tac_toe.strategy_pool import StrategyPool
+
+
+def _simul(boards, difficulty=Difficulty.HARD, workers=0):
+    return SimulGame(ScoreTracker(InMemoryScoreStorage()), boards, difficulty,
+                     workers=workers, strategy_pool=StrategyPool(table_mb=0.5))
+
+
+def test_identical_boards_are_searched_once(monkeypatch):
+    calls = []
+    original = HardStrategy.get_move
+    monkeypatch.setattr(HardStrategy, 'get_move',
+                        lambda self, board: calls.append(1) or original(self, board))
+    with _simul(6) as simul:
+        for index in range(6):
+            simul.player_move(index, (0, 0) if index < 4 else (1, 1))
+        assert simul.waiting_for_player() == []
+        replies = simul.reply_all()
+    assert [index for index, _, _ in replies] == list(range(6))
+    assert replies[0][1] == (1, 1)
+    assert len(calls) == 2
+
+
+def test_moves_only_where_it_is_the_players_turn():
+    with _simul(2) as simul:
+        assert simul.player_move(0, (1, 1))['reason'] == 'continue'
+        assert simul.player_move(0, (0, 0)) is None
+        assert simul.player_move(1, (5, 5)) is None
+        assert simul.pending_replies() == [0]
+        assert len(simul.reply_all()) == 1
+        assert simul.waiting_for_player() == [0, 1]
+
+
+def test_full_simul_records_every_board():
+    rng = random.Random(3)
+    tracker = ScoreTracker(InMemoryScoreStorage())
+    with SimulGame(tracker, 5, Difficulty.HARD, strategy_pool=StrategyPool(table_mb=0.5)) as simul:
+        while not simul.finished:
+            for index in simul.waiting_for_player():
+                board = simul.games[index].game_state.board
+                empty = [(r, c) for r in range(3) for c in range(3) if board[r][c] == ' ']
+                simul.player_move(index, rng.choice(empty))
+            simul.reply_all()
+    assert tracker.total_games == 5
+    assert GameResult.PLAYER_WIN not in simul.results
+
+
+def test_worker_pool_matches_in_process_moves():
+    replies = []
+    for workers in (0, 2):
+        with _simul(4, workers=workers) as simul:
+            for index, move in enumerate([(0, 0), (0, 1), (1, 1), (2, 2)]):
+                simul.player_move(index, move)
+            replies.append(simul.reply_all())
+    assert [move for _, move, _ in replies[0]] == [move for _, move, _ in replies[1]]
+
+
+def test_default_batch_passes_last_moves():
+    rules = get_rule_set('ultimate')
+    strategy = UltimateStrategy(rule_set=rules, max_depth=1)
+    board = new_board(9)
+    board[4][4] = 'X'
+    moves = strategy.get_moves([board, board], last_moves=[(4, 4), (4, 4)])
+    assert all(3 <= row < 6 and 3 <= col < 6 for row, col in moves)
@@ -0,0 +1,66 @@
+import threading
+
+from tic_tac_toe import game_coordinator
+from tic_tac_toe.constants import COMPUTER, PLAYER, Difficulty
+from tic_tac_toe.game_coordinator import TicTacToeGame
+from tic_tac_toe.headless import new_board
+from tic_tac_toe.score_tracker import InMemoryScoreStorage, ScoreTracker
+from tic_tac_toe.spectator import SpectatorHub
+
+
+def test_updates_are_encoded_once_for_every_subscriber():
+    hub = SpectatorHub()
+    hub.reset(new_board())
+    subscribers = [hub.subscribe() for _ in range(2000)]
+    hub.publish(1, 1, PLAYER)
+    hub.publish(0, 0, COMPUTER)
+    first = subscribers[0].poll()
+    assert first == [b"1 board ......... continue\n",
+                     b"2 move 1,1 X continue\n", b"3 move 0,0 O continue\n"]
+    for subscription in subscribers[1:]:
+        received = subscription.poll()
+        assert all(a is b for a, b in zip(received, first))
+    assert subscribers[0].poll() == []
+
+
+def test_slow_subscriber_gets_one_coalesced_keyframe():
+    hub = SpectatorHub(max_pending=4)
+    hub.reset(new_board(5))
+    slow = hub.subscribe()
+    fast = hub.subscribe(max_pending=100)
+    for index in range(10):
+        hub.publish(*divmod(index, 5), PLAYER if index % 2 == 0 else COMPUTER)
+    assert slow.coalesced == 1
+    assert slow.poll() == [b"11 board XOXOXOXOXO............... continue\n"]
+    assert len(fast.poll()) == 11
+    hub.publish(2, 0, PLAYER)
+    assert slow.poll() == [b"12 move 2,0 X continue\n"]
+
+
+def test_wait_wakes_on_publish_and_close_unsubscribes():
+    hub = SpectatorHub()
+    hub.reset(new_board())
+    subscription = hub.subscribe()
+    subscription.poll()
+    threading.Timer(0.02, hub.publish, (2, 2, PLAYER)).start()
+    assert subscription.wait(timeout=2) == [b"2 move 2,2 X continue\n"]
+    assert subscription.wait(timeout=0.01) == []
+    subscription.close()
+    assert hub.subscriber_count == 0
+
+
+def test_coordinator_publishes_moves_and_undo(monkeypatch):
+    monkeypatch.setattr(game_coordinator, "get_player_move", lambda board, last_move, **_: (1, 1))
+    hub = SpectatorHub()
+    game = TicTacToeGame(ScoreTracker(storage=InMemoryScoreStorage()), spectators=hub)
+    game.set_difficulty(Difficulty.HARD)
+    game.start_new_game()
+    watcher = hub.subscribe()
+    assert game.play_turn()['reason'] == 'continue'
+    assert game.play_turn()['reason'] == 'continue'
+    keyframe, player, computer = watcher.poll()
+    assert keyframe.split()[1:] == [b"board", b".........", b"continue"]
+    assert player.split()[1:] == [b"move", b"1,1", b"X", b"continue"]
+    assert computer.split()[3] == b"O"
+    game.undo_turn()
+    assert watcher.poll()[-1].split()[1:3] == [b"board", b"........."]
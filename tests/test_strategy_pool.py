@@ -0,0 +1,102 @@
+import threading
+
+from tic_tac_toe.ai_strategy import HardStrategy, RandomMoveStrategy
+from tic_tac_toe.constants import COMPUTER, PLAYER, Difficulty
+from tic_tac_toe.game_coordinator import TicTacToeGame
+from tic_tac_toe.headless import new_board
+from tic_tac_toe.rules import get_rule_set, line_rule_set
+from tic_tac_toe.score_tracker import InMemoryScoreStorage, ScoreTracker
+from tic_tac_toe.strategy_pool import StrategyPool
+from tic_tac_toe.transposition import StripedTranspositionTable
+
+
+def test_striped_table_survives_concurrent_stores_and_probes():
+    table = StripedTranspositionTable(max_mb=1.0, stripes=8)
+    errors = []
+
+    def work(offset):
+        try:
+            for i in range(2000):
+                key = (i * 2654435761 + offset) << 20 | i
+                table.store(key, i % 3 - 1, 5, move=i % 9)
+                hit = table.probe(key)
+                if hit is not None and hit[0] != i % 3 - 1:
+                    errors.append(hit)
+        except Exception as error:  # pragma: no cover - reported below
+            errors.append(error)
+
+    threads = [threading.Thread(target=work, args=(n,)) for n in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+    stats = table.stats()
+    assert stats['stores'] == 8000
+    assert stats['hits'] + stats['misses'] == 8000
+
+
+def test_hard_strategies_share_one_cache_across_games():
+    pool = StrategyPool(table_mb=1.0)
+    first = pool.create(Difficulty.HARD)
+    second = pool.create(Difficulty.HARD)
+    assert isinstance(first, HardStrategy) and first is not second
+    assert first.table is second.table
+    first.get_move(new_board())
+    filled = first.table.stats()['filled']
+    assert filled > 0
+    first.new_game()
+    assert second.table.stats()['filled'] == filled
+    assert pool.stats()['created'] == 1 and pool.stats()['reused'] == 1
+
+
+def test_caches_are_separate_per_rule_set():
+    pool = StrategyPool(table_mb=1.0)
+    standard = pool.create(Difficulty.HARD)
+    misere = pool.create(Difficulty.HARD, rule_set=get_rule_set('misere'))
+    bigger = pool.create(Difficulty.HARD, rule_set=line_rule_set(4, 3))
+    assert len({id(standard.table), id(misere.table), id(bigger.table)}) == 3
+
+
+def test_strategies_without_shared_cache_come_from_the_factory():
+    pool = StrategyPool()
+    assert isinstance(pool.create(Difficulty.EASY), RandomMoveStrategy)
+    assert pool.stats()['caches'] == {}
+
+
+def test_least_recently_used_and_idle_caches_are_dropped():
+    now = [0.0]
+    pool = StrategyPool(table_mb=0.1, max_caches=2, idle_ttl=10, clock=lambda: now[0])
+    pool.create(Difficulty.HARD)
+    pool.create(Difficulty.HARD, rule_set=get_rule_set('misere'))
+    pool.create(Difficulty.HARD, rule_set=line_rule_set(4, 3))
+    assert len(pool.stats()['caches']) == 2
+    assert pool.stats()['dropped'] == 1
+    now[0] = 11
+    pool.expire()
+    assert pool.stats()['caches'] == {}
+
+
+def test_pooled_hard_strategy_still_blocks_and_wins():
+    pool = StrategyPool(table_mb=1.0)
+    for _ in range(3):
+        strategy = pool.create(Difficulty.HARD)
+        board = [[PLAYER, PLAYER, ' '],
+                 [COMPUTER, ' ', ' '],
+                 [' ', ' ', ' ']]
+        assert strategy.get_move(board) == (0, 2)
+        board = [[COMPUTER, COMPUTER, ' '],
+                 [PLAYER, PLAYER, ' '],
+                 [PLAYER, ' ', ' ']]
+        assert strategy.get_move(board) == (0, 2)
+        strategy.new_game()
+
+
+def test_game_takes_strategies_from_its_pool():
+    pool = StrategyPool(table_mb=1.0)
+    games = [TicTacToeGame(ScoreTracker(InMemoryScoreStorage()), strategy_pool=pool)
+             for _ in range(2)]
+    for game in games:
+        game.set_difficulty(Difficulty.HARD)
+    assert games[0].current_strategy is not games[1].current_strategy
+    assert games[0].current_strategy.table is games[1].current_strategy.table
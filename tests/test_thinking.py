@@ -0,0 +1,94 @@
+import time
+
+import pytest
+
+from tic_tac_toe.ai_strategy import (AIStrategy, GomokuStrategy, HardStrategy,
+                                     QubicStrategy, UltimateStrategy)
+from tic_tac_toe.constants import COMPUTER, PLAYER, ULTIMATE_SIZE
+from tic_tac_toe.game_coordinator import TicTacToeGame
+from tic_tac_toe.headless import new_board
+from tic_tac_toe.qubic import GRID_SIZE
+from tic_tac_toe.rules import line_rule_set
+from tic_tac_toe.score_tracker import InMemoryScoreStorage, ScoreTracker
+from tic_tac_toe.thinking import CancellationToken, MoveWorker, wait_for_move
+
+
+class PatientStrategy(AIStrategy):
+    """Thinks until its token expires, then plays the first empty cell."""
+
+    def get_move(self, board):
+        while not self.cancel_token.expired():
+            time.sleep(0.005)
+        return next((r, c) for r, row in enumerate(board)
+                     for c, cell in enumerate(row) if cell == ' ')
+
+
+class BrokenStrategy(AIStrategy):
+    def get_move(self, board):
+        raise RuntimeError("no move")
+
+
+def cancelled_token():
+    token = CancellationToken()
+    token.cancel()
+    return token
+
+
+def test_token_expires_when_cancelled_or_out_of_time():
+    token = CancellationToken()
+    assert not token.expired() and not token.cancelled
+    token.cancel()
+    assert token.expired() and token.cancelled
+    assert CancellationToken(max_time=0).expired()
+    assert not CancellationToken(max_time=60).expired()
+
+
+def test_worker_hands_back_move_and_errors():
+    board = new_board()
+    worker = MoveWorker(PatientStrategy(), board, think_time=0.02).start()
+    assert wait_for_move(worker, interval=0.01) == (0, 0)
+    assert worker.strategy.cancel_token.expired() is False
+
+    worker = MoveWorker(BrokenStrategy(), board).start()
+    with pytest.raises(RuntimeError):
+        wait_for_move(worker)
+
+
+def test_ctrl_c_makes_the_strategy_move_now():
+    ticks = []
+
+    def interrupt(elapsed):
+        ticks.append(elapsed)
+        raise KeyboardInterrupt
+
+    worker = MoveWorker(PatientStrategy(), new_board()).start()
+    assert wait_for_move(worker, on_tick=interrupt, interval=0.01) == (0, 0)
+    assert worker.token.cancelled and len(ticks) == 1
+
+
+@pytest.mark.parametrize('strategy, size', [
+    (HardStrategy(line_rule_set(4, 4)), 4),
+    (GomokuStrategy(), 15),
+    (UltimateStrategy(max_time=None), ULTIMATE_SIZE),
+    (QubicStrategy(max_time=None), GRID_SIZE),
+])
+def test_searches_return_a_legal_move_when_cancelled(strategy, size):
+    board = new_board(size)
+    board[size // 2][size // 2] = PLAYER
+    if size == 15:
+        board[7][8] = COMPUTER
+        board[8][8] = PLAYER
+    strategy.cancel_token = cancelled_token()
+    start = time.perf_counter()
+    row, col = strategy.get_move(board)[:2]
+    assert time.perf_counter() - start < 1.0
+    assert board[row][col] == ' '
+
+
+def test_coordinator_caps_think_time():
+    game = TicTacToeGame(ScoreTracker(storage=InMemoryScoreStorage()), think_time=0.05)
+    game.current_strategy = PatientStrategy()
+    game.game_state.make_move(1, 1, PLAYER)
+    game.game_state.switch_player()
+    assert game.play_turn()['reason'] == 'continue'
+    assert game.game_state.board[0][0] == COMPUTER
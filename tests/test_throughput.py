@@ -0,0 +1,61 @@
+import json
+
+import pytest
+
+from tic_tac_toe.ai_strategy import RandomMoveStrategy
+from tic_tac_toe.constants import PLAYER, Difficulty
+from tic_tac_toe.game_coordinator import TicTacToeGame
+from tic_tac_toe.game_log import iter_games
+from tic_tac_toe.rules import line_rule_set
+from tic_tac_toe.score_tracker import InMemoryScoreStorage, ScoreTracker
+from tic_tac_toe.strategy_pool import StrategyPool
+from tic_tac_toe.throughput import (LAYERS, format_report, measure_scaling, run_games,
+                                     scripted_player)
+
+
+def test_player_input_replaces_the_keyboard():
+    moves = iter([(0, 0), (2, 2)])
+    game = TicTacToeGame(ScoreTracker(InMemoryScoreStorage()),
+                         strategy_pool=StrategyPool(table_mb=0.5),
+                         player_input=lambda board, last_move=None: next(moves))
+    game.set_difficulty(Difficulty.HARD)
+    assert game.play_turn()['reason'] == 'continue'
+    assert game.game_state.moves == [(0, 0)]
+
+
+def test_run_games_plays_and_persists_every_game(tmp_path):
+    report = run_games(6, Difficulty.HARD, Difficulty.EASY, str(tmp_path))
+    assert report['games'] == 6
+    assert sum(report['results'].values()) == 6
+    # Hard never loses to a random player.
+    assert 'player_win' not in report['results']
+    with open(tmp_path / 'scores.json') as f:
+        assert json.load(f)['total_games'] == 6
+    assert len(list(iter_games(tmp_path / 'games.jsonl'))) == 6
+
+    assert set(report['layers']) == set(LAYERS)
+    assert all(seconds > 0 for layer, seconds in report['layers'].items() if layer != 'other')
+    assert sum(report['layers'].values()) >= report['seconds'] * 0.99
+
+
+def test_scaling_and_report():
+    report = run_games(2, Difficulty.MEDIUM, Difficulty.MEDIUM)
+    scaling = measure_scaling([1, 2], games=2, difficulty=Difficulty.MEDIUM)
+    assert [row['games'] for row in scaling] == [2, 4]
+    text = format_report(report, scaling)
+    assert "Games/s" in text and "persist" in text and "Speed-up" in text
+
+
+def test_scripted_player_plays_the_game_rules():
+    board = [[" "] * 4 for _ in range(4)]
+    board[3][1] = board[3][2] = PLAYER
+    play = scripted_player(Difficulty.MEDIUM, line_rule_set(4, 3))
+    assert play(board) in ((3, 0), (3, 3))
+
+
+def test_players_that_cannot_play_fail_fast(monkeypatch):
+    with pytest.raises(ValueError, match="cannot play ultimate rules"):
+        run_games(2, Difficulty.ULTIMATE, Difficulty.MEDIUM)
+    monkeypatch.setattr(RandomMoveStrategy, "get_move", lambda self, board: (0, 0))
+    with pytest.raises(ValueError, match="illegal move"):
+        run_games(1, Difficulty.MEDIUM, Difficulty.EASY)
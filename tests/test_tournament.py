@@ -0,0 +1,77 @@
+import csv
+
+from tic_tac_toe.ai_strategy import (HardStrategy, MediumStrategy, RandomMoveStrategy,
+                                     ValueTableStrategy)
+from tic_tac_toe.constants import COMPUTER, PLAYER
+from tic_tac_toe.game_log import iter_games
+from tic_tac_toe.headless import play_headless_game
+from tic_tac_toe.tournament import (
+    fit_elo,
+    run_tournament,
+    schedule_games,
+    summarize,
+)
+
+
+def test_headless_game_hard_vs_hard_is_draw():
+    outcome = play_headless_game(HardStrategy(), HardStrategy())
+    assert outcome["reason"] == "draw"
+    assert outcome["winner"] is None
+    assert len(outcome["moves"]) == 9
+    assert outcome["move_count"][PLAYER] == 5
+    assert outcome["move_count"][COMPUTER] == 4
+
+
+def test_schedule_alternates_sides_and_is_reproducible():
+    entrants = {"easy": RandomMoveStrategy, "hard": HardStrategy}
+    tasks = schedule_games(entrants, games_per_pair=4, seed=7)
+    assert [t["x"] for t in tasks] == ["easy", "hard", "easy", "hard"]
+    assert tasks == schedule_games(entrants, games_per_pair=4, seed=7)
+
+
+def test_tournament_streams_csv_and_ranks_hard_above_easy(tmp_path):
+    csv_path = tmp_path / "games.csv"
+    entrants = {"easy": RandomMoveStrategy, "hard": HardStrategy}
+    games = run_tournament(entrants, games_per_pair=6, workers=0, seed=1, csv_path=str(csv_path))
+
+    with open(csv_path, newline="") as f:
+        rows = list(csv.DictReader(f))
+    assert len(rows) == len(games) == 6
+    assert all(row["winner"] != "easy" for row in rows)
+
+    summary = summarize(games, samples=20)
+    assert [row["name"] for row in summary] == ["hard", "easy"]
+    assert summary[0]["elo_low"] <= summary[0]["elo"] <= summary[0]["elo_high"]
+
+
+def test_tournament_process_pool_matches_serial():
+    entrants = {"easy": RandomMoveStrategy, "hard": HardStrategy}
+    serial = run_tournament(entrants, games_per_pair=2, workers=0, seed=3)
+    pooled = run_tournament(entrants, games_per_pair=2, workers=2, seed=3)
+    key = lambda row: row["game_id"]
+    assert [r["winner"] for r in sorted(serial, key=key)] == [r["winner"] for r in sorted(pooled, key=key)]
+
+
+def test_fit_elo_equal_results_give_equal_ratings():
+    games = [{"x": "a", "o": "b", "winner": ""}] * 4
+    elo = fit_elo(games)
+    assert abs(elo["a"] - elo["b"]) < 1e-6
+
+
+def test_variants_play_their_rules_and_log_the_difficulty(tmp_path):
+    entrants = {"medium": MediumStrategy, "hard": HardStrategy, "trained": ValueTableStrategy}
+    tasks = schedule_games(entrants, games_per_pair=2, variants=("standard", "misere"))
+    # Trained only plays the standard rules it was trained on.
+    assert sum(t["variant"] == "standard" for t in tasks) == 6
+    assert {(t["x"], t["o"]) for t in tasks if t["variant"] == "misere"} == {
+        ("hard", "medium"), ("medium", "hard")}
+
+    log_path = tmp_path / "games.jsonl"
+    games = run_tournament({"easy": RandomMoveStrategy, "hard": HardStrategy}, games_per_pair=2,
+                           variants=("4x4-k3", "wild"), workers=0, seed=5, log_path=log_path)
+    assert {game["variant"] for game in games} == {"4x4-k3", "wild"}
+    assert all(game["winner"] != "easy" for game in games if game["variant"] == "4x4-k3")
+    records = list(iter_games(log_path))
+    assert {record["rules"] for record in records} == {"3-in-a-row", "wild"}
+    assert all(record["difficulty"] == record["o"] for record in records)
+    assert any(max(row for row, _ in record["moves"]) == 3 for record in records)
@@ -0,0 +1,56 @@
+import json
+
+from tic_tac_toe.constants import Difficulty
+from tic_tac_toe.game_coordinator import TicTacToeGame
+from tic_tac_toe.score_tracker import InMemoryScoreStorage, ScoreTracker
+from tic_tac_toe.strategy_pool import StrategyPool
+from tic_tac_toe.tracing import NULL_SPAN, Tracer, span, tracer
+
+
+def test_disabled_tracer_records_nothing():
+    local = Tracer()
+    assert local.span('ai') is NULL_SPAN
+    assert span('ai') is NULL_SPAN
+    with local.span('ai'):
+        pass
+    assert local.events() == []
+
+
+def test_ring_buffer_keeps_newest_events():
+    local = Tracer(capacity=3)
+    local.enable()
+    for index in range(5):
+        with local.span('turn', index=index):
+            pass
+    assert [args['index'] for _, _, _, _, args in local.events()] == [2, 3, 4]
+    assert local.dropped == 2
+    local.enable(capacity=2)
+    assert len(local.events()) == 2
+
+
+def test_game_phases_export_as_chrome_trace(tmp_path):
+    moves = iter([(0, 0), (0, 1), (1, 0), (2, 2), (1, 2), (2, 1)])
+    game = TicTacToeGame(ScoreTracker(InMemoryScoreStorage()),
+                         strategy_pool=StrategyPool(table_mb=0.5),
+                         player_input=lambda board, last_move=None: next(moves))
+    game.set_difficulty(Difficulty.HARD)
+    tracer.clear()
+    tracer.enable()
+    try:
+        game.display_board()
+        game.play_turn()
+        game.play_turn()
+    finally:
+        tracer.disable()
+    path = tmp_path / 'trace.json'
+    tracer.export_chrome(path)
+    tracer.clear()
+
+    with open(path) as f:
+        events = json.load(f)['traceEvents']
+    assert [event['name'] for event in events] == [
+        'render', 'input', 'rules', 'turn', 'ai', 'rules', 'turn']
+    assert all(event['ph'] == 'X' and event['dur'] >= 0 for event in events)
+    turn = events[3]
+    assert turn['ts'] <= events[1]['ts'] and events[2]['ts'] + events[2]['dur'] <= turn['ts'] + turn['dur']
+    assert events[4]['args'] == {'difficulty': Difficulty.HARD}
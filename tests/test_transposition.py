@@ -0,0 +1,97 @@
+import random
+
+from tic_tac_toe.ai_strategy import HardStrategy, RandomMoveStrategy
+from tic_tac_toe.constants import COMPUTER, PLAYER
+from tic_tac_toe.headless import play_headless_game
+from tic_tac_toe.transposition import (
+    ENTRY_BYTES,
+    EXACT,
+    LOWER,
+    TranspositionTable,
+)
+
+
+def test_store_and_probe():
+    table = TranspositionTable(max_mb=0.01)
+    assert table.probe(42) is None
+    table.store(42, 1, 5, LOWER, 3)
+    assert table.probe(42) == (1, 5, LOWER, 3)
+    table.store(42, 0, 6, EXACT, 4)
+    assert table.probe(42) == (0, 6, EXACT, 4)
+    assert table.stats()["filled"] == 1
+    assert table.stats()["hits"] == 2
+    assert table.stats()["misses"] == 1
+
+
+def test_capacity_respects_memory_cap():
+    table = TranspositionTable(max_mb=1)
+    assert table.memory_bytes <= 1024 * 1024
+    assert table.capacity == (1024 * 1024 // (ENTRY_BYTES * 4)) * 4
+
+
+def test_depth_preferred_replacement_evicts_shallowest():
+    table = TranspositionTable(max_mb=0, bucket_size=2)
+    assert table.bucket_count == 1
+    table.store(1, 0, 9)
+    table.store(2, 0, 1)
+    table.store(3, 0, 5)
+    assert table.probe(2) is None
+    assert table.probe(1) is not None and table.probe(3) is not None
+    assert table.stats()["evictions"] == 1
+
+
+def test_age_replacement_evicts_previous_generation_first():
+    table = TranspositionTable(max_mb=0, bucket_size=2, policy="age")
+    table.store(1, 0, 9)
+    table.new_generation()
+    table.store(2, 0, 1)
+    table.store(3, 0, 5)
+    assert table.probe(1) is None
+    assert table.probe(2) is not None
+
+
+def test_clear_empties_table():
+    table = TranspositionTable(max_mb=0.01)
+    table.store(7, 1, 1)
+    table.clear()
+    assert table.probe(7) is None
+    assert table.stats()["filled"] == 0
+
+
+def test_hard_strategy_reuses_table_and_resets_between_games():
+    strategy = HardStrategy()
+    board = [[" "] * 3 for _ in range(3)]
+    board[0][0] = PLAYER
+    first = strategy.get_move(board)
+    hits = strategy.table.hits
+    assert strategy.get_move(board) == first
+    assert strategy.table.hits > hits
+
+    strategy.new_game()
+    assert strategy.table.stats()["filled"] == 0
+
+    keeper = HardStrategy(keep_cache=True)
+    keeper.get_move(board)
+    filled = keeper.table.filled
+    keeper.new_game()
+    assert keeper.table.filled == filled
+
+
+def test_hard_strategy_with_tiny_table_still_plays_perfectly():
+    tiny = HardStrategy(table_mb=0.001)
+    assert play_headless_game(HardStrategy(), tiny)["winner"] is None
+    assert play_headless_game(tiny, HardStrategy())["winner"] is None
+    assert tiny.table.evictions > 0
+
+
+def test_hard_strategy_with_warm_shared_table_never_loses():
+    # Bound entries left by earlier games must never pick the root move.
+    random.seed(211)
+    table = TranspositionTable(2.0)
+    for game in range(600):
+        hard = HardStrategy(table=table, keep_cache=True)
+        hard.new_game()
+        if game % 2:
+            assert play_headless_game(hard, RandomMoveStrategy())["winner"] != COMPUTER
+        else:
+            assert play_headless_game(RandomMoveStrategy(), hard)["winner"] != PLAYER
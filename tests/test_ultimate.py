@@ -0,0 +1,110 @@
+import random
+
+from tic_tac_toe import game_coordinator
+from tic_tac_toe.ai_strategy import AIStrategyFactory, UltimateStrategy
+from tic_tac_toe.constants import COMPUTER, PLAYER, ULTIMATE_SIZE, Difficulty, GameResult
+from tic_tac_toe.game_coordinator import TicTacToeGame
+from tic_tac_toe.headless import new_board, play_headless_game
+from tic_tac_toe.rules import ULTIMATE, TicTacToeRules, get_rule_set
+from tic_tac_toe.score_tracker import InMemoryScoreStorage, ScoreTracker
+from tic_tac_toe.ultimate import UltimateBoard, join_cell, split_cell
+
+
+def claim(board, sub, marker):
+    """Win a sub-board with its top row."""
+    for pos in range(3):
+        row, col = join_cell(sub, pos)
+        board[row][col] = marker
+
+
+def test_last_move_sends_to_matching_sub_board():
+    rules = get_rule_set(ULTIMATE)
+    board = new_board(ULTIMATE_SIZE)
+    assert len(rules.legal_moves(board)) == 81
+    board[1][5] = PLAYER
+    assert split_cell(1, 5) == (1, 5)
+    assert rules.legal_moves(board, (1, 5)) == [
+        (r, c) for r in range(3, 6) for c in range(6, 9)]
+
+    claim(board, 5, COMPUTER)
+    moves = TicTacToeRules.get_legal_moves(board, (1, 5), rules)
+    assert len(moves) == 81 - 9 - 1
+    assert not any(split_cell(r, c)[0] == 5 for r, c in moves)
+
+
+def test_play_and_undo_match_loaded_positions():
+    rng = random.Random(3)
+    position = UltimateBoard()
+    board = new_board(ULTIMATE_SIZE)
+    marker = PLAYER
+    snapshots = []
+    while position.moves():
+        snapshots.append((dict(position.meta), position.closed, position.forced))
+        sub, pos = rng.choice(position.moves())
+        position.play(sub, pos, marker)
+        row, col = join_cell(sub, pos)
+        board[row][col] = marker
+        loaded = UltimateBoard.from_board(board, (row, col))
+        assert loaded.meta == position.meta and loaded.closed == position.closed
+        if position.winner() is None:
+            assert loaded.moves() == position.moves()
+        marker = COMPUTER if marker == PLAYER else PLAYER
+    while snapshots:
+        position.undo()
+        assert (position.meta, position.closed, position.forced) == snapshots.pop()
+    assert position.subs == UltimateBoard().subs
+
+
+def test_strategy_takes_meta_win():
+    board = new_board(ULTIMATE_SIZE)
+    claim(board, 0, COMPUTER)
+    claim(board, 3, COMPUTER)
+    board[6][0] = board[6][1] = COMPUTER
+    board[4][0] = board[0][8] = board[8][8] = board[7][8] = PLAYER
+    # The player's move in cell 6 of a sub-board sends the computer to sub-board 6.
+    board[5][3] = PLAYER
+    assert UltimateStrategy(max_time=None, max_depth=2).get_move(board, last_move=(5, 3)) == (6, 2)
+
+
+def test_headless_game_respects_send_to_board():
+    rules = get_rule_set(ULTIMATE)
+    outcome = play_headless_game(UltimateStrategy(max_depth=2), UltimateStrategy(max_depth=1),
+                                 board=new_board(ULTIMATE_SIZE), rule_set=rules)
+    assert outcome["reason"] in ("win", "draw")
+    board = new_board(ULTIMATE_SIZE)
+    last_move = None
+    for n, move in enumerate(outcome["moves"]):
+        assert move in rules.legal_moves(board, last_move)
+        board[move[0]][move[1]] = PLAYER if n % 2 == 0 else COMPUTER
+        last_move = move
+
+
+def test_ultimate_mode_in_coordinator(monkeypatch):
+    game = TicTacToeGame(score_tracker=ScoreTracker(storage=InMemoryScoreStorage()))
+    game.set_difficulty(Difficulty.ULTIMATE)
+    assert game.game_state.size == ULTIMATE_SIZE
+    assert isinstance(game.current_strategy, UltimateStrategy)
+    assert isinstance(AIStrategyFactory.create(Difficulty.ULTIMATE), UltimateStrategy)
+
+    moves = iter([(0, 0), (3, 6)])
+    monkeypatch.setattr(game_coordinator, "get_player_move", lambda board, last_move, **_: next(moves))
+    game.game_state.current_player = PLAYER
+    game.game_state.last_move = (1, 5)
+    assert game.play_turn() is None
+    assert game.play_turn()["reason"] == "continue"
+    assert game.game_state.cell(3, 6) == PLAYER
+
+    board = new_board(ULTIMATE_SIZE)
+    claim(board, 0, COMPUTER)
+    claim(board, 3, COMPUTER)
+    board[6][0] = board[6][1] = COMPUTER
+    board[5][3] = PLAYER
+    game.game_state.board = board
+    game.game_state.last_move = (5, 3)
+    game.game_state.current_player = COMPUTER
+    result = game.play_turn()
+    assert result["result"] == GameResult.COMPUTER_WIN
+    assert (6, 2) in game.game_state.winning_line
+
+    game.set_difficulty(Difficulty.HARD)
+    assert game.game_state.size == 3
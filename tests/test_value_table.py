@@ -0,0 +1,85 @@
+import random
+
+from tic_tac_toe.ai_strategy import (
+    AIStrategyFactory,
+    HardStrategy,
+    MediumStrategy,
+    RandomMoveStrategy,
+    ValueTableStrategy,
+)
+from tic_tac_toe.constants import COMPUTER, PLAYER, Difficulty
+from tic_tac_toe.encoding import decode_base3, encode_base3
+from tic_tac_toe.headless import play_headless_game
+from tic_tac_toe.value_table import (
+    default_value_table,
+    load_value_table,
+    new_value_table,
+    save_value_table,
+    train_value_table,
+)
+
+
+def test_base3_round_trip():
+    board = [[PLAYER, " ", COMPUTER], [" ", PLAYER, " "], [COMPUTER, " ", " "]]
+    assert decode_base3(encode_base3(board)) == board
+    assert encode_base3([[" "] * 3 for _ in range(3)]) == 0
+
+
+def test_factory_creates_trained_strategy():
+    strategy = AIStrategyFactory.create(Difficulty.TRAINED)
+    assert isinstance(strategy, ValueTableStrategy)
+
+
+def test_full_strength_table_takes_win_and_blocks():
+    strategy = ValueTableStrategy(strength=1.0, seed=0)
+    win = [[COMPUTER, COMPUTER, " "], [PLAYER, PLAYER, " "], [PLAYER, " ", " "]]
+    assert strategy.get_move(win) == (0, 2)
+    block = [[PLAYER, PLAYER, " "], [" ", COMPUTER, " "], [" ", " ", " "]]
+    assert strategy.get_move(block) == (0, 2)
+
+
+def test_full_strength_table_draws_against_hard():
+    strategy = ValueTableStrategy(strength=1.0, seed=0)
+    assert play_headless_game(HardStrategy(), strategy)["winner"] is None
+    assert play_headless_game(strategy, HardStrategy())["winner"] is None
+
+
+def test_training_is_deterministic_and_table_round_trips(tmp_path):
+    first = train_value_table(episodes=200, seed=5)
+    assert first == train_value_table(episodes=200, seed=5)
+    assert first != new_value_table()
+
+    path = tmp_path / "table.bin"
+    save_value_table(first, str(path))
+    assert load_value_table(str(path)) == first
+
+
+def test_default_table_is_shared():
+    assert default_value_table() is default_value_table()
+
+
+def _losses(make_strategy, opponent=RandomMoveStrategy, games=2000):
+    losses = 0
+    for game in range(games):
+        strategy = make_strategy()
+        if game % 2:
+            losses += play_headless_game(strategy, opponent())["winner"] == COMPUTER
+        else:
+            losses += play_headless_game(opponent(), strategy)["winner"] == PLAYER
+    return losses
+
+
+def test_default_strength_sits_between_medium_and_hard():
+    random.seed(7)
+    medium = _losses(MediumStrategy)
+    trained = _losses(ValueTableStrategy)
+    assert trained <= medium
+    assert play_headless_game(HardStrategy(), ValueTableStrategy(seed=1))["winner"] is None
+
+
+def test_lower_strength_loses_more():
+    random.seed(11)
+    weak = _losses(lambda: ValueTableStrategy(strength=0.0), HardStrategy, games=100)
+    strong = _losses(lambda: ValueTableStrategy(strength=1.0), HardStrategy, games=100)
+    assert strong == 0
+    assert weak >= 5
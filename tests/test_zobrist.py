@@ -0,0 +1,63 @@
+from tic_tac_toe.ai_strategy import MediumStrategy
+from tic_tac_toe.constants import COMPUTER, PLAYER
+from tic_tac_toe.game_state import GameState
+from tic_tac_toe.headless import new_board, play_headless_game
+from tic_tac_toe.rules import TicTacToeRules
+from tic_tac_toe.zobrist import ZobristTable, get_table
+
+
+def test_incremental_hash_matches_full_hash_and_undo_restores_it():
+    state = GameState()
+    assert state.zobrist_key == 0
+    state.make_move(0, 0, PLAYER)
+    state.make_move(1, 2, COMPUTER)
+    assert state.zobrist_key == TicTacToeRules.zobrist_key(state.board)
+
+    state.undo()
+    state.undo()
+    assert state.zobrist_key == 0
+    state.redo()
+    assert state.zobrist_key == TicTacToeRules.zobrist_key(state.board)
+
+
+def test_rules_make_move_tracks_key():
+    board = [[" "] * 3 for _ in range(3)]
+    key = TicTacToeRules.make_move(board, 1, 1, PLAYER, key=0)
+    assert key == TicTacToeRules.zobrist_key(board)
+    assert TicTacToeRules.make_move(board, 1, 1, COMPUTER, key=key) is None
+    assert TicTacToeRules.make_move(board, 0, 0, COMPUTER) is True
+
+
+def test_headless_game_reports_the_final_key():
+    outcome = play_headless_game(MediumStrategy(), MediumStrategy())
+    board = new_board()
+    for ply, (row, col) in enumerate(outcome["moves"]):
+        board[row][col] = PLAYER if ply % 2 == 0 else COMPUTER
+    assert outcome["key"] == TicTacToeRules.zobrist_key(board)
+
+
+def test_keys_are_stable_across_table_instances():
+    assert ZobristTable(3).keys == get_table(3).keys
+
+
+def test_symmetric_positions_share_canonical_key():
+    corners = [(0, 0), (0, 2), (2, 0), (2, 2)]
+    keys = set()
+    for row, col in corners:
+        state = GameState()
+        state.make_move(row, col, PLAYER)
+        keys.add(state.canonical_key)
+    assert len(keys) == 1
+
+    edge = GameState()
+    edge.make_move(0, 1, PLAYER)
+    assert edge.canonical_key not in keys
+
+
+def test_loaded_board_has_matching_symmetric_keys():
+    played = GameState()
+    played.make_move(0, 1, PLAYER)
+    played.make_move(2, 2, COMPUTER)
+    loaded = GameState()
+    loaded.board = played.board
+    assert loaded.symmetric_keys == played.symmetric_keys
@@ -3,15 +3,49 @@
 Uses composition to combine different AI strategies.
 """
 
-import copy
+import math
+import random
 from abc import ABC, abstractmethod
-from .constants import BOARD_SIZE, PLAYER, COMPUTER, Difficulty
-from .rules import TicTacToeRules
+from .constants import (BOARD_SIZE, PLAYER, COMPUTER, GOMOKU_SIZE,
+                        GOMOKU_WIN_LENGTH, Difficulty)
+from .rules import TicTacToeRules, STANDARD, ULTIMATE, QUBIC, get_rule_set, line_rule_set
 from .board import get_random_move
+from .value_table import afterstate_values, default_value_table
+from .encoding import encode_base3
+from .evaluation import evaluate_children
+from .gomoku import (ThreatBoard, threat_space_search,
+                     DEFAULT_TSS_DEPTH, DEFAULT_TSS_NODES)
+from .proof_number import ProofNumberSearch, PROVEN, DEFAULT_PN_NODES
+from .solver import UNREACHABLE, move_values, side_to_move, table_size
+from .qubic import (QubicBoard, grid_cell, search_move as qubic_search,
+                    DEFAULT_SEARCH_DEPTH as QUBIC_DEPTH,
+                    DEFAULT_THINK_TIME as QUBIC_THINK_TIME)
+from .thinking import NEVER_CANCELLED, SearchCancelled
+from .transposition import TranspositionTable, EXACT, LOWER, UPPER, NO_MOVE
+from .ultimate import (UltimateBoard, join_cell, search_move as ultimate_search,
+                       DEFAULT_SEARCH_DEPTH as ULTIMATE_DEPTH,
+                       DEFAULT_THINK_TIME as ULTIMATE_THINK_TIME)
+from .zobrist import get_table
 
 
 class AIStrategy(ABC):
-    """Abstract base class for AI strategies."""
+    """Abstract base class for AI strategies.
+
+    Strategies that search poll `cancel_token` (see thinking.py) and,
+    once it expires, return the best move found so far.
+
+    Strategies with `shares_table` set accept `table` and `keep_cache`
+    arguments, so a StrategyPool can give them a shared thread-safe cache.
+    Strategies with `plays_solved` set accept a `solved` table, which a
+    StrategyPool loads when one is installed for the rules in play.
+    Strategies with `uses_last_move` set accept the `last_move` argument
+    of get_move(), which rule sets such as Ultimate need.
+    """
+
+    cancel_token = NEVER_CANCELLED
+    shares_table = False
+    plays_solved = False
+    uses_last_move = False
 
     @abstractmethod
     def get_move(self, board):
@@ -20,118 +54,515 @@ class AIStrategy(ABC):
         Args:
             board: Current board state (not modified)
 
+        Rule sets whose moves depend on the previous one (Ultimate) also
+        pass the previous move as a `last_move` keyword argument.
+
+        Returns:
+            Tuple of (row, col) for the move, or None if no moves available.
+            Under wild rules a strategy placing the other side's marker
+            returns (row, col, marker).
+        """
+
+    def get_moves(self, boards, last_moves=None):
+        """Get the next move on each of several boards.
+
+        Strategies that can evaluate a batch faster than one board at a
+        time override this.
+
+        Args:
+            boards: Board states (not modified)
+            last_moves: Previous move per board, for rule sets whose moves
+                depend on it; None otherwise
+
         Returns:
-            Tuple of (row, col) for the move, or None if no moves available
+            List of moves as returned by get_move(), one per board
         """
+        if last_moves is None:
+            return [self.get_move(board) for board in boards]
+        return [self.get_move(board, last_move=last_move)
+                for board, last_move in zip(boards, last_moves)]
+
+    def new_game(self):
+        """Prepare for a new game. Strategies with caches may reset them here."""
+
+
+def find_winning_move(board, marker, moves=None, rule_set=None):
+    """Find a move that completes a line on the spot.
+
+    Args:
+        board: Current board state (not modified)
+        marker: Marker to place ('X' or 'O')
+        moves: Candidate (row, col) cells, defaults to every empty cell
+        rule_set: RuleSet to apply, defaults to a full line on this board
+
+    Returns:
+        Completing (row, col), or None
+    """
+    rules = rule_set or line_rule_set(len(board))
+    work_board = [row[:] for row in board]
+    if moves is None:
+        moves = TicTacToeRules.get_available_moves(board)
+    for i, j in moves:
+        work_board[i][j] = marker
+        completed = rules.completed_line(work_board, i, j)
+        work_board[i][j] = ' '
+        if completed:
+            return (i, j)
+    return None
+
+
+def _with_marker(move, marker):
+    """Add the marker to a move when it is not the computer's own."""
+    return move if marker == COMPUTER else move + (marker,)
 
 
 class RandomMoveStrategy(AIStrategy):
     """Easy AI: Makes completely random valid moves."""
 
+    def __init__(self, rule_set=None):
+        """Initialize with the rules in play.
+
+        Args:
+            rule_set: RuleSet in play; under wild rules the marker is random too
+        """
+        self.rule_set = rule_set or line_rule_set()
+
     def get_move(self, board):
-        return get_random_move(board)
+        move = get_random_move(board)
+        if move is None:
+            return None
+        return _with_marker(move, random.choice(self.rule_set.markers[COMPUTER]))
 
 
 class MediumStrategy(AIStrategy):
-    """Medium AI: Basic strategy (win/block/center/corner/side)."""
+    """Medium AI: Basic strategy (win/block/center/corner/side).
+
+    Under misère rules completing a line loses, so instead of winning and
+    blocking it avoids completing lines whenever it can.
+    """
+
+    def __init__(self, rule_set=None):
+        """Initialize with the rules in play.
+
+        Args:
+            rule_set: RuleSet in play, defaults to a full line on the board
+        """
+        self.rule_set = rule_set
 
     def get_move(self, board):
-        def is_winning_move(row, col, marker):
-            test_board = copy.deepcopy(board)
-            test_board[row][col] = marker
-            return TicTacToeRules.check_winner(test_board, marker)
-
-        # Try to win
-        for i in range(BOARD_SIZE):
-            for j in range(BOARD_SIZE):
-                if board[i][j] == ' ':
-                    if is_winning_move(i, j, COMPUTER):
-                        return (i, j)
-
-        # Try to block player
-        for i in range(BOARD_SIZE):
-            for j in range(BOARD_SIZE):
-                if board[i][j] == ' ':
-                    if is_winning_move(i, j, PLAYER):
-                        return (i, j)
+        rules = self.rule_set or line_rule_set(len(board))
+        available = TicTacToeRules.get_available_moves(board)
+
+        if rules.completion_score > 0:
+            # Try to win with any marker we may place, then block player
+            for marker in rules.markers[COMPUTER]:
+                move = find_winning_move(board, marker, available, rules)
+                if move:
+                    return _with_marker(move, marker)
+            move = find_winning_move(board, PLAYER, available, rules)
+            if move:
+                return move
+        else:
+            # Never complete a line while a safe cell is left
+            safe = [move for move in available
+                    if not find_winning_move(board, COMPUTER, [move], rules)]
+            available = safe or available
 
         # Take center if available
-        if board[1][1] == ' ':
+        if (1, 1) in available:
             return (1, 1)
 
         # Take a random corner
         corners = [(0, 0), (0, BOARD_SIZE - 1),
                    (BOARD_SIZE - 1, 0), (BOARD_SIZE - 1, BOARD_SIZE - 1)]
-        for i, j in corners:
-            if board[i][j] == ' ':
-                return (i, j)
+        for move in corners:
+            if move in available:
+                return move
 
         # Take a random side
         sides = [(0, 1), (1, 0), (1, BOARD_SIZE - 1),
                  (BOARD_SIZE - 1, 1)]
-        for i, j in sides:
-            if board[i][j] == ' ':
-                return (i, j)
+        for move in sides:
+            if move in available:
+                return move
 
-        return get_random_move(board)
+        return random.choice(available) if available else None
 
 
 class HardStrategy(AIStrategy):
-    """Hard AI: Minimax algorithm for perfect play."""
+    """Hard AI: Minimax algorithm for perfect play.
+
+    Negamax with alpha-beta pruning on bitboards, checking wins against the
+    rule set's precomputed line masks, over a bounded transposition table
+    keyed by incrementally updated Zobrist hashes. Given a solved table
+    (see offline_solver.py) it looks moves up instead of searching.
+    """
+
+    DEFAULT_TABLE_MB = 2.0
+    shares_table = True
+    plays_solved = True
+
+    def __init__(self, rule_set=None, table=None, table_mb=DEFAULT_TABLE_MB,
+                 keep_cache=False, solved=None):
+        """Initialize the search.
+
+        Args:
+            rule_set: RuleSet in play, defaults to a full line on the board
+            table: TranspositionTable to use, or None to allocate one
+            table_mb: Memory cap for an allocated table, in megabytes
+            keep_cache: Keep table entries between games instead of clearing
+            solved: Solved table for the rule set from solver.solve() or
+                solver.load_table(), or None to search; needs rule_set
+
+        Raises:
+            ValueError: If a solved table is given without a rule set, for
+                misère or wild rules, or for a different board size or
+                win length
+        """
+        if solved is not None:
+            if rule_set is None:
+                raise ValueError("A solved table needs the rule set it was solved for")
+            if rule_set.misere or rule_set.wild:
+                raise ValueError("Solved tables cover normal rules only")
+            if table_size(solved) != rule_set.size:
+                raise ValueError("The solved table is for a different board size")
+            if getattr(solved, 'win_length', None) != rule_set.win_length:
+                raise ValueError("The solved table is for a different win length")
+        self.rule_set = rule_set
+        self.table = table if table is not None else TranspositionTable(table_mb)
+        self.keep_cache = keep_cache
+        self.solved = solved
+
+    def new_game(self):
+        if self.keep_cache:
+            self.table.new_generation()
+        else:
+            self.table.clear()
 
     def get_move(self, board):
-        work_board = copy.deepcopy(board)
-
-        def minimax(board_state, maximizing_player, alpha, beta):
-            """Minimax algorithm with alpha-beta pruning."""
-            if TicTacToeRules.check_winner(board_state, COMPUTER):
-                return 1
-            if TicTacToeRules.check_winner(board_state, PLAYER):
-                return -1
-            if TicTacToeRules.is_full(board_state):
-                return 0
-
-            if maximizing_player:
-                max_score = -float('inf')
-                for i in range(BOARD_SIZE):
-                    for j in range(BOARD_SIZE):
-                        if board_state[i][j] == ' ':
-                            board_state[i][j] = COMPUTER
-                            score = minimax(board_state, False, alpha, beta)
-                            board_state[i][j] = ' '
-                            max_score = max(max_score, score)
-                            alpha = max(alpha, max_score)
-                            if alpha >= beta:
-                                return max_score
-                return max_score
+        size = len(board)
+        if self.solved is not None and table_size(self.solved) == size:
+            move = self._solved_move(board)
+            if move is not None:
+                return move
+        rules = self.rule_set or line_rule_set(size)
+        completes = rules.completes_mask
+        completion_score = rules.completion_score
+        table = self.table
+        expired = self.cancel_token.expired
+        zobrist = get_table(size)
+        keys = zobrist.keys
+        side_key = zobrist.side_key
+
+        bits = {PLAYER: 0, COMPUTER: 0}
+        for index, cell in enumerate(cell for row in board for cell in row):
+            if cell != ' ':
+                bits[cell] |= 1 << index
+        # Moves per side as (index, bit, marker, own-marker flag)
+        choices = {
+            side: [(index, 1 << index, marker, marker == side)
+                   for index in range(size * size) for marker in rules.markers[side]]
+            for side in (PLAYER, COMPUTER)
+        }
+
+        occupied = bits[PLAYER] | bits[COMPUTER]
+        root_empties = size * size - bin(occupied).count('1')
+        nodes = [0]
+        # Best root move so far, played if the search is cancelled.
+        found = [NO_MOVE]
+
+        def negamax(side, key, occupied, alpha, beta, empties):
+            """Score for `side` to move, with alpha-beta pruning."""
+            nodes[0] += 1
+            if nodes[0] & 255 == 0 and expired():
+                raise SearchCancelled
+            if not empties:
+                return 0, NO_MOVE
+            tt_key = key if side == COMPUTER else key ^ side_key
+            original_alpha = alpha
+            entry = table.probe(tt_key)
+            if entry is not None:
+                value, _, flag, move = entry
+                # Bounds only cut off; narrowing the window with them would
+                # let a fail-low child tie alpha and be stored as EXACT.
+                if (flag == EXACT or (flag == LOWER and value >= beta)
+                        or (flag == UPPER and value <= alpha)):
+                    return value, move
+
+            other = PLAYER if side == COMPUTER else COMPUTER
+            best_score = -2
+            best_move = NO_MOVE
+            for index, bit, marker, own in choices[side]:
+                if occupied & bit:
+                    continue
+                placed = bits[marker] | bit
+                if completes(placed, index):
+                    score = completion_score
+                else:
+                    bits[marker] = placed
+                    score = -negamax(other, key ^ keys[marker][index], occupied | bit,
+                                     -beta, -alpha, empties - 1)[0]
+                    bits[marker] ^= bit
+                if score > best_score:
+                    best_score, best_move = score, 2 * index + (not own)
+                    if empties == root_empties:
+                        found[0] = best_move
+                alpha = max(alpha, score)
+                if alpha >= beta:
+                    break
+
+            if best_score <= original_alpha:
+                flag = UPPER
+            elif best_score >= beta:
+                flag = LOWER
             else:
-                min_score = float('inf')
-                for i in range(BOARD_SIZE):
-                    for j in range(BOARD_SIZE):
-                        if board_state[i][j] == ' ':
-                            board_state[i][j] = PLAYER
-                            score = minimax(board_state, True, alpha, beta)
-                            board_state[i][j] = ' '
-                            min_score = min(min_score, score)
-                            beta = min(beta, min_score)
-                            if beta <= alpha:
-                                return min_score
-                return min_score
-
-        best_score = -float('inf')
-        best_move = None
-
-        for i in range(BOARD_SIZE):
-            for j in range(BOARD_SIZE):
-                if work_board[i][j] == ' ':
-                    work_board[i][j] = COMPUTER
-                    score = minimax(work_board, False, -float('inf'), float('inf'))
-                    work_board[i][j] = ' '
-                    if score > best_score:
-                        best_score = score
-                        best_move = (i, j)
-
-        return best_move
+                flag = EXACT
+            table.store(tt_key, best_score, empties, flag, best_move)
+            return best_score, best_move
+
+        try:
+            _, best_move = negamax(COMPUTER, zobrist.hash_board(board), occupied,
+                                   -2, 2, root_empties)
+        except SearchCancelled:
+            best_move = found[0]
+            if best_move == NO_MOVE:
+                best_move = next((2 * index + (not own)
+                                  for index, bit, _, own in choices[COMPUTER]
+                                  if not occupied & bit), NO_MOVE)
+        finally:
+            # negamax refers to itself; break the cycle so this frame is
+            # freed now instead of by the garbage collector.
+            negamax = None
+        if best_move == NO_MOVE:
+            return None
+        index, foreign = divmod(best_move, 2)
+        return _with_marker(divmod(index, size), PLAYER if foreign else COMPUTER)
+
+    def get_moves(self, boards, last_moves=None):
+        # The search is deterministic, so identical boards are searched once
+        # and later boards of the batch also reuse the warm table.
+        found = {}
+        moves = []
+        for board in boards:
+            key = tuple(map(tuple, board))
+            if key not in found:
+                found[key] = self.get_move(board)
+            moves.append(found[key])
+        return moves
+
+    def _solved_move(self, board):
+        """Look up the best move in the solved table.
+
+        Returns:
+            (row, col), or None if the position is not in the table
+        """
+        cells = [cell for row in board for cell in row]
+        # The table is indexed with X moving first; when the counts are
+        # equal COMPUTER moves first, so look the position up with the
+        # markers swapped.
+        if cells.count(COMPUTER) == cells.count(PLAYER):
+            swap = {PLAYER: COMPUTER, COMPUTER: PLAYER, ' ': ' '}
+            cells = [swap[cell] for cell in cells]
+        code = encode_base3([cells])
+        if self.solved[code] == UNREACHABLE:
+            return None
+        values = move_values(self.solved, code, cells, side_to_move(cells))
+        if not values:
+            return None
+        best = max(values.values())
+        return divmod(min(index for index, value in values.items() if value == best), len(board))
+
+
+class ValueTableStrategy(AIStrategy):
+    """Trained AI: Picks moves by their self-play afterstate values.
+
+    Wins and blocks on the spot come first, as for MediumStrategy, since
+    the learned values miss some of them; that scan checks the lines
+    through each legal move. The move is then drawn from a softmax over
+    the table values, one lookup per legal move, whose temperature rises
+    as strength drops: strength 1.0 always plays the best value, and
+    strength 0.0 explores about as loosely as Medium plays.
+    """
+
+    DEFAULT_STRENGTH = 0.9
+    # Temperature at strength 0.0; losses to a random player then match Medium's.
+    MAX_TEMPERATURE = 0.015
+
+    def __init__(self, table=None, strength=DEFAULT_STRENGTH, seed=None, rule_set=None):
+        """Initialize with a value table.
+
+        Args:
+            table: Value table from value_table.train_value_table(), or None
+                for the shared default table (trained on first use)
+            strength: How greedily to follow the table (0.0-1.0)
+            seed: Optional seed for the move randomness
+            rule_set: RuleSet in play; tables are trained on the standard rules
+        """
+        if rule_set is not None and rule_set is not get_rule_set(STANDARD):
+            raise ValueError("Value tables are trained on the standard rules only")
+        self.rule_set = get_rule_set(STANDARD)
+        self.table = table if table is not None else default_value_table()
+        self.strength = strength
+        self._rng = random.Random(seed) if seed is not None else random
+
+    def get_move(self, board):
+        options = afterstate_values(self.table, board)
+        if not options:
+            return None
+        available = [move for _, move, _ in options]
+        for marker in (COMPUTER, PLAYER):
+            move = find_winning_move(board, marker, available)
+            if move:
+                return move
+        best = max(value for value, _, _ in options)
+        temperature = (1.0 - self.strength) * self.MAX_TEMPERATURE
+        if temperature <= 0:
+            return self._rng.choice([move for value, move, _ in options if value == best])
+        weights = [math.exp((value - best) / temperature) for value, _, _ in options]
+        return self._rng.choices(available, weights)[0]
+
+
+class GomokuStrategy(AIStrategy):
+    """Gomoku AI: Threat-space search over moves near existing stones.
+
+    Priorities follow MediumStrategy - win, then block - restricted to the
+    neighbourhood of existing stones. Next come forced wins found by
+    threat-space search, for either side, and finally the candidate with
+    the best batched line evaluation for attack plus defence.
+    """
+
+    DEFENCE_WEIGHT = 0.8
+
+    def __init__(self, rule_set=None, max_depth=DEFAULT_TSS_DEPTH,
+                 max_nodes=DEFAULT_TSS_NODES):
+        """Initialize search limits.
+
+        Args:
+            rule_set: k-in-a-row RuleSet, defaults to five in a row on 15x15
+            max_depth: Maximum attacker moves in threat-space search
+            max_nodes: Node budget for each threat-space search
+        """
+        rules = rule_set or line_rule_set(GOMOKU_SIZE, GOMOKU_WIN_LENGTH)
+        if rules.misere or rules.wild:
+            raise ValueError("The Gomoku engine supports normal k-in-a-row rules only")
+        self.rule_set = rules
+        self.win_length = rules.win_length
+        self.max_depth = max_depth
+        self.max_nodes = max_nodes
+
+    def get_move(self, board):
+        size = len(board)
+        threats = ThreatBoard(board, self.win_length)
+        candidates = [divmod(index, size) for index in threats.candidates()]
+        if not threats.stones or not candidates:
+            return candidates[0] if candidates else None
+
+        for marker in (COMPUTER, PLAYER):
+            move = find_winning_move(board, marker, candidates, self.rule_set)
+            if move:
+                return move
+
+        # Our forced win, else occupy the square that starts the opponent's.
+        for marker in (COMPUTER, PLAYER):
+            index = threat_space_search(threats, marker, self.max_depth, self.max_nodes,
+                                        stop=self.cancel_token.expired)
+            if index is not None:
+                return divmod(index, size)
+
+        attack = evaluate_children(board, candidates, COMPUTER, self.win_length)
+        defence = evaluate_children(board, candidates, PLAYER, self.win_length)
+        scores = attack + self.DEFENCE_WEIGHT * defence
+        return candidates[max(range(len(candidates)), key=scores.__getitem__)]
+
+
+class SolveStrategy(GomokuStrategy):
+    """Solve AI: Proof-number search for a forced win, else Gomoku play.
+
+    Each move first tries to prove a forced win with proof-number search
+    (see proof_number.py), within a node budget and the think time. When
+    no proof is found it plays like GomokuStrategy.
+    """
+
+    def __init__(self, rule_set=None, max_nodes=DEFAULT_PN_NODES,
+                 max_depth=DEFAULT_TSS_DEPTH, tss_nodes=DEFAULT_TSS_NODES):
+        """Initialize search limits.
+
+        Args:
+            rule_set: k-in-a-row RuleSet, defaults to five in a row on 15x15
+            max_nodes: Most proof-tree nodes held at once
+            max_depth: Maximum attacker moves in the fallback threat-space search
+            tss_nodes: Node budget for each fallback threat-space search
+        """
+        super().__init__(rule_set, max_depth, tss_nodes)
+        self.search = ProofNumberSearch(self.rule_set, max_nodes)
+        self.last_result = None
+
+    def get_move(self, board):
+        self.last_result, move = self.search.search(board, COMPUTER,
+                                                    stop=self.cancel_token.expired)
+        if self.last_result == PROVEN:
+            return move
+        return super().get_move(board)
+
+
+class UltimateStrategy(AIStrategy):
+    """Ultimate AI: Iterative-deepening alpha-beta on sub-board bitmasks.
+
+    Searches as deep as the think time allows and falls back to the best
+    move of the deepest completed search.
+    """
+
+    uses_last_move = True
+
+    def __init__(self, rule_set=None, max_depth=ULTIMATE_DEPTH,
+                 max_time=ULTIMATE_THINK_TIME):
+        """Initialize search limits.
+
+        Args:
+            rule_set: Ultimate RuleSet, the only rules this engine plays
+            max_depth: Deepest search in plies
+            max_time: Think time per move in seconds, or None for no limit
+        """
+        if rule_set is not None and rule_set is not get_rule_set(ULTIMATE):
+            raise ValueError("The Ultimate engine supports the Ultimate rules only")
+        self.rule_set = get_rule_set(ULTIMATE)
+        self.max_depth = max_depth
+        self.max_time = max_time
+
+    def get_move(self, board, last_move=None):
+        position = UltimateBoard.from_board(board, last_move)
+        move = ultimate_search(position, COMPUTER, self.max_depth, self.max_time,
+                               stop=self.cancel_token.expired)
+        return join_cell(*move) if move else None
+
+
+class QubicStrategy(AIStrategy):
+    """Qubic AI: Threat search and alpha-beta on 64-bit bitboards.
+
+    Wins and blocks come from per-line stone counts, forced wins from a
+    continuous-threat search, and the rest from iterative-deepening
+    alpha-beta under a think-time cap.
+    """
+
+    def __init__(self, rule_set=None, max_depth=QUBIC_DEPTH, max_time=QUBIC_THINK_TIME):
+        """Initialize search limits.
+
+        Args:
+            rule_set: Qubic RuleSet, the only rules this engine plays
+            max_depth: Deepest search in plies
+            max_time: Think time per move in seconds, or None for no limit
+        """
+        if rule_set is not None and rule_set is not get_rule_set(QUBIC):
+            raise ValueError("The Qubic engine supports the Qubic rules only")
+        self.rule_set = get_rule_set(QUBIC)
+        self.max_depth = max_depth
+        self.max_time = max_time
+
+    def get_move(self, board):
+        position = QubicBoard.from_board(board)
+        index = qubic_search(position, COMPUTER, self.max_depth, self.max_time,
+                             stop=self.cancel_token.expired)
+        return grid_cell(index) if index is not None else None
 
 
 class AIStrategyFactory:
@@ -141,17 +572,42 @@ class AIStrategyFactory:
         Difficulty.EASY: RandomMoveStrategy,
         Difficulty.MEDIUM: MediumStrategy,
         Difficulty.HARD: HardStrategy,
+        Difficulty.TRAINED: ValueTableStrategy,
+        Difficulty.GOMOKU: GomokuStrategy,
+        Difficulty.SOLVE: SolveStrategy,
+        Difficulty.ULTIMATE: UltimateStrategy,
+        Difficulty.QUBIC: QubicStrategy,
     }
 
     @classmethod
-    def create(cls, difficulty):
+    def create(cls, difficulty, **options):
         """Create strategy instance from difficulty.
 
         Args:
             difficulty: Difficulty level (Difficulty.EASY, MEDIUM, or HARD)
+            **options: Keyword arguments for the strategy, such as rule_set
 
         Returns:
             AIStrategy instance
         """
         strategy_class = cls._strategies.get(difficulty, RandomMoveStrategy)
-        return strategy_class()
+        return strategy_class(**options)
+
+    @classmethod
+    def register(cls, name, strategy_class):
+        """Register an additional strategy under a name.
+
+        Args:
+            name: Key used with create()
+            strategy_class: AIStrategy subclass, instantiated with no arguments
+        """
+        cls._strategies[name] = strategy_class
+
+    @classmethod
+    def registered(cls):
+        """Get all registered strategies.
+
+        Returns:
+            Dictionary mapping name to strategy class
+        """
+        return dict(cls._strategies)
@@ -0,0 +1,250 @@
+"""Blunder analysis of recorded games.
+
+Streams a move log (see game_log.py), replays every game with
+TicTacToeRules and compares each move with perfect play from the solved
+table. A blunder is a move that lowers the game-theoretic result
+available to the side that made it:
+
+- ``missed_win``: a won position played into a draw
+- ``threw_win``: a won position played into a loss
+- ``lost_draw``: a drawn position played into a loss
+
+Moves are counted per player (the names of the X and O sides) and per
+difficulty. A difficulty is graded on the moves of the side named after
+it, the AI side: a game logged by TicTacToeGame names the human X and
+the difficulty O, so the human's moves do not count against the AI.
+
+Chunks of raw log lines are analysed on a process pool with a bounded
+number of chunks in flight, so memory stays flat however large the log.
+
+Run with ``python -m tic_tac_toe.blunders --help``.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from itertools import islice
+from .constants import BOARD_SIZE, PLAYER, COMPUTER
+from .encoding import DIGITS, POWERS_OF_3
+from .game_log import iter_lines
+from .headless import new_board
+from .rules import STANDARD, TicTacToeRules, get_rule_set
+from .solver import DRAW, LOSS, WIN, move_values, perfect_table
+
+BLUNDER_KINDS = {
+    (WIN, DRAW): 'missed_win',
+    (WIN, LOSS): 'threw_win',
+    (DRAW, LOSS): 'lost_draw',
+}
+
+DEFAULT_CHUNK_SIZE = 2000
+
+
+def new_stats():
+    """Create empty counters for one player or difficulty."""
+    stats = {'games': 0, 'moves': 0, 'blunders': 0}
+    for kind in BLUNDER_KINDS.values():
+        stats[kind] = 0
+    return stats
+
+
+def new_report():
+    """Create an empty analysis report."""
+    return {'games': 0, 'skipped': 0, 'players': {}, 'difficulties': {}}
+
+
+def analyze_game(record, table=None):
+    """Replay one game and grade every move against perfect play.
+
+    Args:
+        record: Log record with a 'moves' list
+        table: Solved table from solver.perfect_table(), or None for the
+            shared one
+
+    Returns:
+        List of (marker, blunder kind or None) per move
+
+    Raises:
+        ValueError: If a move is illegal or comes after the game ended
+    """
+    table = table if table is not None else perfect_table()
+    rules = get_rule_set(STANDARD)
+    board = new_board()
+    cells = [' '] * (BOARD_SIZE * BOARD_SIZE)
+    code = 0
+    graded = []
+    finished = False
+    for ply, (row, col) in enumerate(record['moves']):
+        side = PLAYER if ply % 2 == 0 else COMPUTER
+        if finished or not TicTacToeRules.make_move(board, row, col, side):
+            raise ValueError(f"Illegal move {ply + 1}: {(row, col)}")
+        index = row * BOARD_SIZE + col
+        values = move_values(table, code, cells, side)
+        graded.append((side, BLUNDER_KINDS.get((max(values.values()), values[index]))))
+        cells[index] = side
+        code += DIGITS[side] * POWERS_OF_3[index]
+        finished = (rules.completed_line(board, row, col) is not None
+                    or TicTacToeRules.is_full(board))
+    return graded
+
+
+def _add_moves(stats, kinds):
+    """Count a game's graded moves for one player or difficulty."""
+    stats['games'] += 1
+    for kind in kinds:
+        stats['moves'] += 1
+        if kind:
+            stats['blunders'] += 1
+            stats[kind] += 1
+
+
+def analyze_lines(lines):
+    """Analyse a chunk of raw log lines. Runs inside a worker process.
+
+    Records that do not parse, use other rules or contain illegal moves
+    are counted as skipped. Only the moves of the side named after the
+    record's difficulty count for that difficulty.
+
+    Args:
+        lines: List of JSON lines
+
+    Returns:
+        Report dictionary for the chunk
+    """
+    table = perfect_table()
+    report = new_report()
+    for line in lines:
+        try:
+            record = json.loads(line)
+            if record.get('rules', STANDARD) != STANDARD:
+                raise ValueError("Unsupported rules")
+            graded = analyze_game(record, table)
+        except (ValueError, KeyError, TypeError):
+            report['skipped'] += 1
+            continue
+        report['games'] += 1
+        sides = ((PLAYER, record.get('x')), (COMPUTER, record.get('o')))
+        for marker, name in sides:
+            stats = report['players'].setdefault(str(name), new_stats())
+            _add_moves(stats, [kind for side, kind in graded if side == marker])
+        difficulty = record.get('difficulty')
+        ai_sides = {marker for marker, name in sides if difficulty and name == difficulty}
+        if ai_sides:
+            _add_moves(report['difficulties'].setdefault(str(difficulty), new_stats()),
+                       [kind for side, kind in graded if side in ai_sides])
+    return report
+
+
+def merge_reports(total, part):
+    """Add one report's counters into another.
+
+    Args:
+        total: Report updated in place
+        part: Report to add
+    """
+    total['games'] += part['games']
+    total['skipped'] += part['skipped']
+    for section in ('players', 'difficulties'):
+        for name, stats in part[section].items():
+            target = total[section].setdefault(name, new_stats())
+            for key, value in stats.items():
+                target[key] += value
+
+
+def _chunks(lines, chunk_size):
+    """Group an iterator of lines into lists of chunk_size."""
+    while True:
+        chunk = list(islice(lines, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def analyze_log(path, workers=None, chunk_size=DEFAULT_CHUNK_SIZE, progress=None):
+    """Analyse every game in a move log.
+
+    Args:
+        path: Log file path
+        workers: Worker process count; 0 analyses in this process, None
+            uses every CPU
+        chunk_size: Games per task sent to a worker
+        progress: Optional text stream that receives a progress line
+
+    Returns:
+        Report dictionary with game counts and per-player and
+        per-difficulty blunder counters
+    """
+    report = new_report()
+    start = time.perf_counter()
+
+    def collect(part):
+        merge_reports(report, part)
+        if progress:
+            elapsed = max(time.perf_counter() - start, 1e-9)
+            progress.write(f"\rAnalyzed {report['games']} games "
+                           f"({report['games'] / elapsed:,.0f} games/s)")
+            progress.flush()
+
+    chunks = _chunks(iter_lines(path), chunk_size)
+    if workers == 0:
+        for chunk in chunks:
+            collect(analyze_lines(chunk))
+    else:
+        in_flight = 2 * (workers or os.cpu_count() or 1)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            pending = set()
+            for chunk in chunks:
+                pending.add(pool.submit(analyze_lines, chunk))
+                if len(pending) >= in_flight:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        collect(future.result())
+            for future in pending:
+                collect(future.result())
+    if progress:
+        progress.write("\n")
+    return report
+
+
+def format_report(report):
+    """Format a report as plain-text tables.
+
+    Args:
+        report: Report from analyze_log()
+
+    Returns:
+        Tables as a string
+    """
+    kinds = list(BLUNDER_KINDS.values())
+    lines = [f"Games analysed: {report['games']}  (skipped: {report['skipped']})"]
+    for title, section in (('Player', 'players'), ('Difficulty', 'difficulties')):
+        lines.append("")
+        lines.append(f"{title:<12} {'Games':>8} {'Moves':>9} {'Blunders':>9} {'Rate':>7} "
+                     + " ".join(f"{kind:>10}" for kind in kinds))
+        for name, stats in sorted(report[section].items()):
+            rate = stats['blunders'] / stats['moves'] if stats['moves'] else 0.0
+            lines.append(f"{name:<12} {stats['games']:>8} {stats['moves']:>9} "
+                         f"{stats['blunders']:>9} {rate:>7.2%} "
+                         + " ".join(f"{stats[kind]:>10}" for kind in kinds))
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Find blunders in a recorded move log.")
+    parser.add_argument('log', help="move log (JSON lines)")
+    parser.add_argument('--workers', type=int, default=None, help="worker processes (0 = serial)")
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE, help="games per task")
+    parser.add_argument('--quiet', action='store_true', help="no progress output")
+    args = parser.parse_args(argv)
+
+    report = analyze_log(args.log, workers=args.workers, chunk_size=args.chunk_size,
+                         progress=None if args.quiet else sys.stderr)
+    sys.stdout.write(format_report(report) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -24,15 +24,22 @@ def get_random_move(board):
     Returns:
         Tuple of (row, col) or None if no moves available
     """
-    available_moves = []
-    for i in range(BOARD_SIZE):
-        for j in range(BOARD_SIZE):
-            if board[i][j] == ' ':
-                available_moves.append((i, j))
-    return random.choice(available_moves) if available_moves else None
+    # Count, then walk to the chosen cell, instead of building a move
+    # list; randrange() draws the same index random.choice() would.
+    empty = sum(row.count(' ') for row in board)
+    if not empty:
+        return None
+    skip = random.randrange(empty)
+    for i, row in enumerate(board):
+        for j, cell in enumerate(row):
+            if cell == ' ':
+                if not skip:
+                    return (i, j)
+                skip -= 1
 
 
-def print_board(board, cursor_row=None, cursor_col=None, last_move=None, winning_line=None, show_labels=False):
+def print_board(board, cursor_row=None, cursor_col=None, last_move=None, winning_line=None, show_labels=False,
+                block_size=None):
     """Print the current board state with optional cursor highlighting.
 
     Args:
@@ -41,8 +48,16 @@ def print_board(board, cursor_row=None, cursor_col=None, last_move=None, winning
         cursor_col: Column position of cursor (0-2), or None for no cursor
         last_move: Tuple of (row, col) for last move, or None
         winning_line: List of (row, col) tuples for winning line, or None
-        show_labels: Whether to show faint 1-9 labels on empty cells
+        show_labels: Whether to show faint 1-9 labels on empty cells. Boards
+            larger than the standard one show row and column numbers instead.
+        block_size: Draw separators between sub-boards of this many cells
+            per side on large boards (Ultimate), or None
     """
+    size = len(board)
+    if size > BOARD_SIZE:
+        _print_large_board(board, cursor_row, cursor_col, last_move, winning_line, block_size)
+        return
+
     rule = GRID_H * 9
     win_set = set(winning_line or [])
     last_move = last_move if last_move is None else tuple(last_move)
@@ -51,7 +66,7 @@ def print_board(board, cursor_row=None, cursor_col=None, last_move=None, winning
     for i, row in enumerate(board):
         row_str = []
         for j, cell in enumerate(row):
-            label = str(i * BOARD_SIZE + j + 1)
+            label = str(i * size + j + 1)
             display = cell if cell != ' ' else (label if show_labels else ' ')
             styled = display
 
@@ -64,12 +79,87 @@ def print_board(board, cursor_row=None, cursor_col=None, last_move=None, winning
 
             row_str.append(styled)
         sys.stdout.write(f" {GRID_V} ".join(row_str) + "\n")
-        if i < BOARD_SIZE - 1:
+        if i < size - 1:
             sys.stdout.write(rule + "\n")
     sys.stdout.write(rule + "\n")
     sys.stdout.flush()
 
 
+def print_layers(board, layer_size, last_move=None, winning_line=None):
+    """Print a 3D board one layer at a time through print_board.
+
+    The board is a square grid whose quadrants are the layers, first
+    layer top left, then left to right and top to bottom.
+
+    Args:
+        board: Current board state
+        layer_size: Cells per side of a layer
+        last_move: Tuple of (row, col) on the grid for last move, or None
+        winning_line: List of (row, col) grid tuples for winning line, or None
+    """
+    per_row = len(board) // layer_size
+    for layer in range(per_row * per_row):
+        top = (layer // per_row) * layer_size
+        left = (layer % per_row) * layer_size
+
+        def local(cell):
+            """Map a grid cell into this layer, or None if it lies elsewhere."""
+            row, col = cell[0] - top, cell[1] - left
+            return (row, col) if 0 <= row < layer_size and 0 <= col < layer_size else None
+
+        layer_line = [local(cell) for cell in winning_line or []]
+        sys.stdout.write(f"\n{BOLD}Layer {layer + 1}{RESET}")
+        print_board(
+            [row[left:left + layer_size] for row in board[top:top + layer_size]],
+            last_move=local(last_move) if last_move is not None else None,
+            winning_line=[cell for cell in layer_line if cell is not None],
+        )
+
+
+def _print_large_board(board, cursor_row, cursor_col, last_move, winning_line, block_size=None):
+    """Print a large board compactly, with row and column numbers.
+
+    Args:
+        board: Current board state
+        cursor_row: Row position of cursor, or None for no cursor
+        cursor_col: Column position of cursor, or None for no cursor
+        last_move: Tuple of (row, col) for last move, or None
+        winning_line: List of (row, col) tuples for winning line, or None
+        block_size: Cells per side of sub-boards to separate, or None
+    """
+    win_set = set(winning_line or [])
+    last_move = last_move if last_move is None else tuple(last_move)
+    size = len(board)
+
+    def split(items):
+        """Join cells, adding a separator between sub-boards."""
+        if not block_size:
+            return " ".join(items)
+        return f" {GRID_V} ".join(" ".join(items[k:k + block_size])
+                                  for k in range(0, size, block_size))
+
+    header = "   " + split([f"{j + 1:>2}" for j in range(size)])
+    rule = "   " + GRID_H * (len(header) - 3)
+    sys.stdout.write("\n" + header + "\n")
+    for i, row in enumerate(board):
+        if block_size and i and i % block_size == 0:
+            sys.stdout.write(rule + "\n")
+        row_str = []
+        for j, cell in enumerate(row):
+            display = cell if cell != ' ' else '.'
+            if (i, j) in win_set:
+                display = f"{BOLD}{REVERSE}{GREEN}{display}{RESET}"
+            elif cursor_row is not None and i == cursor_row and j == cursor_col:
+                display = f"{BOLD}{YELLOW}{display}{RESET}"
+            elif last_move is not None and (i, j) == last_move:
+                display = f"{BOLD}{display}{RESET}"
+            elif cell == ' ':
+                display = f"{DIM}{display}{RESET}"
+            row_str.append(" " + display)
+        sys.stdout.write(f"{i + 1:>2} " + split(row_str) + "\n")
+    sys.stdout.flush()
+
+
 def move_cursor(cursor_row, cursor_col, direction, board):
     """Move the cursor in the specified direction.
 
@@ -83,14 +173,15 @@ def move_cursor(cursor_row, cursor_col, direction, board):
         New cursor position as (row, col)
     """
     new_row, new_col = cursor_row, cursor_col
+    last = len(board) - 1
 
     if direction == 'up':
         new_row = max(0, cursor_row - 1)
     elif direction == 'down':
-        new_row = min(BOARD_SIZE - 1, cursor_row + 1)
+        new_row = min(last, cursor_row + 1)
     elif direction == 'left':
         new_col = max(0, cursor_col - 1)
     elif direction == 'right':
-        new_col = min(BOARD_SIZE - 1, cursor_col + 1)
+        new_col = min(last, cursor_col + 1)
 
     return new_row, new_col
@@ -0,0 +1,280 @@
+"""Streaming bulk position evaluation.
+
+Reads positions one per line, row by row with ``X``, ``O`` and ``.``
+for an empty cell (``X.O..X...`` is a 3x3 board), asks a strategy from
+AIStrategyFactory for the best move of the side to move, and writes one
+tab-separated line per position, in input order:
+
+    X.O..X...	1,0	draw
+
+The columns are the position, the move as ``row,col`` and the
+perfect-play value of that move for the side making it, under the
+``--win-length`` rules the strategy also plays. Values come from a table
+solved on first use, which is only practical up to 3x3 boards; on larger
+boards the value column reads ``unsolved``. Positions that do not parse,
+do not fit the strategy's rules or have no move get ``error`` and a
+reason instead, as does any failure of the strategy itself, so one bad
+line never stops a batch. The side to move follows from the counts, X
+moving first.
+
+Modes whose legal moves depend on the previous move (Ultimate) cannot be
+evaluated, since the notation does not record that move; they are
+rejected before any line is read.
+
+Chunks of lines are evaluated on a process pool with a bounded number
+of chunks in flight, and written as soon as every earlier chunk is out.
+With ``--shared-cache-mb`` the workers' search strategies share one
+transposition table in shared memory (see shared_cache.py) instead of
+each warming a cache of its own.
+
+Run with ``python -m tic_tac_toe.bulk_eval --help``.
+"""
+
+import argparse
+import os
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from .ai_strategy import AIStrategyFactory
+from .constants import BOARD_SIZE, PLAYER, COMPUTER, RULE_VARIANTS, Difficulty
+from .encoding import encode_base3
+from .headless import swap_markers
+from .rules import get_rule_set, line_rule_set
+from .shared_cache import SharedTranspositionTable
+from .solver import DRAW, LOSS, WIN, perfect_table, side_to_move, solve
+
+DEFAULT_CHUNK_SIZE = 1000
+VALUE_NAMES = {WIN: 'win', DRAW: 'draw', LOSS: 'loss'}
+# Value column of boards too big to solve on the fly.
+UNSOLVED = 'unsolved'
+
+_CELLS = {'X': PLAYER, 'O': COMPUTER, '.': ' '}
+_SIZES = {size * size: size for size in range(2, 20)}
+
+# Strategies of the worker process, kept between chunks.
+_strategies = {}
+# Shared tables the worker process has attached to, by name.
+_shared_tables = {}
+# Solved tables of the worker process, by RuleSet.
+_value_tables = {}
+
+
+def parse_position(text):
+    """Parse one position in compact notation.
+
+    Args:
+        text: Cells row by row, 'X', 'O' or '.'
+
+    Returns:
+        Nested-list board
+
+    Raises:
+        ValueError: If the text is not a square board of valid cells or
+            the marker counts cannot occur in a game
+    """
+    size = _SIZES.get(len(text))
+    if size is None:
+        raise ValueError("length is not a square board")
+    if text.strip('XO.'):
+        bad = next(char for char in text if char not in _CELLS)
+        raise ValueError(f"invalid cell {bad!r}")
+    x, o = text.count('X'), text.count('O')
+    if not 0 <= x - o <= 1:
+        raise ValueError("X must have as many markers as O, or one more")
+    return [[_CELLS[char] for char in text[row * size:(row + 1) * size]]
+            for row in range(size)]
+
+
+def evaluate_position(text, difficulty, win_length=None, cache_name=None):
+    """Find the best move of the side to move.
+
+    Args:
+        text: Position in compact notation
+        difficulty: Difficulty registered with AIStrategyFactory
+        win_length: Number in a row needed to win, defaults to a full line
+        cache_name: Name of a SharedTranspositionTable for the strategy,
+            or None for a private cache
+
+    Returns:
+        Output line without the newline
+    """
+    try:
+        board = parse_position(text)
+        size = len(board)
+        rules = line_rule_set(size, win_length)
+        for row, col in rules.coords:
+            if board[row][col] != ' ' and rules.completed_line(board, row, col):
+                raise ValueError("the game is already over")
+        cells = [cell for row in board for cell in row]
+        side = side_to_move(cells)
+        strategy = _strategy(difficulty, size, win_length, cache_name)
+        # Strategies play COMPUTER; show X's moves from O's side.
+        move = strategy.get_move(board if side == COMPUTER else swap_markers(board))
+        if move is None:
+            raise ValueError("no legal move")
+    except ValueError as error:
+        return f"{text}\terror\t{error}"
+    except Exception as error:
+        return f"{text}\terror\tstrategy failed: {type(error).__name__}: {error}"
+    row, col = move[0], move[1]
+    value = UNSOLVED
+    if size <= BOARD_SIZE:
+        cells[row * size + col] = side
+        value = VALUE_NAMES[-_value_table(rules)[encode_base3([cells])]]
+    return f"{text}\t{row},{col}\t{value}"
+
+
+def _value_table(rules):
+    """Get the worker's solved table for a small board, solving it on first use."""
+    if rules is line_rule_set():
+        return perfect_table()
+    if rules not in _value_tables:
+        _value_tables[rules] = solve(rules)
+    return _value_tables[rules]
+
+
+def check_difficulty(difficulty):
+    """Check that positions in compact notation can be evaluated at a difficulty.
+
+    Args:
+        difficulty: Difficulty registered with AIStrategyFactory
+
+    Raises:
+        ValueError: If the difficulty's rules depend on the previous move
+    """
+    if difficulty in RULE_VARIANTS and get_rule_set(RULE_VARIANTS[difficulty]).uses_last_move:
+        raise ValueError(f"{difficulty} positions need the previous move, "
+                         "which the notation does not record")
+
+
+def _strategy(difficulty, size, win_length, cache_name=None):
+    """Get the worker's strategy for a board, creating it on first use.
+
+    Raises:
+        ValueError: If the strategy plays on a different board size
+    """
+    key = (difficulty, size, win_length, cache_name)
+    if key not in _strategies:
+        rule_set = line_rule_set(size, win_length)
+        options = {}
+        if cache_name and AIStrategyFactory.registered().get(difficulty).shares_table:
+            if cache_name not in _shared_tables:
+                _shared_tables[cache_name] = SharedTranspositionTable.attach(cache_name)
+            options = {'table': _shared_tables[cache_name], 'keep_cache': True}
+        _strategies[key] = AIStrategyFactory.create(difficulty, rule_set=rule_set, **options)
+    rules = getattr(_strategies[key], 'rule_set', None)
+    if rules is not None and rules.size != size:
+        raise ValueError(f"{difficulty} plays on a {rules.size}x{rules.size} board")
+    return _strategies[key]
+
+
+def evaluate_lines(lines, difficulty, win_length=None, cache_name=None):
+    """Evaluate a chunk of input lines. Runs inside a worker process.
+
+    Args:
+        lines: Positions, with or without trailing newlines
+        difficulty: Difficulty registered with AIStrategyFactory
+        win_length: Number in a row needed to win, defaults to a full line
+        cache_name: Name of a SharedTranspositionTable, or None
+
+    Returns:
+        Output text for the chunk, one line per position
+    """
+    return "".join(evaluate_position(line.strip(), difficulty, win_length, cache_name) + "\n"
+                   for line in lines)
+
+
+def _chunks(lines, chunk_size):
+    """Group non-blank lines into lists of chunk_size."""
+    lines = (line for line in lines if line.strip())
+    while True:
+        chunk = list(islice(lines, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def evaluate_stream(lines, out, difficulty=Difficulty.HARD, win_length=None,
+                    workers=None, chunk_size=DEFAULT_CHUNK_SIZE, shared_cache_mb=None):
+    """Evaluate a stream of positions and write the results in order.
+
+    Args:
+        lines: Iterable of input lines
+        out: Text stream for the results
+        difficulty: Difficulty registered with AIStrategyFactory
+        win_length: Number in a row needed to win, defaults to a full line
+        workers: Worker process count; 0 evaluates in this process, None
+            uses every CPU
+        chunk_size: Positions per task sent to a worker
+        shared_cache_mb: Size of a transposition table shared by the
+            workers, in megabytes, or None for a private cache per worker
+
+    Returns:
+        Number of positions evaluated
+
+    Raises:
+        ValueError: If the difficulty cannot be evaluated (see check_difficulty())
+    """
+    check_difficulty(difficulty)
+    count = 0
+    chunks = _chunks(iter(lines), chunk_size)
+    if workers == 0:
+        for chunk in chunks:
+            out.write(evaluate_lines(chunk, difficulty, win_length))
+            count += len(chunk)
+        return count
+
+    in_flight = 2 * (workers or os.cpu_count() or 1)
+    shared = SharedTranspositionTable.create(shared_cache_mb) if shared_cache_mb else None
+    cache_name = shared.name if shared else None
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            # Results are written oldest first, so output keeps input order.
+            pending = deque()
+            for chunk in chunks:
+                pending.append(pool.submit(evaluate_lines, chunk, difficulty, win_length,
+                                           cache_name))
+                count += len(chunk)
+                if len(pending) >= in_flight:
+                    out.write(pending.popleft().result())
+                    out.flush()
+            while pending:
+                out.write(pending.popleft().result())
+    finally:
+        if shared:
+            shared.close()
+    return count
+
+
+def main(argv=None):
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Evaluate positions in bulk.")
+    parser.add_argument('input', nargs='?', default='-',
+                        help="file of positions such as X.O..X... (default: stdin)")
+    parser.add_argument('--strategy', default=Difficulty.HARD,
+                        choices=AIStrategyFactory.registered(), help="strategy to ask")
+    parser.add_argument('--win-length', type=int, default=None,
+                        help="markers in a row to win (default: a full line)")
+    parser.add_argument('--workers', type=int, default=None, help="worker processes (0 = serial)")
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE,
+                        help="positions per task")
+    parser.add_argument('--shared-cache-mb', type=float, default=None,
+                        help="share one search cache of this size between workers")
+    args = parser.parse_args(argv)
+    try:
+        check_difficulty(args.strategy)
+    except ValueError as error:
+        parser.error(str(error))
+
+    if args.input == '-':
+        evaluate_stream(sys.stdin, sys.stdout, args.strategy, args.win_length,
+                        args.workers, args.chunk_size, args.shared_cache_mb)
+    else:
+        with open(args.input, 'r') as f:
+            evaluate_stream(f, sys.stdout, args.strategy, args.win_length,
+                            args.workers, args.chunk_size, args.shared_cache_mb)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,12 +3,23 @@
 # Save file for persistent scores
 SCORE_FILE = "tic_tac_toe_scores.json"
 
+# Move log of finished games (JSON lines)
+GAME_LOG_FILE = "tic_tac_toe_games.jsonl"
+
+# Directory of solved tables Hard plays from (see offline_solver.py)
+SOLVED_TABLE_DIR = "tic_tac_toe_solved"
+
 
 class Difficulty:
     """AI difficulty levels."""
     EASY = "easy"
     MEDIUM = "medium"
     HARD = "hard"
+    TRAINED = "trained"
+    GOMOKU = "gomoku"
+    ULTIMATE = "ultimate"
+    QUBIC = "qubic"
+    SOLVE = "solve"
 
 
 class GameResult:
@@ -38,6 +49,36 @@ GRID_V = "|"
 # Board dimensions
 BOARD_SIZE = 3
 
+# Gomoku mode: five in a row on a 15x15 board
+GOMOKU_SIZE = 15
+GOMOKU_WIN_LENGTH = 5
+
+# Board size and number in a row to win for modes that change the board;
+# every other difficulty plays on the standard board.
+BOARD_VARIANTS = {
+    Difficulty.GOMOKU: (GOMOKU_SIZE, GOMOKU_WIN_LENGTH),
+    Difficulty.SOLVE: (GOMOKU_SIZE, GOMOKU_WIN_LENGTH),
+}
+
+# Ultimate mode: nine 3x3 boards laid out on a 9x9 grid
+ULTIMATE_SIZE = 9
+
+# Qubic mode: four in a row in a 4x4x4 cube
+QUBIC_SIZE = 4
+
+# Modes with rules of their own, mapped to the name of their rule set.
+RULE_VARIANTS = {
+    Difficulty.ULTIMATE: "ultimate",
+    Difficulty.QUBIC: "qubic",
+}
+
+# Think-time cap for an AI move in the terminal game, in seconds; when
+# it runs out the AI plays the best move found so far.
+AI_THINK_TIME = 5.0
+
+# Frames of the "thinking" spinner
+SPINNER_FRAMES = "|/-\\"
+
 # Player markers
 PLAYER = 'X'
 COMPUTER = 'O'
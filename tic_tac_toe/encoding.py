@@ -0,0 +1,52 @@
+"""Compact board encodings for Tic-Tac-Toe.
+
+A board maps to a base-3 integer with one digit per cell, row by row:
+0 for empty, 1 for PLAYER and 2 for COMPUTER. Cell 0 is the least
+significant digit, so placing a marker adds ``digit * 3 ** index``.
+"""
+
+from .constants import BOARD_SIZE, PLAYER, COMPUTER
+
+DIGITS = {' ': 0, PLAYER: 1, COMPUTER: 2}
+MARKERS = (' ', PLAYER, COMPUTER)
+
+# POWERS_OF_3[i] == 3 ** i, large enough for a 4x4 board
+POWERS_OF_3 = tuple(3 ** i for i in range(16))
+
+
+def encode_base3(board):
+    """Encode a board as a base-3 integer.
+
+    Args:
+        board: Current board state
+
+    Returns:
+        Integer in range(3 ** (size * size))
+    """
+    code = 0
+    power = 1
+    for row in board:
+        for cell in row:
+            code += DIGITS[cell] * power
+            power *= 3
+    return code
+
+
+def decode_base3(code, size=BOARD_SIZE):
+    """Decode a base-3 integer back into a board.
+
+    Args:
+        code: Value returned by encode_base3()
+        size: Board dimension
+
+    Returns:
+        New nested-list board
+    """
+    board = []
+    for _ in range(size):
+        row = []
+        for _ in range(size):
+            code, digit = divmod(code, 3)
+            row.append(MARKERS[digit])
+        board.append(row)
+    return board
@@ -0,0 +1,303 @@
+"""Line-oriented engine protocol over stdin/stdout.
+
+A long-lived process that keeps a loaded strategy and its caches warm
+between requests, in the spirit of UCI. One command per line:
+
+    isready                     answer ``readyok``
+    rules <name>                switch rule set (standard, misere, wild,
+                                ultimate, qubic) and start a new game
+    rules line <size> <k>       k-in-a-row on a size x size board
+    strategy <difficulty>       load a strategy from AIStrategyFactory;
+                                modes with rules of their own (gomoku,
+                                ultimate, qubic) switch to those rules
+    newgame                     clear the board and the strategy's caches
+    position [<move> ...]       set the position from the empty board;
+                                moves are ``row,col`` or ``row,col,marker``
+    go [movetime <ms>]          search the side to move; ``bestmove`` is
+                                printed when done
+    stop                        end the search now; the best move so far
+                                is printed
+    ponder                      search the current position in the
+                                background to warm caches, until stopped
+    analyze                     print the value of every legal move
+                                (normal rules on the standard board)
+    quit                        exit
+
+Replies are ``bestmove <move>`` (``bestmove none`` without a legal move),
+``info ...`` lines and ``error <reason>``. Searches run on a worker
+thread, so ``stop`` is read while they think.
+
+Run with ``python -m tic_tac_toe.engine_protocol``.
+"""
+
+import sys
+import threading
+from .ai_strategy import AIStrategyFactory
+from .constants import (BOARD_SIZE, BOARD_VARIANTS, RULE_VARIANTS, PLAYER, COMPUTER,
+                        Difficulty)
+from .encoding import encode_base3
+from .game_state import GameState
+from .headless import swap_markers
+from .rules import STANDARD, RULE_SETS, get_rule_set, line_rule_set
+from .solver import perfect_table
+from .thinking import MoveWorker
+
+VALUE_NAMES = {1: 'win', 0: 'draw', -1: 'loss'}
+
+
+def parse_move(token):
+    """Parse a move token.
+
+    Args:
+        token: 'row,col' or 'row,col,marker'
+
+    Returns:
+        (row, col, marker or None)
+
+    Raises:
+        ValueError: If the token is malformed
+    """
+    parts = token.split(',')
+    if len(parts) not in (2, 3):
+        raise ValueError(f"bad move {token!r}")
+    marker = parts[2] if len(parts) == 3 else None
+    if marker is not None and marker not in (PLAYER, COMPUTER):
+        raise ValueError(f"bad marker in {token!r}")
+    return int(parts[0]), int(parts[1]), marker
+
+
+def format_move(row, col, marker=None):
+    """Write a move token; the marker is only given when it is not implied."""
+    return f"{row},{col}" if marker is None else f"{row},{col},{marker}"
+
+
+class EngineProtocol:
+    """Command interpreter around one strategy and one position."""
+
+    def __init__(self, out=None, difficulty=Difficulty.HARD):
+        """Start with the standard rules and a new game.
+
+        Args:
+            out: Text stream for replies, defaults to stdout
+            difficulty: Strategy to load first
+        """
+        self.out = out or sys.stdout
+        self._write_lock = threading.Lock()
+        self.rule_set = get_rule_set(STANDARD)
+        self.difficulty = difficulty
+        self.strategy = AIStrategyFactory.create(difficulty, rule_set=self.rule_set)
+        self.state = GameState(self.rule_set.size)
+        self.game_over = False
+        self._worker = None
+
+    def send(self, line):
+        """Write one reply line; safe to call from worker threads."""
+        with self._write_lock:
+            self.out.write(line + "\n")
+            self.out.flush()
+
+    def handle(self, line):
+        """Run one command.
+
+        Args:
+            line: Command line
+
+        Returns:
+            False once 'quit' is received, True otherwise
+        """
+        words = line.split()
+        if not words:
+            return True
+        command, args = words[0], words[1:]
+        handler = getattr(self, f"cmd_{command}", None)
+        if handler is None:
+            self.send(f"error unknown command {command!r}")
+            return True
+        try:
+            return handler(args) is not False
+        except Exception as error:  # A bad command must not kill the engine
+            self.send(f"error {error}")
+            return True
+
+    def run(self, lines=None):
+        """Read commands until 'quit' or end of input.
+
+        Args:
+            lines: Iterable of command lines, defaults to stdin
+        """
+        for line in (sys.stdin if lines is None else lines):
+            if not self.handle(line):
+                break
+        self._stop_search()
+
+    # Commands
+
+    def cmd_isready(self, args):
+        self.send("readyok")
+
+    def cmd_quit(self, args):
+        return False
+
+    def cmd_rules(self, args):
+        if args[:1] == ['line'] and len(args) == 3:
+            size, win_length = int(args[1]), int(args[2])
+            if size < 1 or not 1 <= win_length <= size:
+                raise ValueError("rules line needs size >= 1 and 1 <= k <= size")
+            rule_set = line_rule_set(size, win_length)
+        elif len(args) == 1 and args[0] in RULE_SETS:
+            rule_set = get_rule_set(args[0])
+        else:
+            raise ValueError("usage: rules <name> | rules line <size> <k>")
+        self._load(self.difficulty, rule_set)
+
+    def cmd_strategy(self, args):
+        if len(args) != 1 or args[0] not in AIStrategyFactory.registered():
+            raise ValueError(f"unknown strategy {' '.join(args)!r}")
+        difficulty = args[0]
+        # Same rule choice as TicTacToeGame.set_difficulty().
+        if difficulty in RULE_VARIANTS:
+            rule_set = get_rule_set(RULE_VARIANTS[difficulty])
+        elif difficulty in BOARD_VARIANTS:
+            rule_set = line_rule_set(*BOARD_VARIANTS[difficulty])
+        elif self.difficulty in RULE_VARIANTS or self.difficulty in BOARD_VARIANTS:
+            rule_set = get_rule_set(STANDARD)
+        else:
+            rule_set = self.rule_set
+        self._load(difficulty, rule_set)
+
+    def cmd_newgame(self, args):
+        self._stop_search()
+        self.strategy.new_game()
+        self._set_position([])
+
+    def cmd_position(self, args):
+        self._stop_search()
+        self._set_position([parse_move(token) for token in args])
+
+    def cmd_go(self, args):
+        think_time = None
+        if args[:1] == ['movetime'] and len(args) == 2:
+            think_time = int(args[1]) / 1000
+        elif args:
+            raise ValueError("usage: go [movetime <ms>]")
+        self._start_search(think_time, report=True)
+
+    def cmd_ponder(self, args):
+        self._start_search(None, report=False)
+
+    def cmd_stop(self, args):
+        self._stop_search()
+
+    def cmd_analyze(self, args):
+        rules = self.rule_set
+        if rules.size != BOARD_SIZE or rules.misere or rules.wild or rules.uses_last_move:
+            raise ValueError("analyze needs normal rules on the standard board")
+        table = perfect_table()
+        cells = [cell for row in self.state.board for cell in row]
+        side = self.state.current_player
+        for row, col in ([] if self.game_over else self.state.legal_moves(rules)):
+            index = row * rules.size + col
+            cells[index] = side
+            self.send(f"info move {format_move(row, col)} value "
+                      f"{VALUE_NAMES[-table[encode_base3([cells])]]}")
+            cells[index] = ' '
+        self.send("info analyze done")
+
+    # Helpers
+
+    def _load(self, difficulty, rule_set):
+        """Create a strategy for the rules and start a new game.
+
+        Raises:
+            ValueError: If the strategy cannot play the rules
+        """
+        self._stop_search()
+        strategy = AIStrategyFactory.create(difficulty, rule_set=rule_set)
+        if rule_set.uses_last_move and not strategy.uses_last_move:
+            raise ValueError(f"strategy {difficulty} cannot play {rule_set.name} rules")
+        self.strategy = strategy
+        self.difficulty = difficulty
+        self.rule_set = rule_set
+        self.state = GameState(rule_set.size)
+        self.game_over = False
+
+    def _set_position(self, moves):
+        """Replay moves from the empty board, checking each is legal."""
+        rules = self.rule_set
+        state = GameState(rules.size)
+        game_over = False
+        for row, col, marker in moves:
+            side = state.current_player
+            marker = marker or side
+            if game_over:
+                raise ValueError(f"move {format_move(row, col)} after the game ended")
+            if marker not in rules.markers[side] or (row, col) not in state.legal_moves(rules):
+                raise ValueError(f"illegal move {format_move(row, col, marker)}")
+            state.make_move(row, col, marker)
+            game_over = (rules.completed_line(state.board, row, col) is not None
+                         or not rules.legal_moves(state.board, state.last_move))
+            state.switch_player()
+        self.state = state
+        self.game_over = game_over
+
+    def _start_search(self, think_time, report):
+        """Search the side to move on a worker thread."""
+        self._stop_search()
+        state = self.state
+        side = state.current_player
+        if self.game_over:
+            if report:
+                self.send("bestmove none")
+            return
+        # Strategies play COMPUTER; show X's positions with markers swapped.
+        board = state.board if side == COMPUTER else swap_markers(state.board)
+        options = {'last_move': state.last_move} if self.rule_set.uses_last_move else {}
+
+        def done(worker):
+            if report:
+                self.send(self._bestmove(worker, side))
+            else:
+                self.send("info ponder done")
+
+        self._worker = MoveWorker(self.strategy, board, think_time, on_done=done,
+                                  **options).start()
+
+    def _bestmove(self, worker, side):
+        """Format a finished search as a bestmove reply."""
+        try:
+            move = worker.result()
+        except Exception as error:  # A strategy error must not kill the engine
+            return f"error search failed: {error}"
+        if move is None:
+            return "bestmove none"
+        marker = None
+        if len(move) > 2:
+            marker = move[2]
+            if side == PLAYER:
+                marker = PLAYER if marker == COMPUTER else COMPUTER
+            if marker == side:
+                marker = None
+        return f"bestmove {format_move(move[0], move[1], marker)}"
+
+    def _wait_search(self):
+        """Wait for a running search to finish by itself."""
+        if self._worker is not None:
+            self._worker.wait()
+            self._worker = None
+
+    def _stop_search(self):
+        """Cancel a running search and wait for its reply."""
+        if self._worker is not None:
+            self._worker.cancel()
+            self._wait_search()
+
+
+def main(argv=None):
+    """Command-line entry point."""
+    engine = EngineProtocol()
+    engine.send(f"info ready strategy {engine.difficulty} rules {engine.rule_set.name}")
+    engine.run()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+"""Vectorized heuristic evaluation for k-in-a-row boards.
+
+Scores positions by counting open windows: every run of k cells along a
+row, column or diagonal that holds stones of only one side. A window with
+n of a side's stones is an open line of length n for that side. Window
+sums are taken with shifted-slice additions over a stack of boards, so a
+whole batch of positions (for example every child of a search node) is
+scored in one call.
+
+Boards are int8 arrays using the base-3 digits of tic_tac_toe.encoding
+(0 empty, 1 PLAYER, 2 COMPUTER), shaped (size, size) or (n, size, size).
+"""
+
+import numpy as np
+from .constants import PLAYER, COMPUTER
+from .encoding import DIGITS
+
+# Row and column steps of the four line directions.
+DIRECTIONS = ((0, 1), (1, 0), (1, 1), (1, -1))
+
+
+def to_array(board):
+    """Convert a nested-list board to an int8 array.
+
+    Args:
+        board: Current board state
+
+    Returns:
+        Array of shape (size, size)
+    """
+    return np.array([[DIGITS[cell] for cell in row] for row in board], dtype=np.int8)
+
+
+def _window_sums(planes, k, dr, dc):
+    """Sum every k-long window along one direction.
+
+    Args:
+        planes: Array of shape (n, rows, cols) with 0/1 entries
+        k: Window length
+        dr: Row step (0 or 1)
+        dc: Column step (-1, 0 or 1)
+
+    Returns:
+        Array of shape (n, window rows, window cols)
+    """
+    _, rows, cols = planes.shape
+    span_r = rows - dr * (k - 1)
+    span_c = cols - abs(dc) * (k - 1)
+    if span_r <= 0 or span_c <= 0:
+        return np.zeros((planes.shape[0], 0, 0), dtype=np.int16)
+
+    total = np.zeros((planes.shape[0], span_r, span_c), dtype=np.int16)
+    for t in range(k):
+        r0 = t * dr
+        c0 = t * dc if dc >= 0 else (k - 1 - t) * -dc
+        total += planes[:, r0:r0 + span_r, c0:c0 + span_c]
+    return total
+
+
+def line_counts(boards, k):
+    """Count open lines of each length for both sides.
+
+    Args:
+        boards: Array of shape (size, size) or (n, size, size)
+        k: Number in a row needed to win
+
+    Returns:
+        Tuple of two int arrays shaped (n, k + 1), for PLAYER and COMPUTER;
+        entry [i, length] is the number of open windows on board i holding
+        exactly `length` of that side's stones (column 0 is unused)
+    """
+    boards = np.asarray(boards, dtype=np.int8)
+    if boards.ndim == 2:
+        boards = boards[np.newaxis]
+    n = boards.shape[0]
+    player = (boards == DIGITS[PLAYER]).astype(np.int8)
+    computer = (boards == DIGITS[COMPUTER]).astype(np.int8)
+
+    player_counts = np.zeros((n, k + 1), dtype=np.int64)
+    computer_counts = np.zeros((n, k + 1), dtype=np.int64)
+    offsets = np.arange(n)[:, np.newaxis] * (k + 1)
+
+    for dr, dc in DIRECTIONS:
+        mine = _window_sums(player, k, dr, dc).reshape(n, -1)
+        theirs = _window_sums(computer, k, dr, dc).reshape(n, -1)
+        if mine.shape[1] == 0:
+            continue
+        # Only windows free of the opponent count; bin by (board, length).
+        player_bins = np.where(theirs == 0, mine + offsets, offsets)
+        computer_bins = np.where(mine == 0, theirs + offsets, offsets)
+        player_counts += np.bincount(player_bins.ravel(), minlength=n * (k + 1)).reshape(n, k + 1)
+        computer_counts += np.bincount(computer_bins.ravel(), minlength=n * (k + 1)).reshape(n, k + 1)
+
+    player_counts[:, 0] = 0
+    computer_counts[:, 0] = 0
+    return player_counts, computer_counts
+
+
+def default_weights(k):
+    """Get length weights that grow tenfold per stone.
+
+    Args:
+        k: Number in a row needed to win
+
+    Returns:
+        Float array of shape (k + 1,); a completed line outweighs any
+        number of shorter ones
+    """
+    weights = np.array([0.0] + [10.0 ** (length - 1) for length in range(1, k + 1)])
+    weights[k] = 1e9
+    return weights
+
+
+def evaluate_batch(boards, k, player=COMPUTER, weights=None):
+    """Score a batch of boards for one side.
+
+    Args:
+        boards: Array of shape (size, size) or (n, size, size)
+        k: Number in a row needed to win
+        player: Marker whose point of view is scored
+        weights: Per-length weights, defaults to default_weights(k)
+
+    Returns:
+        Float array of shape (n,); higher is better for `player`
+    """
+    weights = default_weights(k) if weights is None else np.asarray(weights, dtype=float)
+    player_counts, computer_counts = line_counts(boards, k)
+    score = (computer_counts - player_counts) @ weights
+    return score if player == COMPUTER else -score
+
+
+def evaluate(board, k, player=COMPUTER, weights=None):
+    """Score a single board for one side.
+
+    Args:
+        board: Nested-list board or array of shape (size, size)
+        k: Number in a row needed to win
+        player: Marker whose point of view is scored
+        weights: Per-length weights, defaults to default_weights(k)
+
+    Returns:
+        Score as a float; higher is better for `player`
+    """
+    if not isinstance(board, np.ndarray):
+        board = to_array(board)
+    return float(evaluate_batch(board, k, player, weights)[0])
+
+
+def evaluate_children(board, moves, marker, k, weights=None):
+    """Score every child of a position in one batched call.
+
+    Args:
+        board: Nested-list board or array of shape (size, size)
+        moves: Sequence of (row, col) empty cells
+        marker: Marker placed by each move; scores are from its point of view
+        k: Number in a row needed to win
+        weights: Per-length weights, defaults to default_weights(k)
+
+    Returns:
+        Float array with one score per move, in the order given
+    """
+    if not isinstance(board, np.ndarray):
+        board = to_array(board)
+    if not moves:
+        return np.zeros(0)
+    rows, cols = np.array(moves, dtype=np.intp).T
+    children = np.repeat(board[np.newaxis], len(moves), axis=0)
+    children[np.arange(len(moves)), rows, cols] = DIGITS[marker]
+    return evaluate_batch(children, k, marker, weights)
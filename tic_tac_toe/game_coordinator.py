@@ -6,88 +6,307 @@ Uses Separation of Concerns principle.
 
 import sys
 from .game_state import GameState
-from .rules import TicTacToeRules
-from .ai_strategy import AIStrategyFactory
-from .input import get_player_move
-from .board import print_board
-from .ui import (display_menu, display_result, display_scores,
-                 display_play_again_prompt, get_difficulty_input)
+from .rules import get_rule_set, line_rule_set
+from .input import UNDO, REDO, get_player_move
+from .board import print_board, print_layers
+from .ui import (display_menu, display_result, display_scores, display_illegal_move,
+                 display_play_again_prompt, get_difficulty_input,
+                 display_thinking, clear_thinking)
 from .score_tracker import ScoreTracker
-from .constants import PLAYER, COMPUTER, GameResult
+from .game_log import append_games, game_record
+from .strategy_pool import shared_pool
+from .thinking import MoveWorker, wait_for_move
+from .tracing import span, tracer
+from .constants import (AI_THINK_TIME, BOARD_VARIANTS, RULE_VARIANTS, GAME_LOG_FILE,
+                        PLAYER, COMPUTER, GameResult)
 
 
 class TicTacToeGame:
     """Main game class that coordinates game flow."""
 
-    def __init__(self, score_tracker):
+    def __init__(self, score_tracker, rule_set=None, think_time=None, show_thinking=False,
+                 spectators=None, strategy_pool=None, player_input=None):
         """Initialize game with score tracker.
 
         Args:
             score_tracker: ScoreTracker instance
+            rule_set: RuleSet for the standard board, defaults to the
+                standard rules
+            think_time: Think-time cap for AI moves in seconds, or None
+                for no cap
+            show_thinking: Show a spinner while the AI thinks
+            spectators: Optional SpectatorHub that receives every move
+            strategy_pool: StrategyPool whose shared caches strategies
+                use, defaults to the process-wide shared_pool
+            player_input: Callable(board, last_move=None) returning the
+                player's move, UNDO or REDO, defaults to reading the keyboard
         """
         self.score_tracker = score_tracker
         self.game_state = GameState()
+        self.base_rule_set = rule_set or get_rule_set()
+        self.rule_set = self.base_rule_set
+        self.difficulty = None
         self.current_strategy = None
+        self.think_time = think_time
+        self.show_thinking = show_thinking
+        self.spectators = spectators
+        self.strategy_pool = strategy_pool or shared_pool
+        self.player_input = player_input
+        self._broadcast_board()
 
     def start_new_game(self):
         """Start a new game."""
         self.game_state.reset()
+        if self.current_strategy is not None:
+            self.current_strategy.new_game()
+        self._broadcast_board()
 
     def set_difficulty(self, difficulty):
         """Set AI difficulty.
 
+        Modes listed in RULE_VARIANTS (such as Ultimate) play their own
+        rule set and modes in BOARD_VARIANTS (such as Gomoku) play
+        k-in-a-row rules, both switching the board size; other
+        difficulties use the rule set the game was created with.
+
         Args:
-            difficulty: Difficulty constant (Difficulty.EASY, MEDIUM, or HARD)
+            difficulty: Difficulty constant (Difficulty.EASY, MEDIUM, HARD, ...)
         """
-        self.current_strategy = AIStrategyFactory.create(difficulty)
+        self.difficulty = difficulty
+        if difficulty in RULE_VARIANTS:
+            self.rule_set = get_rule_set(RULE_VARIANTS[difficulty])
+        elif difficulty in BOARD_VARIANTS:
+            self.rule_set = line_rule_set(*BOARD_VARIANTS[difficulty])
+        else:
+            self.rule_set = self.base_rule_set
+        if self.rule_set.size != self.game_state.size:
+            self.game_state = GameState(self.rule_set.size)
+            self._broadcast_board()
+        self.current_strategy = self.strategy_pool.create(difficulty, rule_set=self.rule_set)
 
     def play_turn(self):
         """Play one turn of the game.
 
+        The player may answer with UNDO or REDO instead of a move, which
+        takes back or replays their last turn (see undo_turn() and
+        redo_turn()).
+
         Returns:
             Legacy result dictionary with `reason` key, or None if move cancelled.
+            An undo has reason 'undo'; a redo returns redo_turn()'s result.
         """
-        if self.game_state.is_player_turn():
-            move = get_player_move(self.game_state.board, last_move=self.game_state.last_move)
-            marker = PLAYER
-        else:
-            move = self.current_strategy.get_move(self.game_state.board) if self.current_strategy else None
-            marker = COMPUTER
+        state = self.game_state
+        with span('turn', side=state.current_player):
+            if state.is_player_turn():
+                with span('input'):
+                    if self.player_input is not None:
+                        move = self.player_input(state.board, last_move=state.last_move)
+                    else:
+                        move = get_player_move(state.board, last_move=state.last_move,
+                                               can_undo=state.can_undo(),
+                                               can_redo=state.can_redo())
+                if move == UNDO:
+                    return {'reason': 'undo', 'result': None} if self.undo_turn() else None
+                if move == REDO:
+                    return self.redo_turn()
+                side = PLAYER
+            elif self.current_strategy is None:
+                move, side = None, COMPUTER
+            else:
+                with span('ai', difficulty=self.difficulty):
+                    move = self._computer_move()
+                side = COMPUTER
+
+            return self.play_move(move, side)
+
+    def play_move(self, move, side):
+        """Play a move that was chosen elsewhere.
+
+        Args:
+            move: (row, col) or, under wild rules, (row, col, marker); None
+                plays nothing
+            side: Side to move, PLAYER or COMPUTER
 
+        Returns:
+            Legacy result dictionary with `reason` key, or None if the move
+            is missing or illegal.
+        """
         if move is None:
             return None
+        state = self.game_state
+        rules = self.rule_set
 
-        row, col = move
-        if not TicTacToeRules.make_move(self.game_state.board, row, col, marker):
+        # Under wild rules a move may name the marker it places.
+        row, col = move[0], move[1]
+        marker = move[2] if len(move) > 2 else side
+        if marker not in rules.markers[side]:
+            return None
+        if rules.uses_last_move and (row, col) not in state.legal_moves(rules):
+            if side == PLAYER:
+                display_illegal_move()
             return None
-        self.game_state.last_move = (row, col)
+        if not state.make_move(row, col, marker):
+            return None
+        with span('rules'):
+            result = self._judge_move(side)
+        if self.spectators is not None:
+            self.spectators.publish(row, col, marker, result['reason'])
+        return result
+
+    def _broadcast_board(self, result='continue'):
+        """Send spectators the whole board, e.g. after an undo."""
+        if self.spectators is not None:
+            self.spectators.reset(self.game_state.board, result)
+
+    def _computer_move(self):
+        """Ask the strategy for a move on a worker thread.
+
+        The caller waits, drawing the spinner if enabled. Ctrl+C or the
+        think-time cap makes the strategy play its best move so far.
+
+        Returns:
+            Move returned by the strategy
+        """
+        state = self.game_state
+        options = {'last_move': state.last_move} if self.rule_set.uses_last_move else {}
+        worker = MoveWorker(self.current_strategy, state.board, self.think_time, **options)
+        worker.start()
+        if not self.show_thinking:
+            return wait_for_move(worker)
+        try:
+            return wait_for_move(worker, on_tick=display_thinking)
+        finally:
+            clear_thinking()
+
+    def _judge_move(self, side):
+        """Apply the rules to the move just made by `side`, passing the turn on.
+
+        Args:
+            side: Marker of the side that just moved
+
+        Returns:
+            Legacy result dictionary with `reason` and `result` keys
+        """
+        result = self._score_move(side)
+        if result['reason'] == 'continue':
+            self.game_state.switch_player()
+        return result
+
+    def _score_move(self, side):
+        """Record a win or draw by the move just made by `side`.
+
+        Args:
+            side: Marker of the side that just moved
 
-        winning_line = TicTacToeRules.get_winning_line(self.game_state.board, marker)
+        Returns:
+            Legacy result dictionary with `reason` and `result` keys
+        """
+        state = self.game_state
+        board = state.board
+        row, col = state.last_move
+        winning_line = self.rule_set.completed_line(board, row, col)
         if winning_line:
-            result = GameResult.PLAYER_WIN if marker == PLAYER else GameResult.COMPUTER_WIN
-            self.game_state.winner = 'player' if marker == PLAYER else 'computer'
-            self.game_state.game_over_reason = 'win'
-            self.game_state.winning_line = winning_line
+            winner = self.rule_set.winner_of[side]
+            result = GameResult.PLAYER_WIN if winner == PLAYER else GameResult.COMPUTER_WIN
+            state.winner = 'player' if winner == PLAYER else 'computer'
+            state.game_over_reason = 'win'
+            state.winning_line = winning_line
             return {'reason': 'win', 'result': result}
-        if TicTacToeRules.is_full(self.game_state.board):
-            self.game_state.game_over_reason = 'draw'
+        if not self.rule_set.legal_moves(board, state.last_move):
+            state.game_over_reason = 'draw'
             return {'reason': 'draw', 'result': GameResult.DRAW}
-
-        self.game_state.switch_player()
         return {'reason': 'continue', 'result': None}
 
+    def undo_turn(self):
+        """Take back moves until it is the player's turn again.
+
+        This undoes the computer's reply together with the player's move
+        that prompted it.
+
+        Returns:
+            List of undone (row, col) moves, most recent first
+        """
+        state = self.game_state
+        undone = []
+        while state.can_undo():
+            undone.append(state.undo())
+            if state.is_player_turn():
+                break
+        if undone:
+            self._broadcast_board()
+        return undone
+
+    def redo_turn(self):
+        """Replay undone moves until it is the player's turn or the game ends.
+
+        Returns:
+            Result dictionary of the last replayed move, or None if nothing to redo
+        """
+        state = self.game_state
+        result = None
+        while state.can_redo():
+            side = state.current_player
+            state.redo()
+            result = self._score_move(side)
+            if result['reason'] != 'continue' or state.is_player_turn():
+                break
+        if result is not None:
+            self._broadcast_board(result['reason'])
+        return result
+
+    def game_record(self):
+        """Build a move log record of the game so far.
+
+        Returns:
+            Record dictionary from game_log.game_record()
+        """
+        return game_record(self.game_state.moves, x='human', o=self.difficulty,
+                           difficulty=self.difficulty, rules=self.rule_set.name)
+
     def display_board(self):
         """Display the current board state."""
+        with span('render'):
+            self._draw_board()
+
+    def _draw_board(self):
+        """Draw the board for the current rule set."""
+        if self.rule_set.layer_size:
+            print_layers(
+                self.game_state.board,
+                self.rule_set.layer_size,
+                last_move=self.game_state.last_move,
+                winning_line=self.game_state.winning_line,
+            )
+            return
         print_board(
             self.game_state.board,
             last_move=self.game_state.last_move,
             winning_line=self.game_state.winning_line,
             show_labels=True,
+            block_size=self.rule_set.block_size,
         )
 
 
-def play_game():
-    """Main game loop."""
+def play_game(trace_file=None):
+    """Main game loop.
+
+    Args:
+        trace_file: Path to write a Chrome trace of the session to when
+            it ends, or None to leave tracing off
+    """
+    if trace_file is None:
+        _play_games()
+        return
+    tracer.enable()
+    try:
+        _play_games()
+    finally:
+        tracer.disable()
+        tracer.export_chrome(trace_file)
+
+
+def _play_games():
+    """Play games until the player stops."""
     score_tracker = ScoreTracker()
 
     # Show stats at program start
@@ -100,24 +319,30 @@ def play_game():
         difficulty = get_difficulty_input()
 
         # Create and initialize game
-        game = TicTacToeGame(score_tracker)
+        game = TicTacToeGame(score_tracker, think_time=AI_THINK_TIME, show_thinking=True)
         game.set_difficulty(difficulty)
         game.start_new_game()
 
         # Play the game
         result = None
-        while True:
-            game.display_board()
-            result = game.play_turn()
-            if result and result.get('reason') in ('win', 'draw'):
-                break
+        with span('game', difficulty=difficulty):
+            while True:
+                game.display_board()
+                result = game.play_turn()
+                if result and result.get('reason') in ('win', 'draw'):
+                    break
 
-        # Show final board state (including winning line) before result.
-        game.display_board()
+            # Show final board state (including winning line) before result.
+            game.display_board()
 
-        # Record and display result
-        game_result = result['result']
-        score_tracker.record_result(game_result)
+            # Record and display result
+            game_result = result['result']
+            with span('persist'):
+                score_tracker.record_result(game_result)
+                try:
+                    append_games(GAME_LOG_FILE, [game.game_record()])
+                except OSError:
+                    pass  # The move log is optional; never interrupt play for it
         display_result(game_result)
         display_scores(score_tracker)
 
@@ -0,0 +1,86 @@
+"""Move log of finished games.
+
+Games are stored one JSON object per line, so logs can be appended to
+cheaply and read back as a stream. A record holds the moves in order and
+who played each side:
+
+    {"x": "human", "o": "medium", "difficulty": "medium",
+     "rules": "standard", "moves": [[1, 1], [0, 0], ...]}
+"""
+
+import json
+from .rules import STANDARD
+
+
+def game_record(moves, x, o, difficulty=None, rules=STANDARD):
+    """Build a log record for a finished game.
+
+    Args:
+        moves: (row, col) moves in the order played, X first
+        x: Name of the side that played X
+        o: Name of the side that played O
+        difficulty: Difficulty the game was played at, if any
+        rules: Name of the rule set
+
+    Returns:
+        Record dictionary
+    """
+    return {
+        'x': x,
+        'o': o,
+        'difficulty': difficulty,
+        'rules': rules,
+        'moves': [[row, col] for row, col in moves],
+    }
+
+
+def format_record(record):
+    """Serialize a record as one log line.
+
+    Args:
+        record: Record dictionary
+
+    Returns:
+        JSON line ending in a newline
+    """
+    return json.dumps(record, separators=(',', ':')) + "\n"
+
+
+def append_games(path, records):
+    """Append records to a log file.
+
+    Args:
+        path: Log file path
+        records: Iterable of record dictionaries
+    """
+    with open(path, 'a') as f:
+        for record in records:
+            f.write(format_record(record))
+
+
+def iter_lines(path):
+    """Stream the non-empty lines of a log file without loading it whole.
+
+    Args:
+        path: Log file path
+
+    Yields:
+        Raw JSON lines
+    """
+    with open(path, 'r') as f:
+        for line in f:
+            if line.strip():
+                yield line
+
+
+def iter_games(path):
+    """Stream the records of a log file.
+
+    Args:
+        path: Log file path
+
+    Yields:
+        Record dictionaries
+    """
+    for line in iter_lines(path):
+        yield json.loads(line)
@@ -2,17 +2,51 @@
 
 Implements the Single Responsibility Principle by managing game state
 separately from game rules and display concerns.
+
+Cells are kept in a flat list with a move stack, so making and undoing a
+move are O(1) and snapshots are a single tuple copy. A GameState compares
+by value but is mutable and unhashable; snapshot() is its immutable,
+hashable form. Zobrist hashes for
+the position and its seven symmetric images are updated with each move.
 """
 
 from .constants import BOARD_SIZE, PLAYER, COMPUTER
+from .rules import TicTacToeRules
+from .zobrist import get_table
+
+EMPTY = ' '
 
 
 class GameState:
     """Manages the current state of a Tic-Tac-Toe game."""
 
-    def __init__(self):
-        """Initialize a new game state."""
-        self.board = [[' ' for _ in range(BOARD_SIZE)] for _ in range(BOARD_SIZE)]
+    __slots__ = (
+        'size',
+        'current_player',
+        'is_active',
+        'game_over_reason',
+        'winner',
+        'last_move',
+        'winning_line',
+        '_cells',
+        '_history',
+        '_redo',
+        '_zobrist',
+        '_hashes',
+    )
+
+    def __init__(self, size=BOARD_SIZE):
+        """Initialize a new game state.
+
+        Args:
+            size: Board dimension
+        """
+        self.size = size
+        self._cells = [EMPTY] * (size * size)
+        self._history = []
+        self._redo = []
+        self._zobrist = get_table(size)
+        self._hashes = [0] * 8
         self.current_player = PLAYER
         self.is_active = True
         self.game_over_reason = None
@@ -21,8 +55,15 @@ class GameState:
         self.winning_line = None
 
     def reset(self):
-        """Reset the game to initial state."""
-        self.board = [[' ' for _ in range(BOARD_SIZE)] for _ in range(BOARD_SIZE)]
+        """Reset the game to initial state, reusing the cell storage."""
+        cells = self._cells
+        for index in range(len(cells)):
+            cells[index] = EMPTY
+        hashes = self._hashes
+        for t in range(len(hashes)):
+            hashes[t] = 0
+        self._history.clear()
+        self._redo.clear()
         self.current_player = PLAYER
         self.is_active = True
         self.game_over_reason = None
@@ -30,6 +71,196 @@ class GameState:
         self.last_move = None
         self.winning_line = None
 
+    @property
+    def board(self):
+        """Board as a new nested list of rows (safe to hand to strategies)."""
+        cells = self._cells
+        size = self.size
+        return [cells[i:i + size] for i in range(0, size * size, size)]
+
+    @board.setter
+    def board(self, rows):
+        """Load a position from nested rows, discarding the move history."""
+        self.size = len(rows)
+        self._cells = [cell for row in rows for cell in row]
+        self._zobrist = get_table(self.size)
+        self._hashes = self._zobrist.symmetric_hashes(self._cells)
+        self._history = []
+        self._redo = []
+        self.last_move = None
+
+    def cell(self, row, col):
+        """Get the marker at a cell.
+
+        Args:
+            row: Row position
+            col: Column position
+
+        Returns:
+            Marker ('X', 'O') or ' ' for an empty cell
+        """
+        return self._cells[row * self.size + col]
+
+    @property
+    def move_count(self):
+        """Number of moves on the move stack."""
+        return len(self._history)
+
+    @property
+    def moves(self):
+        """Moves on the move stack as (row, col) tuples, oldest first."""
+        return [divmod(index, self.size) for index, _, _ in self._history]
+
+    @property
+    def zobrist_key(self):
+        """64-bit Zobrist hash of the board, stable across runs."""
+        return self._hashes[0]
+
+    @property
+    def canonical_key(self):
+        """Zobrist hash shared by all eight symmetric images of the board."""
+        return min(self._hashes)
+
+    @property
+    def symmetric_keys(self):
+        """Zobrist hashes of the board under each of the eight symmetries."""
+        return tuple(self._hashes)
+
+    def _toggle_hash(self, index, marker):
+        """XOR a marker on a cell into every symmetric hash."""
+        hashes = self._hashes
+        keys = self._zobrist.symmetric_keys[marker][index]
+        for t in range(8):
+            hashes[t] ^= keys[t]
+
+    def make_move(self, row, col, marker=None):
+        """Place a marker and push the move onto the move stack.
+
+        The side to move is not changed; callers switch players once the
+        move has been judged by the rules. Making a new move clears the
+        redo stack.
+
+        Args:
+            row: Row position
+            col: Column position
+            marker: Marker to place, defaults to the current player
+
+        Returns:
+            True if move was successful, False otherwise
+        """
+        if not (0 <= row < self.size and 0 <= col < self.size):
+            return False
+        index = row * self.size + col
+        if self._cells[index] != EMPTY:
+            return False
+        marker = marker or self.current_player
+        self._cells[index] = marker
+        self._toggle_hash(index, marker)
+        self._history.append((index, self.last_move, self.current_player))
+        self._redo.clear()
+        self.last_move = (row, col)
+        return True
+
+    def undo(self):
+        """Take back the most recent move.
+
+        The side that made the move becomes the side to move again and
+        any game-over information is cleared.
+
+        Returns:
+            (row, col) of the undone move, or None if there is nothing to undo
+        """
+        if not self._history:
+            return None
+        index, previous_last_move, mover = self._history.pop()
+        marker = self._cells[index]
+        self._cells[index] = EMPTY
+        self._toggle_hash(index, marker)
+        self._redo.append((index, marker, mover))
+        self.last_move = previous_last_move
+        self.current_player = mover
+        self.is_active = True
+        self.game_over_reason = None
+        self.winner = None
+        self.winning_line = None
+        return divmod(index, self.size)
+
+    def redo(self):
+        """Replay the most recently undone move.
+
+        The side that made the move plays it again and the other side
+        becomes the side to move, reversing undo().
+
+        Returns:
+            (row, col) of the replayed move, or None if there is nothing to redo
+        """
+        if not self._redo:
+            return None
+        index, marker, mover = self._redo.pop()
+        self._cells[index] = marker
+        self._toggle_hash(index, marker)
+        self._history.append((index, self.last_move, mover))
+        self.last_move = divmod(index, self.size)
+        self.current_player = COMPUTER if mover == PLAYER else PLAYER
+        return self.last_move
+
+    def legal_moves(self, rule_set=None):
+        """Get the cells the side to move may play.
+
+        Args:
+            rule_set: RuleSet in play; rules such as Ultimate restrict
+                moves based on last_move. Defaults to every empty cell.
+
+        Returns:
+            List of (row, col) tuples
+        """
+        return TicTacToeRules.get_legal_moves(self.board, self.last_move, rule_set)
+
+    def can_undo(self):
+        """Check whether there is a move to take back."""
+        return bool(self._history)
+
+    def can_redo(self):
+        """Check whether there is an undone move to replay."""
+        return bool(self._redo)
+
+    def snapshot(self):
+        """Capture the position as an immutable, hashable value.
+
+        Returns:
+            Tuple of (cells tuple, current player)
+        """
+        return tuple(self._cells), self.current_player
+
+    @classmethod
+    def from_snapshot(cls, snapshot):
+        """Create a state from a snapshot() value.
+
+        Args:
+            snapshot: Tuple of (cells tuple, current player)
+
+        Returns:
+            New GameState with an empty move stack
+        """
+        cells, current_player = snapshot
+        size = int(round(len(cells) ** 0.5))
+        state = cls(size)
+        state._cells = list(cells)
+        state._hashes = state._zobrist.symmetric_hashes(state._cells)
+        state.current_player = current_player
+        return state
+
+    def __eq__(self, other):
+        if not isinstance(other, GameState):
+            return NotImplemented
+        return (self.current_player == other.current_player
+                and self.size == other.size
+                and self._cells == other._cells)
+
+    # A state changes with every move, so it is not hashable; key sets and
+    # dictionaries on snapshot() instead.
+    __hash__ = None
+
     def switch_player(self):
         """Switch to the other player."""
         self.current_player = COMPUTER if self.current_player == PLAYER else PLAYER
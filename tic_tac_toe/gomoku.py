@@ -0,0 +1,258 @@
+"""Gomoku engine: incremental threat tracking and threat-space search.
+
+Moves are only generated next to existing stones. Every k-cell window
+on the board keeps a count of each side's stones, updated as stones are
+placed and removed, so fours (windows one stone short of a win) are known
+without rescanning the board. Threat-space search plays only forcing
+moves - fours and open threes - and checks every defence against them
+to find forced wins.
+"""
+
+from functools import lru_cache
+from .constants import PLAYER, COMPUTER, GOMOKU_WIN_LENGTH
+from .rules import line_runs
+
+# Empty cells within this many steps of a stone are candidate moves.
+NEIGHBOURHOOD = 2
+
+DEFAULT_TSS_DEPTH = 5
+DEFAULT_TSS_NODES = 1000
+
+
+def opponent(marker):
+    """Get the other side's marker."""
+    return COMPUTER if marker == PLAYER else PLAYER
+
+
+@lru_cache(maxsize=None)
+def board_geometry(size, win_length):
+    """Precompute the windows and neighbourhoods of a board.
+
+    Args:
+        size: Board dimension
+        win_length: Number in a row needed to win
+
+    Returns:
+        Tuple of (windows, windows_through, long_windows_through,
+        neighbours). windows lists every win_length run of cell indices;
+        windows_through[i] lists the ids of windows containing cell i;
+        long_windows_through[i] lists the win_length + 1 runs that have
+        cell i strictly inside; neighbours[i] lists the cells within
+        NEIGHBOURHOOD of cell i.
+    """
+    cells = size * size
+    windows = line_runs(size, win_length)
+    windows_through = [[] for _ in range(cells)]
+    for window_id, window in enumerate(windows):
+        for index in window:
+            windows_through[index].append(window_id)
+
+    long_windows_through = [[] for _ in range(cells)]
+    for window in line_runs(size, win_length + 1):
+        for index in window[1:-1]:
+            long_windows_through[index].append(window)
+
+    neighbours = []
+    for index in range(cells):
+        r, c = divmod(index, size)
+        neighbours.append(tuple(
+            nr * size + nc
+            for nr in range(max(0, r - NEIGHBOURHOOD), min(size, r + NEIGHBOURHOOD + 1))
+            for nc in range(max(0, c - NEIGHBOURHOOD), min(size, c + NEIGHBOURHOOD + 1))
+            if (nr, nc) != (r, c)
+        ))
+
+    return (windows, tuple(map(tuple, windows_through)),
+            tuple(map(tuple, long_windows_through)), tuple(neighbours))
+
+
+class ThreatBoard:
+    """Flat Gomoku board with per-window stone counts kept up to date."""
+
+    def __init__(self, board, win_length=GOMOKU_WIN_LENGTH):
+        """Load a position.
+
+        Args:
+            board: Current board state (not modified)
+            win_length: Number in a row needed to win
+        """
+        self.size = len(board)
+        self.win_length = win_length
+        (self.windows, self.windows_through,
+         self.long_windows_through, self.neighbours) = board_geometry(self.size, win_length)
+        cells = self.size * self.size
+        self.cells = [' '] * cells
+        self.near = [0] * cells
+        self.stones = 0
+        self.count = {PLAYER: [0] * len(self.windows), COMPUTER: [0] * len(self.windows)}
+        # fours[marker]: completing cell -> number of windows it completes
+        self.fours = {PLAYER: {}, COMPUTER: {}}
+
+        for i, row in enumerate(board):
+            for j, cell in enumerate(row):
+                if cell != ' ':
+                    self.place(i * self.size + j, cell)
+
+    def _track_four(self, window_id, delta):
+        """Add or remove a window's contribution to the four registry."""
+        for marker in (PLAYER, COMPUTER):
+            if (self.count[marker][window_id] == self.win_length - 1
+                    and self.count[opponent(marker)][window_id] == 0):
+                for index in self.windows[window_id]:
+                    if self.cells[index] == ' ':
+                        fours = self.fours[marker]
+                        fours[index] = fours.get(index, 0) + delta
+                        if not fours[index]:
+                            del fours[index]
+                        break
+
+    def place(self, index, marker):
+        """Put a stone on an empty cell.
+
+        Args:
+            index: Flat cell index
+            marker: Marker to place
+        """
+        counts = self.count[marker]
+        for window_id in self.windows_through[index]:
+            self._track_four(window_id, -1)
+            counts[window_id] += 1
+        self.cells[index] = marker
+        for window_id in self.windows_through[index]:
+            self._track_four(window_id, 1)
+        for neighbour in self.neighbours[index]:
+            self.near[neighbour] += 1
+        self.stones += 1
+
+    def remove(self, index):
+        """Take a stone back off the board.
+
+        Args:
+            index: Flat cell index of a stone
+        """
+        counts = self.count[self.cells[index]]
+        for window_id in self.windows_through[index]:
+            self._track_four(window_id, -1)
+            counts[window_id] -= 1
+        self.cells[index] = ' '
+        for window_id in self.windows_through[index]:
+            self._track_four(window_id, 1)
+        for neighbour in self.neighbours[index]:
+            self.near[neighbour] -= 1
+        self.stones -= 1
+
+    def candidates(self):
+        """Get the empty cells next to existing stones.
+
+        Returns:
+            List of flat cell indices; the centre on an empty board
+        """
+        if not self.stones:
+            return [(self.size // 2) * self.size + self.size // 2]
+        cells = self.cells
+        near = self.near
+        return [i for i in range(len(cells)) if near[i] and cells[i] == ' ']
+
+    def threat_moves(self, marker):
+        """Get candidate moves that may make a four or an open three.
+
+        Args:
+            marker: Attacking side
+
+        Returns:
+            List of flat cell indices, four-making moves first
+        """
+        other_counts = self.count[opponent(marker)]
+        counts = self.count[marker]
+        four_level = self.win_length - 2
+        fours, threes = [], []
+        for index in self.candidates():
+            best = 0
+            for window_id in self.windows_through[index]:
+                if not other_counts[window_id] and counts[window_id] > best:
+                    best = counts[window_id]
+            if best == four_level:
+                fours.append(index)
+            elif best == four_level - 1:
+                threes.append(index)
+        return fours + threes
+
+    def open_three_defences(self, index, marker):
+        """Get the replies to open threes made by the stone at a cell.
+
+        An open three is a run of win_length + 1 cells with both ends
+        empty and win_length - 2 of the attacker's stones and one gap
+        inside; left alone it becomes an open four.
+
+        Args:
+            index: Cell of the stone just placed
+            marker: Side that placed it
+
+        Returns:
+            List of empty cells that defend against every such three
+        """
+        cells = self.cells
+        other = opponent(marker)
+        defences = set()
+        for window in self.long_windows_through[index]:
+            if cells[window[0]] != ' ' or cells[window[-1]] != ' ':
+                continue
+            inside = [cells[i] for i in window[1:-1]]
+            if other in inside or inside.count(marker) != self.win_length - 2:
+                continue
+            defences.add(window[0])
+            defences.add(window[-1])
+            defences.update(i for i in window[1:-1] if cells[i] == ' ')
+        return sorted(defences)
+
+
+def threat_space_search(threats, attacker, max_depth=DEFAULT_TSS_DEPTH,
+                        max_nodes=DEFAULT_TSS_NODES, stop=None):
+    """Look for a forced win made only of fours and open threes.
+
+    The attacker only plays threats; after each one every defence is
+    tried. A line of play is abandoned when the defender gets a four of
+    their own, so wins found are forced under that threat-space model.
+
+    Args:
+        threats: ThreatBoard to search (restored before returning)
+        attacker: Side looking for the win
+        max_depth: Maximum number of attacker moves
+        max_nodes: Search node budget
+        stop: Optional callable polled at every node; True abandons the
+            search as if no win was found
+
+    Returns:
+        Flat index of the first winning move, or None if none was found
+    """
+    defender = opponent(attacker)
+    budget = [max_nodes]
+
+    def search(depth):
+        budget[0] -= 1
+        if threats.fours[attacker]:
+            return next(iter(threats.fours[attacker]))
+        if (threats.fours[defender] or depth == 0 or budget[0] <= 0
+                or (stop is not None and stop())):
+            return None
+
+        for index in threats.threat_moves(attacker):
+            threats.place(index, attacker)
+            if len(threats.fours[attacker]) >= 2:
+                threats.remove(index)
+                return index
+            defences = list(threats.fours[attacker]) or threats.open_three_defences(index, attacker)
+            forced = bool(defences)
+            for defence in defences:
+                threats.place(defence, defender)
+                found = search(depth - 1)
+                threats.remove(defence)
+                if found is None:
+                    forced = False
+                    break
+            threats.remove(index)
+            if forced:
+                return index
+        return None
+
+    return search(max_depth)
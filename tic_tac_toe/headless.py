@@ -0,0 +1,114 @@
+"""Headless game loop for Tic-Tac-Toe.
+
+Plays complete games between two strategies without touching the
+terminal, so tooling (tournaments, training, benchmarks) can drive the
+engine directly through TicTacToeRules and a RuleSet.
+"""
+
+import time
+from .constants import BOARD_SIZE, PLAYER, COMPUTER
+from .rules import TicTacToeRules, line_rule_set
+
+
+def new_board(size=BOARD_SIZE):
+    """Create an empty board.
+
+    Args:
+        size: Board dimension
+
+    Returns:
+        Nested list of empty cells
+    """
+    return [[' ' for _ in range(size)] for _ in range(size)]
+
+
+def swap_markers(board):
+    """Return a copy of the board with X and O exchanged.
+
+    Strategies always play as COMPUTER, so the side playing PLAYER is
+    shown the board from the opposite point of view.
+
+    Args:
+        board: Current board state (not modified)
+
+    Returns:
+        New board with markers swapped
+    """
+    swap = {PLAYER: COMPUTER, COMPUTER: PLAYER, ' ': ' '}
+    return [[swap[cell] for cell in row] for row in board]
+
+
+def play_headless_game(x_strategy, o_strategy, board=None, rule_set=None):
+    """Play one complete game between two strategies.
+
+    X (PLAYER) moves first. A strategy that returns no move or an illegal
+    move (including a marker the rules do not let it place) forfeits the
+    game.
+
+    Args:
+        x_strategy: AIStrategy playing PLAYER
+        o_strategy: AIStrategy playing COMPUTER
+        board: Optional starting board (modified in place)
+        rule_set: RuleSet to play, defaults to a full line on the board
+
+    Returns:
+        Dictionary with winner marker (or None), reason ('win', 'draw' or
+        'forfeit'), the list of moves, the Zobrist key of the final board,
+        and CPU seconds and move counts per marker
+    """
+    board = board if board is not None else new_board()
+    rules = rule_set or line_rule_set(len(board))
+    swap = {PLAYER: COMPUTER, COMPUTER: PLAYER}
+    strategies = {PLAYER: x_strategy, COMPUTER: o_strategy}
+    cpu_time = {PLAYER: 0.0, COMPUTER: 0.0}
+    move_count = {PLAYER: 0, COMPUTER: 0}
+    moves = []
+    marker = PLAYER
+
+    last_move = None
+    key = TicTacToeRules.zobrist_key(board)
+
+    while True:
+        view = board if marker == COMPUTER else swap_markers(board)
+        start = time.process_time()
+        if rules.uses_last_move:
+            move = strategies[marker].get_move(view, last_move=last_move)
+        else:
+            move = strategies[marker].get_move(view)
+        cpu_time[marker] += time.process_time() - start
+        move_count[marker] += 1
+
+        other = swap[marker]
+        placed = marker
+        if move is not None and len(move) > 2:
+            # Moves name markers from the strategy's own point of view.
+            placed = move[2] if marker == COMPUTER else swap[move[2]]
+        if (move is None or placed not in rules.markers[marker]
+                or (rules.uses_last_move
+                    and (move[0], move[1]) not in rules.legal_moves(board, last_move))):
+            reason, winner = 'forfeit', other
+            break
+        moved_key = TicTacToeRules.make_move(board, move[0], move[1], placed, key=key)
+        if moved_key is None:
+            reason, winner = 'forfeit', other
+            break
+        key = moved_key
+        last_move = (move[0], move[1])
+        moves.append(last_move)
+
+        if rules.completed_line(board, move[0], move[1]):
+            reason, winner = 'win', rules.winner_of[marker]
+            break
+        if not rules.legal_moves(board, last_move):
+            reason, winner = 'draw', None
+            break
+        marker = other
+
+    return {
+        'winner': winner,
+        'reason': reason,
+        'moves': moves,
+        'key': key,
+        'cpu_time': cpu_time,
+        'move_count': move_count,
+    }
@@ -0,0 +1,256 @@
+"""Idle-session hibernation.
+
+A live TicTacToeGame holds a GameState, a strategy and whatever the
+strategy caches. A player who walks away leaves all of that in memory.
+hibernate() packs a game into a few bytes and restore() rebuilds it; a
+SessionStore does this for many sessions, hibernating those idle for
+longer than ``idle_timeout`` and restoring them when they are next used.
+
+The packed form is:
+
+- the difficulty name, prefixed by its length (0 for no difficulty)
+- the rule set the game was created with: its position in RULE_SETS, or
+  255 followed by the size and win length of k-in-a-row rules
+- the move stack, one byte per move holding the cell index; under wild
+  rules an O marker adds the cell count
+
+The move stack encodes the board, the side to move and the last move,
+and keeps undo and the move log working after a restore. The redo stack
+and the strategy's per-game memory are not kept. A 3x3 game at Hard is
+at most 15 bytes, and restoring one takes tens of microseconds: the moves
+are replayed onto a fresh GameState and only the last one is judged.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from .constants import PLAYER, COMPUTER
+from .game_coordinator import TicTacToeGame
+from .rules import RULE_SETS, get_rule_set, line_rule_set
+
+DEFAULT_IDLE_TIMEOUT = 300.0
+
+# Rule set byte of k-in-a-row rules that are not in RULE_SETS.
+_LINE_RULES = 255
+
+_RULE_NAMES = tuple(RULE_SETS)
+
+
+def hibernate(game):
+    """Pack a game into its compact form.
+
+    Args:
+        game: TicTacToeGame to pack
+
+    Returns:
+        bytes accepted by restore()
+
+    Raises:
+        ValueError: If the board has more than 256 cells
+    """
+    rules = game.base_rule_set
+    state = game.game_state
+    cells = state.size * state.size
+    wild = game.rule_set.wild
+    if cells * (2 if wild else 1) > 256:
+        raise ValueError(f"Cannot hibernate a game on a {state.size}x{state.size} board")
+
+    difficulty = (game.difficulty or '').encode()
+    data = bytearray([len(difficulty)])
+    data += difficulty
+    if rules.name in RULE_SETS and RULE_SETS[rules.name] is rules:
+        data.append(_RULE_NAMES.index(rules.name))
+    else:
+        data += bytes([_LINE_RULES, rules.size, rules.win_length])
+    for row, col in state.moves:
+        index = row * state.size + col
+        if wild and state.cell(row, col) == COMPUTER:
+            index += cells
+        data.append(index)
+    return bytes(data)
+
+
+def restore(data, score_tracker, **game_options):
+    """Rebuild a game packed by hibernate().
+
+    Args:
+        data: Bytes from hibernate()
+        score_tracker: ScoreTracker of the restored game
+        **game_options: Other TicTacToeGame arguments, such as
+            think_time or strategy_pool
+
+    Returns:
+        TicTacToeGame in the position it was packed in
+    """
+    length = data[0]
+    difficulty = data[1:1 + length].decode() or None
+    position = 1 + length
+    if data[position] == _LINE_RULES:
+        rules = line_rule_set(data[position + 1], data[position + 2])
+        position += 3
+    else:
+        rules = get_rule_set(_RULE_NAMES[data[position]])
+        position += 1
+
+    game = TicTacToeGame(score_tracker, rule_set=rules, **game_options)
+    if difficulty is not None:
+        game.set_difficulty(difficulty)
+    state = game.game_state
+    size = state.size
+    cells = size * size
+    moves = data[position:]
+    for count, index in enumerate(moves, 1):
+        side = state.current_player
+        marker = side
+        if game.rule_set.wild:
+            marker = COMPUTER if index >= cells else PLAYER
+            index %= cells
+        state.make_move(index // size, index % size, marker)
+        if count < len(moves):
+            state.switch_player()
+        else:
+            # Only the last move can have ended the game.
+            game._judge_move(side)
+    return game
+
+
+class SessionStore:
+    """Open games by session id, hibernating the idle ones."""
+
+    def __init__(self, score_tracker, idle_timeout=DEFAULT_IDLE_TIMEOUT,
+                 clock=time.monotonic, **game_options):
+        """Create an empty store.
+
+        Args:
+            score_tracker: ScoreTracker shared by every session's game
+            idle_timeout: Seconds a session may go unused before it is
+                hibernated, or None to keep every session live
+            clock: Time source, for tests
+            **game_options: Other TicTacToeGame arguments for every game,
+                such as think_time or strategy_pool
+        """
+        self.score_tracker = score_tracker
+        self.idle_timeout = idle_timeout
+        self.game_options = game_options
+        self._clock = clock
+        self._live = OrderedDict()  # session id -> (game, last used), oldest first
+        self._hibernated = {}  # session id -> packed game
+        self._lock = threading.Lock()
+        self.hibernations = 0
+        self.restores = 0
+
+    def __len__(self):
+        return len(self._live) + len(self._hibernated)
+
+    def __contains__(self, session_id):
+        return session_id in self._live or session_id in self._hibernated
+
+    def open(self, session_id, difficulty, rule_set=None):
+        """Start a new game for a session, replacing any game it had.
+
+        Args:
+            session_id: Hashable session id
+            difficulty: Difficulty the computer plays at
+            rule_set: RuleSet for the standard board, defaults to the
+                standard rules
+
+        Returns:
+            New TicTacToeGame
+        """
+        game = TicTacToeGame(self.score_tracker, rule_set=rule_set, **self.game_options)
+        game.set_difficulty(difficulty)
+        game.start_new_game()
+        now = self._clock()
+        with self._lock:
+            self._hibernated.pop(session_id, None)
+            self._live.pop(session_id, None)
+            self._live[session_id] = (game, now)
+            self._hibernate_idle_locked(now)
+        return game
+
+    def get(self, session_id):
+        """Get a session's game, restoring it if it is hibernated.
+
+        Args:
+            session_id: Session id passed to open()
+
+        Returns:
+            TicTacToeGame of the session
+
+        Raises:
+            KeyError: If the session is not open
+        """
+        now = self._clock()
+        with self._lock:
+            entry = self._live.pop(session_id, None)
+            if entry is not None:
+                game = entry[0]
+            else:
+                game = restore(self._hibernated.pop(session_id), self.score_tracker,
+                               **self.game_options)
+                self.restores += 1
+            self._live[session_id] = (game, now)
+            self._hibernate_idle_locked(now)
+            return game
+
+    def close(self, session_id):
+        """Forget a session.
+
+        Args:
+            session_id: Session id passed to open()
+        """
+        with self._lock:
+            self._live.pop(session_id, None)
+            self._hibernated.pop(session_id, None)
+
+    def hibernate(self, session_id):
+        """Hibernate one session now, whether idle or not.
+
+        Args:
+            session_id: Session id passed to open()
+        """
+        with self._lock:
+            entry = self._live.pop(session_id, None)
+            if entry is not None:
+                self._hibernated[session_id] = hibernate(entry[0])
+                self.hibernations += 1
+
+    def hibernate_idle(self):
+        """Hibernate idle sessions now rather than on the next open() or get().
+
+        Returns:
+            Number of sessions hibernated
+        """
+        with self._lock:
+            return self._hibernate_idle_locked(self._clock())
+
+    def _hibernate_idle_locked(self, now):
+        """Hibernate sessions unused for longer than idle_timeout."""
+        if self.idle_timeout is None:
+            return 0
+        count = 0
+        while self._live:
+            session_id, (game, used) = next(iter(self._live.items()))
+            if now - used <= self.idle_timeout:
+                break
+            del self._live[session_id]
+            self._hibernated[session_id] = hibernate(game)
+            count += 1
+        self.hibernations += count
+        return count
+
+    def stats(self):
+        """Get store counters.
+
+        Returns:
+            Dictionary with live, hibernated, hibernated_bytes,
+            hibernations and restores
+        """
+        with self._lock:
+            return {
+                'live': len(self._live),
+                'hibernated': len(self._hibernated),
+                'hibernated_bytes': sum(len(data) for data in self._hibernated.values()),
+                'hibernations': self.hibernations,
+                'restores': self.restores,
+            }
@@ -5,18 +5,30 @@ import curses
 from .board import move_cursor
 from .constants import BOARD_SIZE, PLAYER
 
+# Answers to a move prompt that take back or replay the player's last turn.
+UNDO = 'undo'
+REDO = 'redo'
 
-def get_arrow_move(stdscr, board, last_move=None):
+
+def _history_keys(can_undo, can_redo):
+    """Describe the undo and redo keys on offer."""
+    return (("  u: undo" if can_undo else "") + ("  r: redo" if can_redo else ""))
+
+
+def get_arrow_move(stdscr, board, last_move=None, can_undo=False, can_redo=False):
     """Get move using arrow keys and Enter.
 
     Args:
         stdscr: curses window object for input
         board: Current board state
         last_move: Tuple of (row, col) for last move, or None
+        can_undo: Offer 'u' to take back the last turn
+        can_redo: Offer 'r' to replay an undone turn
 
     Returns:
-        Tuple of (row, col) if move made, or None
+        Tuple of (row, col) if move made, UNDO or REDO, or None
     """
+    size = len(board)
     cursor_row, cursor_col = 0, 0  # Start at top-left
 
     # Initialize colors for curses
@@ -39,13 +51,14 @@ def get_arrow_move(stdscr, board, last_move=None):
         stdscr.clear()
         stdscr.refresh()
 
-        # Display board with cursor highlight (no mutation)
+        # Display board with cursor highlight (no mutation).
+        # Large boards drop the separator rows to fit the terminal.
         board_top = 3
-        row_step = 2
-        for i in range(BOARD_SIZE):
+        row_step = 2 if size <= BOARD_SIZE else 1
+        for i in range(size):
             row_y = board_top + i * row_step
             col = 0
-            for j in range(BOARD_SIZE):
+            for j in range(size):
                 is_cursor = i == cursor_row and j == cursor_col
                 is_last = last_move is not None and (i, j) == tuple(last_move)
                 # Show a visible move preview at the cursor on empty cells.
@@ -60,15 +73,15 @@ def get_arrow_move(stdscr, board, last_move=None):
                 else:
                     attr = curses.color_pair(1)
                 stdscr.addstr(row_y, col, cell, attr)
-                if j < BOARD_SIZE - 1:
+                if j < size - 1:
                     stdscr.addstr(row_y, col + 1, " | ", curses.color_pair(1))
                 col += 4
-            if i < BOARD_SIZE - 1:
-                stdscr.addstr(row_y + 1, 0, "-" * 9, curses.color_pair(1))
+            if i < size - 1 and row_step == 2:
+                stdscr.addstr(row_y + 1, 0, "-" * (4 * size - 3), curses.color_pair(1))
 
         # Display instructions
-        instructions_y = board_top + BOARD_SIZE * row_step
-        cursor_pos = f"Cursor: {cursor_row * BOARD_SIZE + cursor_col + 1}"
+        instructions_y = board_top + size * row_step
+        cursor_pos = f"Cursor: {cursor_row * size + cursor_col + 1}"
         stdscr.addstr(instructions_y, 0, cursor_pos, curses.color_pair(2) | curses.A_BOLD)
         stdscr.addstr(
             instructions_y,
@@ -79,7 +92,7 @@ def get_arrow_move(stdscr, board, last_move=None):
         stdscr.addstr(
             instructions_y + 1,
             0,
-            "Ctrl+C: cancel  q: quit",
+            "Ctrl+C: cancel  q: quit" + _history_keys(can_undo, can_redo),
             curses.color_pair(1),
         )
         stdscr.refresh()
@@ -112,6 +125,10 @@ def get_arrow_move(stdscr, board, last_move=None):
                     )
                     stdscr.refresh()
                     time.sleep(1)
+            elif key == ord('u') and can_undo:
+                return UNDO
+            elif key == ord('r') and can_redo:
+                return REDO
             # Handle quit command
             elif key == ord('q'):
                 return None
@@ -122,16 +139,20 @@ def get_arrow_move(stdscr, board, last_move=None):
         stdscr.refresh()
 
 
-def get_player_move(board, last_move=None):
+def get_player_move(board, last_move=None, can_undo=False, can_redo=False):
     """Get valid move from player.
 
     Args:
         board: Current board state
         last_move: Tuple of (row, col) for last move, or None
+        can_undo: Offer to take back the last turn
+        can_redo: Offer to replay an undone turn
 
     Returns:
-        (row, col) tuple of player's move
+        (row, col) tuple of player's move, or UNDO or REDO
     """
+    size = len(board)
+    cells = size * size
     while True:
         # Try arrow key input first
         try:
@@ -141,7 +162,8 @@ def get_player_move(board, last_move=None):
             stdscr.clear()
             stdscr.refresh()
 
-            move = get_arrow_move(stdscr, board, last_move=last_move)
+            move = get_arrow_move(stdscr, board, last_move=last_move,
+                                  can_undo=can_undo, can_redo=can_redo)
 
             if move is not None:
                 curses.endwin()
@@ -155,16 +177,20 @@ def get_player_move(board, last_move=None):
 
         # Fall back to number input
         try:
-            print("Tip: Use arrow keys to move, or enter a number 1-9.")
-            move = input("Enter your move (1-9): ")
+            print(f"Tip: Use arrow keys to move, or enter a number 1-{cells}.")
+            move = input(f"Enter your move (1-{cells}{_history_keys(can_undo, can_redo)}): ")
+            if move.strip() == 'u' and can_undo:
+                return UNDO
+            if move.strip() == 'r' and can_redo:
+                return REDO
             move = int(move)
 
-            if move < 1 or move > 9:
-                print("Please enter a number between 1 and 9.")
+            if move < 1 or move > cells:
+                print(f"Please enter a number between 1 and {cells}.")
                 continue
 
-            row = (move - 1) // BOARD_SIZE
-            col = (move - 1) % BOARD_SIZE
+            row = (move - 1) // size
+            col = (move - 1) % size
 
             if board[row][col] != ' ':
                 print("That position is already taken!")
@@ -0,0 +1,207 @@
+"""Allocation and memory-budget regression harness.
+
+Measures each strategy with tracemalloc in three scenarios:
+
+- ``get_move``: one decision on an empty board, caches cleared first
+- ``play_turn``: one computer turn through TicTacToeGame
+- ``game``: a full headless self-play game
+
+For each it records the peak traced memory above the starting point,
+the memory still held afterwards (per call), and how many garbage
+collections ran, then compares the results with BUDGETS. Every scenario
+is run once before measuring so one-off set-up such as table training
+or lru caches is not counted.
+
+Run with ``python -m tic_tac_toe.memory_budget``; it exits with status 1
+when a budget is exceeded.
+"""
+
+import argparse
+import gc
+import sys
+import tracemalloc
+from .ai_strategy import AIStrategyFactory
+from .constants import PLAYER, Difficulty
+from .game_coordinator import TicTacToeGame
+from .headless import new_board, play_headless_game
+from .score_tracker import InMemoryScoreStorage, ScoreTracker
+
+SCENARIOS = ('get_move', 'play_turn', 'game')
+
+DEFAULT_REPEAT = 20
+
+# Limits per (difficulty, scenario), with headroom over measured values.
+BUDGETS = {
+    (Difficulty.EASY, 'get_move'): {'peak_bytes': 4_000, 'retained_bytes': 512},
+    (Difficulty.EASY, 'play_turn'): {'peak_bytes': 16_000, 'retained_bytes': 1_024},
+    (Difficulty.EASY, 'game'): {'peak_bytes': 12_000, 'retained_bytes': 1_024},
+    (Difficulty.MEDIUM, 'get_move'): {'peak_bytes': 6_000, 'retained_bytes': 512},
+    (Difficulty.MEDIUM, 'play_turn'): {'peak_bytes': 16_000, 'retained_bytes': 1_024},
+    (Difficulty.MEDIUM, 'game'): {'peak_bytes': 16_000, 'retained_bytes': 1_024},
+    (Difficulty.HARD, 'get_move'): {'peak_bytes': 12_000, 'retained_bytes': 512,
+                                    'gc_collections': 2},
+    (Difficulty.HARD, 'play_turn'): {'peak_bytes': 24_000, 'retained_bytes': 1_024,
+                                     'gc_collections': 2},
+    (Difficulty.HARD, 'game'): {'peak_bytes': 16_000, 'retained_bytes': 1_024,
+                                'gc_collections': 2},
+    (Difficulty.TRAINED, 'get_move'): {'peak_bytes': 6_000, 'retained_bytes': 512},
+    (Difficulty.TRAINED, 'play_turn'): {'peak_bytes': 16_000, 'retained_bytes': 1_024},
+    (Difficulty.TRAINED, 'game'): {'peak_bytes': 12_000, 'retained_bytes': 1_024},
+}
+
+
+def _gc_collections():
+    """Total garbage collections run so far, over all generations."""
+    return sum(stats['collections'] for stats in gc.get_stats())
+
+
+def measure(func, repeat=DEFAULT_REPEAT):
+    """Measure the memory behaviour of a callable.
+
+    Args:
+        func: Callable taking no arguments
+        repeat: Number of calls in each of the two measured batches
+
+    Returns:
+        Dictionary with 'peak_bytes' (highest traced memory above the
+        start), 'retained_bytes' (growth per call) and
+        'gc_collections' (collections run during the measured calls)
+    """
+    func()
+    gc.collect()
+    tracemalloc.start()
+    try:
+        start, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        collections = _gc_collections()
+        # Growth is taken between two equal batches, so one-off
+        # allocator and free-list noise in the first batch cancels out.
+        for _ in range(repeat):
+            func()
+        middle, _ = tracemalloc.get_traced_memory()
+        for _ in range(repeat):
+            func()
+        end, peak = tracemalloc.get_traced_memory()
+        collections = _gc_collections() - collections
+    finally:
+        tracemalloc.stop()
+    return {
+        'peak_bytes': peak - start,
+        'retained_bytes': max(end - middle, 0) // repeat,
+        'gc_collections': collections,
+    }
+
+
+def scenario(difficulty, name):
+    """Build the callable measured for a difficulty and scenario.
+
+    Args:
+        difficulty: Difficulty registered with AIStrategyFactory
+        name: One of SCENARIOS
+
+    Returns:
+        Callable taking no arguments
+    """
+    if name == 'get_move':
+        strategy = AIStrategyFactory.create(difficulty)
+        board = new_board()
+
+        def get_move():
+            strategy.new_game()
+            strategy.get_move(board)
+        return get_move
+
+    if name == 'play_turn':
+        game = TicTacToeGame(ScoreTracker(storage=InMemoryScoreStorage()))
+        game.set_difficulty(difficulty)
+
+        def play_turn():
+            game.start_new_game()
+            game.game_state.make_move(1, 1, PLAYER)
+            game.game_state.switch_player()
+            game.play_turn()
+        return play_turn
+
+    if name == 'game':
+        x = AIStrategyFactory.create(difficulty)
+        o = AIStrategyFactory.create(difficulty)
+
+        def game():
+            x.new_game()
+            o.new_game()
+            play_headless_game(x, o)
+        return game
+
+    raise ValueError(f"Unknown scenario: {name}")
+
+
+def run_budgets(difficulties=None, scenarios=SCENARIOS, repeat=DEFAULT_REPEAT):
+    """Measure every difficulty in every scenario.
+
+    Args:
+        difficulties: Difficulties to measure, defaults to those in BUDGETS
+        scenarios: Scenario names to run
+        repeat: Number of calls per measured batch
+
+    Returns:
+        Dictionary mapping (difficulty, scenario) to a measure() result
+    """
+    if difficulties is None:
+        difficulties = list(dict.fromkeys(difficulty for difficulty, _ in BUDGETS))
+    return {(difficulty, name): measure(scenario(difficulty, name), repeat)
+            for difficulty in difficulties for name in scenarios}
+
+
+def check_budgets(results, budgets=None):
+    """Compare measurements with their budgets.
+
+    Args:
+        results: Dictionary from run_budgets()
+        budgets: Budget dictionary, defaults to BUDGETS
+
+    Returns:
+        List of messages, one per exceeded limit; empty if all pass
+    """
+    budgets = BUDGETS if budgets is None else budgets
+    failures = []
+    for key, result in results.items():
+        for metric, limit in budgets.get(key, {}).items():
+            if result[metric] > limit:
+                failures.append(f"{key[0]}/{key[1]}: {metric} {result[metric]:,} > {limit:,}")
+    return failures
+
+
+def format_results(results):
+    """Format measurements as a plain-text table.
+
+    Args:
+        results: Dictionary from run_budgets()
+
+    Returns:
+        Table as a string
+    """
+    lines = [f"{'Difficulty':<10} {'Scenario':<10} {'Peak B':>10} {'Retained B':>11} {'GCs':>5}"]
+    for (difficulty, name), result in results.items():
+        lines.append(f"{difficulty:<10} {name:<10} {result['peak_bytes']:>10,} "
+                     f"{result['retained_bytes']:>11,} {result['gc_collections']:>5}")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Check strategy memory use against budgets.")
+    parser.add_argument('--difficulties', nargs='+', default=None,
+                        help="difficulties to measure (default: all with budgets)")
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT, help="calls per measured batch")
+    args = parser.parse_args(argv)
+
+    results = run_budgets(args.difficulties, repeat=args.repeat)
+    sys.stdout.write(format_results(results) + "\n")
+    failures = check_budgets(results)
+    for failure in failures:
+        sys.stdout.write(f"OVER BUDGET {failure}\n")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
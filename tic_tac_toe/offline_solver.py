@@ -0,0 +1,261 @@
+"""Checkpointed multi-process solver for 4x4 boards.
+
+The position space is split by move prefix: every position reached
+after ``prefix_depth`` moves is one task, solved with everything below
+it by a worker process. Each worker keeps one table for its lifetime, so
+sub-trees shared between its tasks are solved once. A finished task
+writes the entries it added to a part file in the output directory,
+atomically, and that file is the task's checkpoint: a killed run picks
+up where it stopped by skipping tasks whose part file exists.
+
+Merging loads every part into one table, solves the few positions above
+the prefix depth, and saves the result for HardStrategy(solved=...). The
+command line also installs it (see solver.install_table()), so Hard plays
+4x4 games from it:
+
+    python -m tic_tac_toe.offline_solver --size 4 --win-length 3 --out solve-4x4-k3
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from array import array
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from .constants import SOLVED_TABLE_DIR
+from .rules import line_rule_set
+from .solver import UNREACHABLE, install_table, new_table, save_table, solve_position
+
+DEFAULT_PREFIX_DEPTH = 2
+MANIFEST_FILE = "manifest.json"
+TABLE_FILE = "table.bin"
+
+# Table of the worker process, kept between tasks for the same rules,
+# keyed by (size, win length).
+_worker_table = {}
+
+
+def enumerate_prefixes(rule_set, depth):
+    """List the positions reached after `depth` moves.
+
+    Move orders reaching the same position are kept once, and lines of
+    play that end in a win before `depth` are left out; merge_parts()
+    solves those positions itself.
+
+    Args:
+        rule_set: Normal RuleSet
+        depth: Number of moves in each prefix
+
+    Returns:
+        Sorted list of move tuples, one per distinct position
+    """
+    cells = rule_set.size * rule_set.size
+    completes = rule_set.completes_mask
+    seen = {}
+
+    def extend(moves, bits):
+        if len(moves) == depth:
+            key = (bits[0], bits[1])
+            seen.setdefault(key, tuple(moves))
+            return
+        turn = len(moves) % 2
+        for index in range(cells):
+            bit = 1 << index
+            if (bits[0] | bits[1]) & bit:
+                continue
+            placed = bits[turn] | bit
+            if completes(placed, index):
+                continue
+            child = [placed, bits[1]] if turn == 0 else [bits[0], placed]
+            extend(moves + [index], child)
+
+    extend([], [0, 0])
+    return sorted(seen.values())
+
+
+def part_path(out_dir, moves):
+    """Get the part file path of a prefix."""
+    name = "-".join(str(index) for index in moves) or "root"
+    return os.path.join(out_dir, f"part-{name}.bin")
+
+
+def write_part(path, codes, values):
+    """Write a part file atomically.
+
+    The file holds the entry count, then the codes as unsigned 32-bit
+    integers, then the values as signed bytes.
+    """
+    temp = f"{path}.tmp"
+    with open(temp, 'wb') as f:
+        array('Q', [len(codes)]).tofile(f)
+        codes.tofile(f)
+        values.tofile(f)
+    os.replace(temp, path)
+
+
+def read_part(path):
+    """Read a part file.
+
+    Returns:
+        (codes, values) arrays
+    """
+    with open(path, 'rb') as f:
+        count = array('Q')
+        count.fromfile(f, 1)
+        codes = array('I')
+        codes.fromfile(f, count[0])
+        values = array('b')
+        values.fromfile(f, count[0])
+    return codes, values
+
+
+def solve_prefix(size, win_length, moves, out_dir):
+    """Solve one prefix and write its part file. Runs inside a worker process.
+
+    Args:
+        size: Board dimension
+        win_length: Markers in a row needed to win
+        moves: Prefix moves, X first
+        out_dir: Output directory
+
+    Returns:
+        Number of entries written
+    """
+    rules = line_rule_set(size, win_length)
+    key = (rules.size, rules.win_length)
+    table = _worker_table.get(key)
+    if table is None:
+        _worker_table.clear()
+        table = _worker_table[key] = new_table(rules)
+    codes = array('I')
+    values = array('b')
+
+    def record(code, value):
+        codes.append(code)
+        values.append(value)
+
+    solve_position(table, rules, moves, record)
+    write_part(part_path(out_dir, moves), codes, values)
+    return len(codes)
+
+
+def _check_manifest(out_dir, manifest):
+    """Create the run manifest, or check a resumed run matches it."""
+    path = os.path.join(out_dir, MANIFEST_FILE)
+    if os.path.exists(path):
+        with open(path, 'r') as f:
+            existing = json.load(f)
+        if existing != manifest:
+            raise ValueError(f"{out_dir} holds a run with different settings: {existing}")
+        return
+    with open(path, 'w') as f:
+        json.dump(manifest, f)
+
+
+def solve_parts(size, win_length, out_dir, prefix_depth=DEFAULT_PREFIX_DEPTH,
+                workers=None, progress=None):
+    """Solve every prefix that has no part file yet.
+
+    Args:
+        size: Board dimension
+        win_length: Markers in a row needed to win
+        out_dir: Output directory, created if missing
+        prefix_depth: Moves per prefix; deeper gives more, smaller tasks
+        workers: Worker process count; 0 solves in this process, None
+            uses every CPU
+        progress: Optional text stream that receives a progress line
+
+    Returns:
+        Number of tasks solved by this call
+    """
+    rules = line_rule_set(size, win_length)
+    os.makedirs(out_dir, exist_ok=True)
+    _check_manifest(out_dir, {'size': size, 'win_length': win_length,
+                              'prefix_depth': prefix_depth})
+    prefixes = enumerate_prefixes(rules, prefix_depth)
+    todo = [moves for moves in prefixes if not os.path.exists(part_path(out_dir, moves))]
+    done = len(prefixes) - len(todo)
+    start = time.perf_counter()
+
+    def report():
+        if progress:
+            progress.write(f"\rSolved {done}/{len(prefixes)} prefixes "
+                           f"({time.perf_counter() - start:.0f}s)")
+            progress.flush()
+
+    report()
+    if workers == 0:
+        for moves in todo:
+            solve_prefix(size, win_length, moves, out_dir)
+            done += 1
+            report()
+        _worker_table.clear()
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(solve_prefix, size, win_length, moves, out_dir)
+                       for moves in todo]
+            for future in as_completed(futures):
+                future.result()
+                done += 1
+                report()
+    if progress:
+        progress.write("\n")
+    return len(todo)
+
+
+def merge_parts(size, win_length, out_dir, prefix_depth=DEFAULT_PREFIX_DEPTH):
+    """Merge the part files into one table and save it.
+
+    Args:
+        size: Board dimension
+        win_length: Markers in a row needed to win
+        out_dir: Directory filled by solve_parts()
+        prefix_depth: Prefix depth the parts were solved with
+
+    Returns:
+        Merged table, also saved as TABLE_FILE in out_dir
+
+    Raises:
+        ValueError: If a prefix has no part file yet
+    """
+    rules = line_rule_set(size, win_length)
+    table = new_table(rules)
+    for moves in enumerate_prefixes(rules, prefix_depth):
+        path = part_path(out_dir, moves)
+        if not os.path.exists(path):
+            raise ValueError(f"Prefix {moves} is not solved yet")
+        codes, values = read_part(path)
+        for code, value in zip(codes, values):
+            table[code] = value
+    # Only positions above the prefix depth are left to solve.
+    solve_position(table, rules)
+    if table[0] == UNREACHABLE:
+        raise ValueError("Merged table is incomplete")
+    save_table(table, os.path.join(out_dir, TABLE_FILE))
+    return table
+
+
+def main(argv=None):
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Solve a 4x4 board offline, resumably.")
+    parser.add_argument('--size', type=int, default=4, help="board dimension")
+    parser.add_argument('--win-length', type=int, default=4, help="markers in a row to win")
+    parser.add_argument('--out', required=True, help="directory for checkpoints and the table")
+    parser.add_argument('--prefix-depth', type=int, default=DEFAULT_PREFIX_DEPTH)
+    parser.add_argument('--workers', type=int, default=None, help="worker processes (0 = serial)")
+    parser.add_argument('--install-dir', default=SOLVED_TABLE_DIR,
+                        help="directory Hard loads solved tables from (default: %(default)s)")
+    args = parser.parse_args(argv)
+
+    solve_parts(args.size, args.win_length, args.out, args.prefix_depth,
+                args.workers, progress=sys.stderr)
+    table = merge_parts(args.size, args.win_length, args.out, args.prefix_depth)
+    result = {1: "first player wins", 0: "draw", -1: "second player wins"}[table[0]]
+    sys.stdout.write(f"{args.size}x{args.size}, {args.win_length} in a row: {result}\n")
+    sys.stdout.write(f"Table written to {os.path.join(args.out, TABLE_FILE)}\n")
+    sys.stdout.write(f"Installed as {install_table(table, args.install_dir)}\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,353 @@
+"""Position index and opening explorer over the move log.
+
+Every position reached in a recorded game (see game_log.py) is indexed
+by its canonical Zobrist key, so the eight symmetric images of a board
+share one entry. For each position and difficulty the index counts how
+the games through it ended, and for each move played from it how those
+games ended:
+
+    index = PositionIndex()
+    index.update('games.jsonl')
+    index.stats(board, difficulty='medium')
+    # {'games': 120, 'x_wins': 31, 'draws': 80, 'o_wins': 9, 'moves': [...]}
+
+Moves are stored as the canonical key of the position they lead to, so
+symmetric moves are counted together and reported once, in the
+orientation of the board asked about.
+
+The index remembers how far into the log it has read, and update() only
+reads games appended since, so it can be kept current as games are
+recorded. Only normal and misère games are indexed; wild records do not
+say which marker was placed, and on boards whose legal moves depend on
+the previous move symmetric positions are not equivalent.
+
+Run with ``python -m tic_tac_toe.position_index --help``.
+"""
+
+import argparse
+import json
+import os
+import sys
+from .constants import PLAYER, COMPUTER
+from .game_state import GameState
+from .headless import new_board
+from .rules import STANDARD, RULE_SETS, get_rule_set
+from .zobrist import get_table
+
+INDEX_VERSION = 1
+# Slots of an entry: games won by X, drawn, won by O.
+X_WINS, DRAWS, O_WINS = 0, 1, 2
+_RESULT_NAMES = ('x_wins', 'draws', 'o_wins')
+
+
+def indexable(rule_set):
+    """Check whether games under a rule set can be indexed.
+
+    Args:
+        rule_set: RuleSet instance
+
+    Returns:
+        True for rules whose positions are equivalent under symmetry
+    """
+    return not (rule_set.wild or rule_set.uses_last_move or rule_set.layer_size)
+
+
+def replay(record):
+    """Replay a logged game.
+
+    Args:
+        record: Log record with 'moves' and optionally 'rules'
+
+    Returns:
+        (canonical keys of every position from the empty board on, result
+        slot X_WINS, DRAWS or O_WINS, or None if the game did not finish)
+
+    Raises:
+        ValueError: If the rules cannot be indexed or a move is illegal
+    """
+    rules = get_rule_set(record.get('rules', STANDARD))
+    if not indexable(rules):
+        raise ValueError(f"Rules {rules.name} cannot be indexed")
+    state = GameState(rules.size)
+    board = new_board(rules.size)
+    keys = [state.canonical_key]
+    result = None
+    for ply, (row, col) in enumerate(record['moves']):
+        side = state.current_player
+        if (result is not None or not (0 <= row < rules.size and 0 <= col < rules.size)
+                or board[row][col] != ' '):
+            raise ValueError(f"Illegal move {ply + 1}: {(row, col)}")
+        state.make_move(row, col, side)
+        board[row][col] = side
+        keys.append(state.canonical_key)
+        if rules.completed_line(board, row, col) is not None:
+            result = X_WINS if rules.winner_of[side] == PLAYER else O_WINS
+        elif len(keys) == rules.size * rules.size + 1:
+            result = DRAWS
+        state.switch_player()
+    return keys, result
+
+
+class PositionIndex:
+    """Win, draw and loss counts per canonical position and difficulty."""
+
+    def __init__(self):
+        """Create an empty index."""
+        # rules name -> canonical key -> difficulty -> [x, d, o, {child key: [x, d, o]}]
+        self._positions = {}
+        self.offset = 0
+        self.games = 0
+        self.skipped = 0
+
+    def add_game(self, record):
+        """Index one game.
+
+        Args:
+            record: Log record from game_log.game_record()
+
+        Returns:
+            True if the game was indexed, False if it was skipped because
+            it is malformed, unfinished or uses rules that cannot be indexed
+        """
+        try:
+            keys, result = replay(record)
+        except (ValueError, KeyError, TypeError):
+            result = None
+        if result is None:
+            self.skipped += 1
+            return False
+        positions = self._positions.setdefault(record.get('rules', STANDARD), {})
+        difficulty = str(record.get('difficulty'))
+        for ply, key in enumerate(keys):
+            entry = positions.setdefault(key, {}).get(difficulty)
+            if entry is None:
+                entry = positions[key][difficulty] = [0, 0, 0, {}]
+            entry[result] += 1
+            if ply + 1 < len(keys):
+                counts = entry[3].setdefault(keys[ply + 1], [0, 0, 0])
+                counts[result] += 1
+        self.games += 1
+        return True
+
+    def update(self, path):
+        """Index the games appended to a log since the last update.
+
+        A partly written last line is left for the next update.
+
+        Args:
+            path: Log file path
+
+        Returns:
+            Number of games indexed
+        """
+        added = 0
+        with open(path, 'rb') as f:
+            f.seek(self.offset)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                self.offset += len(line)
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    self.skipped += 1
+                    continue
+                added += self.add_game(record)
+        return added
+
+    def stats(self, board, rules=STANDARD, difficulty=None):
+        """Get the results of indexed games through a position.
+
+        Args:
+            board: Board to look up, in any orientation
+            rules: Name of the rule set
+            difficulty: Only count games at this difficulty, or None for all
+
+        Returns:
+            Dictionary with 'games', 'x_wins', 'draws', 'o_wins' and
+            'moves', a list of dictionaries with 'move' ((row, col) on the
+            given board), 'games' and the three result counts, most
+            played first
+        """
+        positions = self._positions.get(rules, {})
+        zobrist = get_table(len(board))
+        totals, children = self._lookup(positions, zobrist.canonical_hash(board), difficulty)
+
+        cells = [cell for row in board for cell in row]
+        side = PLAYER if cells.count(PLAYER) == cells.count(COMPUTER) else COMPUTER
+        moves = []
+        seen = set()
+        for index, cell in enumerate(cells):
+            if cell != ' ':
+                continue
+            cells[index] = side
+            child = min(zobrist.symmetric_hashes(cells))
+            cells[index] = ' '
+            if child in children and child not in seen:
+                seen.add(child)
+                moves.append(_summary(children[child], move=divmod(index, len(board))))
+        moves.sort(key=lambda move: -move['games'])
+        summary = _summary(totals)
+        summary['moves'] = moves
+        return summary
+
+    def _lookup(self, positions, key, difficulty):
+        """Sum a position's counts over the selected difficulties."""
+        totals = [0, 0, 0]
+        children = {}
+        for name, entry in positions.get(key, {}).items():
+            if difficulty is not None and name != str(difficulty):
+                continue
+            for slot in range(3):
+                totals[slot] += entry[slot]
+            for child, counts in entry[3].items():
+                merged = children.setdefault(child, [0, 0, 0])
+                for slot in range(3):
+                    merged[slot] += counts[slot]
+        return totals, children
+
+    def position_count(self, rules=STANDARD):
+        """Number of distinct canonical positions indexed for a rule set."""
+        return len(self._positions.get(rules, {}))
+
+    def save(self, path):
+        """Write the index atomically as JSON.
+
+        Args:
+            path: Index file path
+        """
+        data = {
+            'version': INDEX_VERSION,
+            'offset': self.offset,
+            'games': self.games,
+            'skipped': self.skipped,
+            'positions': {
+                rules: {format(key, 'x'): {name: entry[:3] + [{format(child, 'x'): counts
+                                                              for child, counts in entry[3].items()}]
+                                           for name, entry in by_difficulty.items()}
+                        for key, by_difficulty in positions.items()}
+                for rules, positions in self._positions.items()
+            },
+        }
+        partial = f"{path}.partial"
+        with open(partial, 'w') as f:
+            json.dump(data, f, separators=(',', ':'))
+        os.replace(partial, path)
+
+    @classmethod
+    def load(cls, path):
+        """Read an index written by save().
+
+        Args:
+            path: Index file path
+
+        Returns:
+            PositionIndex
+
+        Raises:
+            ValueError: If the file is not an index of this version
+        """
+        with open(path, 'r') as f:
+            data = json.load(f)
+        if data.get('version') != INDEX_VERSION:
+            raise ValueError(f"{path} is not a version {INDEX_VERSION} position index")
+        index = cls()
+        index.offset = data['offset']
+        index.games = data['games']
+        index.skipped = data['skipped']
+        index._positions = {
+            rules: {int(key, 16): {name: entry[:3] + [{int(child, 16): counts
+                                                       for child, counts in entry[3].items()}]
+                                   for name, entry in by_difficulty.items()}
+                    for key, by_difficulty in positions.items()}
+            for rules, positions in data['positions'].items()
+        }
+        return index
+
+
+def _summary(counts, move=None):
+    """Name the result counts of a position or move."""
+    summary = {'move': move} if move is not None else {}
+    summary['games'] = sum(counts)
+    for slot, name in enumerate(_RESULT_NAMES):
+        summary[name] = counts[slot]
+    return summary
+
+
+def format_stats(stats):
+    """Format stats() output as a plain-text table.
+
+    Args:
+        stats: Dictionary from PositionIndex.stats()
+
+    Returns:
+        Table as a string
+    """
+    def row(label, entry):
+        games = entry['games'] or 1
+        return (f"{label:<8} {entry['games']:>8} "
+                + " ".join(f"{entry[name] / games:>7.1%}" for name in _RESULT_NAMES))
+
+    lines = [f"{'Move':<8} {'Games':>8} {'X wins':>7} {'Draws':>7} {'O wins':>7}",
+             row('(all)', stats)]
+    for entry in stats['moves']:
+        lines.append(row("{},{}".format(*entry['move']), entry))
+    return "\n".join(lines)
+
+
+def parse_moves(tokens, size):
+    """Play moves given as 'row,col' tokens onto an empty board.
+
+    Args:
+        tokens: Moves from the empty board, X first
+        size: Board dimension
+
+    Returns:
+        Nested-list board
+
+    Raises:
+        ValueError: If a token is not two integers, is off the board or
+            names an occupied cell
+    """
+    board = new_board(size)
+    for ply, token in enumerate(tokens):
+        try:
+            row, col = (int(part) for part in token.split(','))
+        except ValueError:
+            raise ValueError(f"move {token!r} is not row,col") from None
+        if not (0 <= row < size and 0 <= col < size):
+            raise ValueError(f"move {token!r} is off the {size}x{size} board")
+        if board[row][col] != ' ':
+            raise ValueError(f"move {token!r} is on an occupied cell")
+        board[row][col] = PLAYER if ply % 2 == 0 else COMPUTER
+    return board
+
+
+def main(argv=None):
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Explore positions reached in a move log.")
+    parser.add_argument('log', help="move log (JSON lines)")
+    parser.add_argument('moves', nargs='*', help="moves from the empty board, as row,col")
+    parser.add_argument('--index', help="index file, created or brought up to date with the log")
+    parser.add_argument('--rules', default=STANDARD, choices=RULE_SETS, help="rule set")
+    parser.add_argument('--difficulty', default=None, help="only games at this difficulty")
+    args = parser.parse_args(argv)
+    try:
+        board = parse_moves(args.moves, get_rule_set(args.rules).size)
+    except ValueError as error:
+        parser.error(str(error))
+
+    index = (PositionIndex.load(args.index) if args.index and os.path.exists(args.index)
+             else PositionIndex())
+    index.update(args.log)
+    if args.index:
+        index.save(args.index)
+
+    stats = index.stats(board, rules=args.rules, difficulty=args.difficulty)
+    sys.stdout.write(format_stats(stats) + "\n")
+
+
+if __name__ == "__main__":
+    main()
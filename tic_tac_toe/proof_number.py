@@ -0,0 +1,281 @@
+"""Proof-number search for forced wins on k-in-a-row boards.
+
+Proof-number search grows a game tree towards the lines that look
+easiest to settle. Every node has a proof number (how many leaves must
+still be shown to be wins for the attacker to prove it) and a disproof
+number (the same for showing it is not a win). The attacker's nodes
+take the smallest proof number of their children and the defender's
+nodes the sum; the search always expands the most-proving leaf, so it
+follows forcing lines and proves obvious wins with few nodes where
+alpha-beta would search every defence to full depth.
+
+Threats are used to keep the tree small without losing soundness:
+
+- a side whose last move left two or more cells completing a line wins,
+  since the other side can block only one;
+- a side facing one such cell must block it, so that node has one child;
+- otherwise the attacker only tries cells near existing stones (a
+  subset of its moves, which cannot make a proof wrong), while the
+  defender tries every empty cell.
+
+Nodes live in a store bounded by ``max_nodes``. The subtrees of nodes
+that are settled are freed as the search goes, and the search gives up
+(result UNKNOWN) when the store is full or `stop` returns True.
+
+Only normal k-in-a-row rules are supported; a draw counts as a failure
+to prove a win.
+"""
+
+from .constants import PLAYER, COMPUTER
+from .gomoku import board_geometry
+
+PROVEN = 'proven'
+DISPROVEN = 'disproven'
+UNKNOWN = 'unknown'
+
+DEFAULT_PN_NODES = 50_000
+
+INFINITY = 10 ** 9
+
+# Iterations between calls of the stop callable.
+_STOP_INTERVAL = 64
+
+
+class _Node:
+    """One position of the proof tree, reached by `move` from `parent`."""
+
+    __slots__ = ('move', 'parent', 'pn', 'dn', 'children', 'forced', 'attacker_to_move')
+
+    def __init__(self, move, parent, attacker_to_move, pn=1, dn=1, forced=None):
+        self.move = move
+        self.parent = parent
+        self.attacker_to_move = attacker_to_move
+        self.pn = pn
+        self.dn = dn
+        self.forced = forced
+        self.children = None
+
+
+class ProofNumberSearch:
+    """Proof-number search over a k-in-a-row rule set."""
+
+    def __init__(self, rule_set, max_nodes=DEFAULT_PN_NODES):
+        """Prepare a search for a rule set.
+
+        Args:
+            rule_set: Normal k-in-a-row RuleSet
+            max_nodes: Most tree nodes held at once
+
+        Raises:
+            ValueError: For misère, wild or non-planar rules
+        """
+        if (rule_set.misere or rule_set.wild or rule_set.uses_last_move
+                or rule_set.layer_size):
+            raise ValueError("Proof-number search supports normal k-in-a-row rules only")
+        self.rule_set = rule_set
+        self.max_nodes = max_nodes
+        self.neighbours = board_geometry(rule_set.size, rule_set.win_length)[3]
+        self.nodes = 0
+        self.expanded = 0
+
+    def search(self, board, attacker=COMPUTER, stop=None):
+        """Try to prove that the side to move can force a win.
+
+        Args:
+            board: Current board state, `attacker` to move
+            attacker: Marker of the side to move
+            stop: Optional callable that returns True to end the search
+
+        Returns:
+            (PROVEN, (row, col) of a winning move), (DISPROVEN, None) or
+            (UNKNOWN, None)
+        """
+        rules = self.rule_set
+        size = rules.size
+        defender = PLAYER if attacker == COMPUTER else COMPUTER
+        bits = [0, 0]  # attacker, defender
+        for index, cell in enumerate(cell for row in board for cell in row):
+            if cell == attacker:
+                bits[0] |= 1 << index
+            elif cell == defender:
+                bits[1] |= 1 << index
+
+        # Settle the root's threats by scanning every line once.
+        threats = [self._open_cells(bits, side, rules.line_masks) for side in (0, 1)]
+        if threats[0]:
+            return PROVEN, divmod(min(threats[0]), size)
+        if len(threats[1]) > 1:
+            return DISPROVEN, None
+        if not self._empties(bits):
+            return DISPROVEN, None
+        root = _Node(None, None, True, forced=tuple(threats[1]) or None)
+        self.nodes = 1
+        self.expanded = 0
+
+        iterations = 0
+        while root.pn and root.dn:
+            iterations += 1
+            if stop is not None and iterations % _STOP_INTERVAL == 0 and stop():
+                break
+            node = root
+            while node.children is not None:
+                side = 0 if node.attacker_to_move else 1
+                if node.attacker_to_move:
+                    node = min(node.children, key=_proof)
+                else:
+                    node = min(node.children, key=_disproof)
+                bits[side] |= 1 << node.move
+            if not self._expand(node, bits):
+                self._undo(node, bits)
+                break
+            self._undo(node, bits)
+            self._update(node, root)
+
+        if root.pn == 0:
+            best = min(root.children, key=_proof)
+            return PROVEN, divmod(best.move, size)
+        if root.dn == 0:
+            return DISPROVEN, None
+        return UNKNOWN, None
+
+    # Tree growth
+
+    def _expand(self, node, bits):
+        """Create the children of a leaf.
+
+        Returns:
+            False if the node store is full
+        """
+        rules = self.rule_set
+        side = 0 if node.attacker_to_move else 1
+        if node.forced is not None:
+            moves = node.forced
+        elif node.attacker_to_move:
+            moves = self._candidates(bits)
+        else:
+            occupied = bits[0] | bits[1]
+            moves = [index for index in range(rules.size * rules.size)
+                     if not occupied >> index & 1]
+        if self.nodes + len(moves) > self.max_nodes:
+            return False
+
+        children = []
+        empties = self._empties(bits) - 1
+        for move in moves:
+            child = self._child(node, move, side, bits, empties)
+            children.append(child)
+            # One settled child settles the parent; the rest are not needed.
+            if (child.pn == 0) if node.attacker_to_move else (child.dn == 0):
+                children = [child]
+                break
+        node.children = children
+        self.nodes += len(children)
+        self.expanded += 1
+        return True
+
+    def _child(self, parent, move, side, bits, empties):
+        """Create and score the node reached by playing `move`."""
+        rules = self.rule_set
+        placed = bits[side] | 1 << move
+        attacker_moved = side == 0
+        child = _Node(move, parent, not attacker_moved)
+        if rules.completes_mask(placed, move):
+            child.pn, child.dn = (0, INFINITY) if attacker_moved else (INFINITY, 0)
+            return child
+        if not empties:
+            child.pn, child.dn = INFINITY, 0
+            return child
+        mover = [bits[0], bits[1]]
+        mover[side] = placed
+        open_cells = self._open_cells(mover, side, rules.masks_through[move])
+        if len(open_cells) > 1:
+            # The other side cannot block both; the mover wins next move.
+            child.pn, child.dn = (0, INFINITY) if attacker_moved else (INFINITY, 0)
+        elif open_cells:
+            child.forced = tuple(open_cells)
+        elif attacker_moved:
+            child.pn = empties
+        else:
+            child.dn = empties
+        return child
+
+    def _update(self, node, root):
+        """Recompute proof and disproof numbers from a leaf to the root."""
+        while node is not None:
+            children = node.children
+            if children is not None:
+                if node.attacker_to_move:
+                    node.pn = min(child.pn for child in children)
+                    node.dn = min(sum(child.dn for child in children), INFINITY)
+                else:
+                    node.pn = min(sum(child.pn for child in children), INFINITY)
+                    node.dn = min(child.dn for child in children)
+                if (node.pn == 0 or node.dn == 0) and node is not root:
+                    self._free(node)
+            node = node.parent
+
+    def _free(self, node):
+        """Drop the subtree below a settled node."""
+        stack = list(node.children)
+        node.children = None
+        while stack:
+            child = stack.pop()
+            self.nodes -= 1
+            if child.children is not None:
+                stack.extend(child.children)
+
+    # Board helpers
+
+    def _undo(self, node, bits):
+        """Take back the moves from the root to a node."""
+        while node.parent is not None:
+            side = 0 if node.parent.attacker_to_move else 1
+            bits[side] &= ~(1 << node.move)
+            node = node.parent
+
+    def _empties(self, bits):
+        """Number of empty cells."""
+        return self.rule_set.size ** 2 - bin(bits[0] | bits[1]).count('1')
+
+    def _open_cells(self, bits, side, masks):
+        """Cells that would complete one of the lines for `side`.
+
+        Args:
+            bits: [attacker bits, defender bits]
+            side: 0 for the attacker, 1 for the defender
+            masks: Line masks to check
+
+        Returns:
+            Set of cell indices
+        """
+        own, other = bits[side], bits[1 - side]
+        needed = self.rule_set.win_length - 1
+        cells = set()
+        for mask in masks:
+            if not mask & other and bin(mask & own).count('1') == needed:
+                cells.add((mask & ~own).bit_length() - 1)
+        return cells
+
+    def _candidates(self, bits):
+        """Empty cells near a stone, or the centre of an empty board."""
+        occupied = bits[0] | bits[1]
+        size = self.rule_set.size
+        if not occupied:
+            return [(size // 2) * size + size // 2]
+        cells = set()
+        index = 0
+        rest = occupied
+        while rest:
+            if rest & 1:
+                cells.update(self.neighbours[index])
+            rest >>= 1
+            index += 1
+        return [cell for cell in sorted(cells) if not occupied >> cell & 1]
+
+
+def _proof(node):
+    return node.pn
+
+
+def _disproof(node):
+    return node.dn
@@ -0,0 +1,357 @@
+"""Qubic (4x4x4 Tic-Tac-Toe) engine.
+
+Cells of the cube are numbered 0-63 as layer * 16 + row * 4 + col. All
+76 winning lines are precomputed as 64-bit masks, and every cell lists
+the lines through it, so a move updates per-line stone counts for just
+those lines: wins and threats (three in a line the opponent has not
+touched) come straight from the counts.
+
+The game layer stores the cube as an 8x8 grid with the four layers as
+quadrants, layer 1 top left and layer 4 bottom right; grid_cell() and
+cube_index() convert between the two.
+"""
+
+import time
+from itertools import product
+from .constants import PLAYER, COMPUTER, QUBIC_SIZE
+
+CELLS = QUBIC_SIZE ** 3
+GRID_SIZE = 2 * QUBIC_SIZE
+
+WIN_SCORE = 100000
+# Evaluation weight of a line holding n stones of one side only.
+LINE_WEIGHTS = (0, 1, 6, 40, 0)
+
+# Candidate moves searched at inner nodes, best-ordered first.
+BRANCH_LIMIT = 10
+
+DEFAULT_SEARCH_DEPTH = 8
+DEFAULT_THINK_TIME = 0.8
+DEFAULT_VCF_DEPTH = 8
+
+
+def _cube_lines():
+    """List the 76 winning lines as tuples of cell indices."""
+    directions = [d for d in product((-1, 0, 1), repeat=3) if d > (0, 0, 0)]
+    last = QUBIC_SIZE - 1
+    lines = []
+    for start in product(range(QUBIC_SIZE), repeat=3):
+        for step in directions:
+            end = [s + last * d for s, d in zip(start, step)]
+            if all(0 <= e <= last for e in end):
+                cells = [tuple(s + t * d for s, d in zip(start, step)) for t in range(QUBIC_SIZE)]
+                lines.append(tuple(l * 16 + r * 4 + c for l, r, c in cells))
+    return tuple(lines)
+
+
+LINES = _cube_lines()
+LINE_MASKS = tuple(sum(1 << index for index in line) for line in LINES)
+# LINES_THROUGH[index]: ids of the lines containing a cell (4 to 7 each)
+LINES_THROUGH = tuple(
+    tuple(line_id for line_id, line in enumerate(LINES) if index in line)
+    for index in range(CELLS)
+)
+
+
+def grid_cell(index):
+    """Convert a cube index to (row, col) on the 8x8 grid."""
+    layer, rest = divmod(index, 16)
+    row, col = divmod(rest, QUBIC_SIZE)
+    return (layer // 2) * QUBIC_SIZE + row, (layer % 2) * QUBIC_SIZE + col
+
+
+def cube_index(row, col):
+    """Convert (row, col) on the 8x8 grid to a cube index."""
+    layer = (row // QUBIC_SIZE) * 2 + col // QUBIC_SIZE
+    return layer * 16 + (row % QUBIC_SIZE) * QUBIC_SIZE + col % QUBIC_SIZE
+
+
+def grid_lines():
+    """Get the winning lines as lists of 8x8 grid cells."""
+    return [[grid_cell(index) for index in line] for line in LINES]
+
+
+def opponent(marker):
+    """Get the other side's marker."""
+    return COMPUTER if marker == PLAYER else PLAYER
+
+
+class QubicBoard:
+    """Bitboard position with per-line stone counts."""
+
+    __slots__ = ('bits', 'counts')
+
+    def __init__(self):
+        """Create an empty cube."""
+        self.bits = {PLAYER: 0, COMPUTER: 0}
+        self.counts = {PLAYER: [0] * len(LINES), COMPUTER: [0] * len(LINES)}
+
+    @classmethod
+    def from_board(cls, board):
+        """Load an 8x8 grid board.
+
+        Args:
+            board: Current board state
+
+        Returns:
+            QubicBoard instance
+        """
+        position = cls()
+        for row, cells in enumerate(board):
+            for col, cell in enumerate(cells):
+                if cell != ' ':
+                    position.play(cube_index(row, col), cell)
+        return position
+
+    @property
+    def occupied(self):
+        """Bitboard of all stones."""
+        return self.bits[PLAYER] | self.bits[COMPUTER]
+
+    def play(self, index, marker):
+        """Place a stone.
+
+        Args:
+            index: Cube index of an empty cell
+            marker: Marker to place
+
+        Returns:
+            True if the stone completes a line
+        """
+        self.bits[marker] |= 1 << index
+        counts = self.counts[marker]
+        won = False
+        for line_id in LINES_THROUGH[index]:
+            counts[line_id] += 1
+            if counts[line_id] == QUBIC_SIZE:
+                won = True
+        return won
+
+    def undo(self, index, marker):
+        """Take a stone back off the cube."""
+        self.bits[marker] &= ~(1 << index)
+        counts = self.counts[marker]
+        for line_id in LINES_THROUGH[index]:
+            counts[line_id] -= 1
+
+    def moves(self):
+        """Get the empty cells as cube indices."""
+        free = ~self.occupied & ((1 << CELLS) - 1)
+        moves = []
+        while free:
+            bit = free & -free
+            moves.append(bit.bit_length() - 1)
+            free ^= bit
+        return moves
+
+    def threats(self, marker):
+        """Get the cells that would complete a line for a side.
+
+        Args:
+            marker: Attacking side
+
+        Returns:
+            Set of cube indices
+        """
+        own, other = self.counts[marker], self.counts[opponent(marker)]
+        occupied = self.occupied
+        cells = set()
+        for line_id, count in enumerate(own):
+            if count == QUBIC_SIZE - 1 and not other[line_id]:
+                cells.add((LINE_MASKS[line_id] & ~occupied).bit_length() - 1)
+        return cells
+
+    def threats_through(self, index, marker):
+        """Get the completing cells of threats on lines through one cell."""
+        own, other = self.counts[marker], self.counts[opponent(marker)]
+        occupied = self.occupied
+        cells = set()
+        for line_id in LINES_THROUGH[index]:
+            if own[line_id] == QUBIC_SIZE - 1 and not other[line_id]:
+                cells.add((LINE_MASKS[line_id] & ~occupied).bit_length() - 1)
+        return cells
+
+    def cell_value(self, index, marker):
+        """Score a cell for move ordering: attack plus defence on its lines."""
+        own, other = self.counts[marker], self.counts[opponent(marker)]
+        value = 0
+        for line_id in LINES_THROUGH[index]:
+            if not other[line_id]:
+                value += LINE_WEIGHTS[own[line_id] + 1]
+            if not own[line_id]:
+                value += LINE_WEIGHTS[other[line_id] + 1] // 2
+        return value
+
+    def evaluate(self, marker):
+        """Score open lines for one side minus the other's.
+
+        Args:
+            marker: Side to score for
+
+        Returns:
+            Integer score, positive when `marker` stands better
+        """
+        own, other = self.counts[marker], self.counts[opponent(marker)]
+        score = 0
+        for mine, theirs in zip(own, other):
+            if not theirs:
+                score += LINE_WEIGHTS[mine]
+            elif not mine:
+                score -= LINE_WEIGHTS[theirs]
+        return score
+
+
+def find_forced_win(position, marker, max_depth=DEFAULT_VCF_DEPTH, stop=None):
+    """Search for a win by continuous threats.
+
+    The attacker only plays moves that make a threat; the defender's
+    reply is forced to the threatened cell. A double threat the defender
+    cannot meet with a threat of their own wins.
+
+    Args:
+        position: QubicBoard with `marker` to move (restored on return)
+        marker: Attacking side
+        max_depth: Maximum attacker moves
+        stop: Optional callable polled at every node; True abandons the
+            search as if no win was found
+
+    Returns:
+        Cube index of the first move of a forced win, or None
+    """
+    defender = opponent(marker)
+
+    def search(depth):
+        if position.threats(defender) or (stop is not None and stop()):
+            return None
+        for index in position.moves():
+            position.play(index, marker)
+            threats = position.threats_through(index, marker)
+            found = False
+            if len(threats) >= 2:
+                found = True
+            elif threats and depth > 1:
+                block = threats.pop()
+                position.play(block, defender)
+                # The defender's block must not leave them a threat of their own.
+                if not position.threats_through(block, defender):
+                    found = search(depth - 1) is not None
+                position.undo(block, defender)
+            position.undo(index, marker)
+            if found:
+                return index
+        return None
+
+    return search(max_depth)
+
+
+class SearchTimeout(Exception):
+    """Raised inside the search when the think time runs out."""
+
+
+def search_move(position, marker, max_depth=DEFAULT_SEARCH_DEPTH, max_time=DEFAULT_THINK_TIME,
+                stop=None):
+    """Choose a move: immediate wins and blocks, then forced wins, then
+    iterative-deepening alpha-beta.
+
+    Forced replies (blocking a single threat) do not use up search depth,
+    so tactical lines are read out further than quiet ones. When `stop`
+    says so the best move found so far is returned.
+
+    Args:
+        position: QubicBoard with `marker` to move (restored on return)
+        marker: Side to move
+        max_depth: Deepest search in plies
+        max_time: Think time in seconds, or None for no limit
+        stop: Optional callable polled during the search; True ends it
+
+    Returns:
+        Cube index of the chosen move, or None if the cube is full
+    """
+    moves = position.moves()
+    if not moves:
+        return None
+    other = opponent(marker)
+    wins = position.threats(marker)
+    if wins:
+        return min(wins)
+    blocks = position.threats(other)
+    if blocks:
+        return min(blocks)
+    forced = find_forced_win(position, marker, stop=stop)
+    if forced is not None:
+        return forced
+
+    deadline = None if max_time is None else time.perf_counter() + max_time
+    nodes = [0]
+
+    def out_of_time():
+        return ((deadline is not None and time.perf_counter() > deadline)
+                or (stop is not None and stop()))
+
+    def ordered(side, limit=None):
+        moves = sorted(position.moves(), key=lambda index: -position.cell_value(index, side))
+        return moves[:limit] if limit else moves
+
+    def negamax(side, depth, alpha, beta, ply):
+        nodes[0] += 1
+        if nodes[0] & 255 == 0 and out_of_time():
+            raise SearchTimeout
+        if position.threats(side):
+            return WIN_SCORE - ply
+        against = position.threats(opponent(side))
+        if len(against) >= 2:
+            return -(WIN_SCORE - ply - 1)
+        if against:
+            candidates = list(against)
+        elif depth <= 0:
+            return position.evaluate(side)
+        else:
+            candidates = ordered(side, BRANCH_LIMIT)
+        if not candidates:
+            return 0
+        best = -WIN_SCORE - 1
+        next_depth = depth if against else depth - 1
+        for index in candidates:
+            position.play(index, side)
+            try:
+                score = -negamax(opponent(side), next_depth, -beta, -alpha, ply + 1)
+            finally:
+                position.undo(index, side)
+            if score > best:
+                best = score
+            if best > alpha:
+                alpha = best
+            if alpha >= beta:
+                break
+        return best
+
+    ranking = ordered(marker)
+    stones = bin(position.occupied).count('1')
+    for depth in range(1, max_depth + 1):
+        alpha = -WIN_SCORE - 1
+        scores = {}
+        try:
+            for index in ranking:
+                position.play(index, marker)
+                try:
+                    scores[index] = -negamax(other, depth - 1, -WIN_SCORE - 1, -alpha, 1)
+                finally:
+                    position.undo(index, marker)
+                alpha = max(alpha, scores[index])
+        except SearchTimeout:
+            break
+        # Stable sort: moves that failed low keep their previous order.
+        ranking.sort(key=lambda index: -scores[index])
+        if abs(alpha) >= WIN_SCORE - CELLS or depth >= CELLS - stones:
+            break
+
+    # Prefer the best-ranked move that leaves the opponent no forced win.
+    for index in ranking:
+        if stop is not None and stop():
+            break
+        position.play(index, marker)
+        refuted = find_forced_win(position, other, stop=stop) is not None
+        position.undo(index, marker)
+        if not refuted:
+            return index
+    return ranking[0]
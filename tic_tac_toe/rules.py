@@ -2,55 +2,335 @@
 
 Implements the Single Responsibility Principle by separating game logic
 from game state management and display concerns.
+
+Rule variants are RuleSet instances: the winning lines of a variant are
+compiled once into index and bitmask tables, and how completing a line
+is scored (normal or misère) and which markers each side may place
+(normal or wild) are table lookups too. Win checks and strategies read
+the tables, so every variant runs through the same code path.
+
+Variants that are not about lines on one board, such as Ultimate
+Tic-Tac-Toe, subclass RuleSet and override the move generator and the
+completion check. Qubic keeps the line tables and only maps its cube
+onto a square grid.
 """
 
-from .constants import BOARD_SIZE
+from functools import lru_cache
+from .constants import BOARD_SIZE, ULTIMATE_SIZE, QUBIC_SIZE, PLAYER, COMPUTER
+from .qubic import GRID_SIZE as QUBIC_GRID_SIZE, grid_lines as qubic_grid_lines
+from .ultimate import UltimateBoard, join_cell, split_cell
+from .zobrist import get_table
+
+DIRECTIONS = ((0, 1), (1, 0), (1, 1), (1, -1))
+
+
+def line_runs(size, length):
+    """List every straight run of cells on a square board.
+
+    Args:
+        size: Board dimension
+        length: Cells per run
+
+    Returns:
+        Tuple of runs, each a tuple of flat cell indices
+    """
+    runs = []
+    for r in range(size):
+        for c in range(size):
+            for dr, dc in DIRECTIONS:
+                end_r, end_c = r + dr * (length - 1), c + dc * (length - 1)
+                if 0 <= end_r < size and 0 <= end_c < size:
+                    runs.append(tuple((r + t * dr) * size + c + t * dc for t in range(length)))
+    return tuple(runs)
+
+
+class RuleSet:
+    """A rule variant compiled into line and mask tables."""
+
+    # Whether legal moves depend on the previous move.
+    uses_last_move = False
+    # Cells per side of the sub-boards drawn with separators, or None.
+    block_size = None
+    # Cells per side of 3D layers laid out as quadrants of the grid, or None.
+    layer_size = None
+
+    def __init__(self, name, size=BOARD_SIZE, win_length=None, lines=None,
+                 misere=False, wild=False):
+        """Compile a rule variant.
+
+        Args:
+            name: Variant name
+            size: Board dimension
+            win_length: Number in a row that completes a line, defaults to
+                a full row; ignored when `lines` is given
+            lines: Optional custom winning lines, each a sequence of
+                (row, col) cells
+            misere: Completing a line loses instead of winning
+            wild: Either side may place either marker; a line of one
+                marker counts for the side that completed it
+        """
+        self.name = name
+        self.size = size
+        self.win_length = win_length or size
+        self.misere = misere
+        self.wild = wild
+
+        if lines is None:
+            lines = line_runs(size, self.win_length)
+        else:
+            lines = tuple(tuple(r * size + c for r, c in line) for line in lines)
+        self.lines = lines
+        self.line_masks = tuple(sum(1 << index for index in line) for line in lines)
+
+        cells = size * size
+        self.coords = tuple(divmod(index, size) for index in range(cells))
+        through = [[] for _ in range(cells)]
+        for line_id, line in enumerate(lines):
+            for index in line:
+                through[index].append(line_id)
+        # Per cell: the lines through it, as (row, col) tuples and as bitmasks
+        self.lines_through = tuple(
+            tuple(tuple(self.coords[i] for i in lines[line_id]) for line_id in ids)
+            for ids in through
+        )
+        self.masks_through = tuple(
+            tuple(self.line_masks[line_id] for line_id in ids) for ids in through
+        )
+
+        # Score for the side that completes a line, and who wins when `side` does.
+        self.completion_score = -1 if misere else 1
+        self.winner_of = {
+            PLAYER: COMPUTER if misere else PLAYER,
+            COMPUTER: PLAYER if misere else COMPUTER,
+        }
+        # Markers each side may place, its own first.
+        self.markers = {
+            PLAYER: (PLAYER, COMPUTER) if wild else (PLAYER,),
+            COMPUTER: (COMPUTER, PLAYER) if wild else (COMPUTER,),
+        }
+
+    def completed_line(self, board, row, col):
+        """Get a line through a cell whose cells all match the cell's marker.
+
+        Only lines through the last move can have been completed by it, so
+        this is the check to run after each move.
+
+        Args:
+            board: Current board state
+            row: Row of the last move
+            col: Column of the last move
+
+        Returns:
+            List of (row, col) tuples for the line, or None
+        """
+        marker = board[row][col]
+        for line in self.lines_through[row * self.size + col]:
+            for r, c in line:
+                if board[r][c] != marker:
+                    break
+            else:
+                return list(line)
+        return None
+
+    def legal_moves(self, board, last_move=None):
+        """Get the cells the side to move may play.
+
+        Args:
+            board: Current board state
+            last_move: (row, col) of the previous move, or None
+
+        Returns:
+            List of (row, col) tuples; empty when the game cannot continue
+        """
+        return TicTacToeRules.get_available_moves(board)
+
+    def completes_mask(self, bits, index):
+        """Check whether a marker's bitboard completes a line through a cell.
+
+        Args:
+            bits: Bitboard of one marker, including the cell
+            index: Flat index of the cell just filled
+
+        Returns:
+            True if a line through the cell is complete
+        """
+        for mask in self.masks_through[index]:
+            if bits & mask == mask:
+                return True
+        return False
+
+
+class UltimateRuleSet(RuleSet):
+    """Ultimate Tic-Tac-Toe: nine sub-boards and a send-to-board constraint."""
+
+    uses_last_move = True
+    block_size = ULTIMATE_SIZE // 3
+
+    def __init__(self, name):
+        """Set up the variant.
+
+        Args:
+            name: Variant name
+        """
+        super().__init__(name, ULTIMATE_SIZE, win_length=3, lines=())
+
+    def legal_moves(self, board, last_move=None):
+        """Get the empty cells of the sub-board the last move sends to.
+
+        Any open sub-board may be played when that one is won or full.
+
+        Args:
+            board: Current board state
+            last_move: (row, col) of the previous move, or None
+
+        Returns:
+            List of (row, col) tuples, row by row; empty once the game is over
+        """
+        position = UltimateBoard.from_board(board, last_move)
+        return sorted(join_cell(sub, pos) for sub, pos in position.moves())
+
+    def completed_line(self, board, row, col):
+        """Check whether the move at a cell won the meta-board.
+
+        Args:
+            board: Current board state
+            row: Row of the last move
+            col: Column of the last move
+
+        Returns:
+            Cells of the winning sub-board lines, or None
+        """
+        marker = board[row][col]
+        position = UltimateBoard.from_board(board)
+        if not position.meta[marker] >> split_cell(row, col)[0] & 1:
+            return None
+        return position.winning_cells(marker)
+
+
+class QubicRuleSet(RuleSet):
+    """Qubic: four in a row in a 4x4x4 cube, over all 76 lines.
+
+    The cube is stored as an 8x8 grid whose quadrants are its four layers.
+    """
+
+    layer_size = QUBIC_SIZE
+
+    def __init__(self, name):
+        """Set up the variant.
+
+        Args:
+            name: Variant name
+        """
+        super().__init__(name, QUBIC_GRID_SIZE, win_length=QUBIC_SIZE, lines=qubic_grid_lines())
+
+
+STANDARD = 'standard'
+MISERE = 'misere'
+WILD = 'wild'
+ULTIMATE = 'ultimate'
+QUBIC = 'qubic'
+
+RULE_SETS = {
+    STANDARD: RuleSet(STANDARD),
+    MISERE: RuleSet(MISERE, misere=True),
+    WILD: RuleSet(WILD, wild=True),
+    ULTIMATE: UltimateRuleSet(ULTIMATE),
+    QUBIC: QubicRuleSet(QUBIC),
+}
+
+
+def get_rule_set(name=STANDARD):
+    """Get a registered rule set by name.
+
+    Args:
+        name: Key of RULE_SETS
+
+    Returns:
+        RuleSet instance
+    """
+    if name not in RULE_SETS:
+        raise ValueError(f"Unknown rule set: {name}")
+    return RULE_SETS[name]
+
+
+@lru_cache(maxsize=None)
+def line_rule_set(size=BOARD_SIZE, win_length=None):
+    """Get the normal k-in-a-row rule set for a board.
+
+    Args:
+        size: Board dimension
+        win_length: Number in a row needed to win, defaults to a full row
+
+    Returns:
+        Shared RuleSet instance; the standard one for the standard board
+    """
+    if size == BOARD_SIZE and win_length in (None, BOARD_SIZE):
+        return RULE_SETS[STANDARD]
+    return RuleSet(f"{win_length or size}-in-a-row", size, win_length)
 
 
 class TicTacToeRules:
     """Rules and logic for Tic-Tac-Toe game."""
 
     @staticmethod
-    def check_winner(board, player):
+    def check_winner(board, player, win_length=None):
         """Check if the given player has won.
 
         Args:
             board: Current board state
             player: Player marker ('X' or 'O')
+            win_length: Number in a row needed to win, defaults to a full line
 
         Returns:
             True if player has won
         """
-        return TicTacToeRules.get_winning_line(board, player) is not None
+        return TicTacToeRules.get_winning_line(board, player, win_length) is not None
 
     @staticmethod
-    def get_winning_line(board, player):
+    def get_winning_line(board, player, win_length=None):
         """Get the winning line for the given player, if any.
 
+        Checks the line masks of the k-in-a-row RuleSet for the board.
+
         Args:
             board: Current board state
             player: Player marker ('X' or 'O')
+            win_length: Number in a row needed to win, defaults to a full line
 
         Returns:
             List of (row, col) tuples for winning line, or None
         """
-        # Rows
-        for i in range(BOARD_SIZE):
-            if all(board[i][j] == player for j in range(BOARD_SIZE)):
-                return [(i, j) for j in range(BOARD_SIZE)]
+        rules = line_rule_set(len(board), win_length)
+        bits = 0
+        for index, (row, col) in enumerate(rules.coords):
+            if board[row][col] == player:
+                bits |= 1 << index
+        for line, mask in zip(rules.lines, rules.line_masks):
+            if bits & mask == mask:
+                return [rules.coords[index] for index in line]
+        return None
 
-        # Columns
-        for j in range(BOARD_SIZE):
-            if all(board[i][j] == player for i in range(BOARD_SIZE)):
-                return [(i, j) for i in range(BOARD_SIZE)]
+    @staticmethod
+    def get_line_through(board, row, col, player, win_length=None):
+        """Get a winning line through one cell, checking only the lines through it.
 
-        # Diagonals
-        if all(board[i][i] == player for i in range(BOARD_SIZE)):
-            return [(i, i) for i in range(BOARD_SIZE)]
-        if all(board[i][BOARD_SIZE - 1 - i] == player for i in range(BOARD_SIZE)):
-            return [(i, BOARD_SIZE - 1 - i) for i in range(BOARD_SIZE)]
+        This is the incremental check to use after a move: only lines
+        through the new piece can have been completed by it. It is
+        RuleSet.completed_line() of the k-in-a-row RuleSet for the board.
 
-        return None
+        Args:
+            board: Current board state
+            row: Row of a cell holding `player`
+            col: Column of a cell holding `player`
+            player: Player marker ('X' or 'O')
+            win_length: Number in a row needed to win, defaults to a full line
+
+        Returns:
+            List of (row, col) tuples for the line, or None
+        """
+        if board[row][col] != player:
+            return None
+        return line_rule_set(len(board), win_length).completed_line(board, row, col)
 
     @staticmethod
     def is_full(board):
@@ -62,26 +342,47 @@ class TicTacToeRules:
         Returns:
             True if board is full
         """
-        return all(board[i][j] != ' ' for i in range(BOARD_SIZE) for j in range(BOARD_SIZE))
+        return all(cell != ' ' for row in board for cell in row)
 
     @staticmethod
-    def make_move(board, row, col, player):
+    def make_move(board, row, col, player, key=None):
         """Place a piece on the board.
 
+        Given the board's Zobrist hash, the hash is updated with the move
+        instead of being recomputed from the whole board.
+
         Args:
             board: Current board state (modified in place)
-            row: Row position (0-2)
-            col: Column position (0-2)
+            row: Row position (0-2 on the standard board)
+            col: Column position (0-2 on the standard board)
             player: Player marker ('X' or 'O')
+            key: Optional Zobrist hash of the board before the move
 
         Returns:
-            True if move was successful, False otherwise
+            Without `key`, True if move was successful, False otherwise.
+            With `key`, the hash after the move, or None if the move was
+            illegal.
         """
-        if 0 <= row < BOARD_SIZE and 0 <= col < BOARD_SIZE:
+        size = len(board)
+        if 0 <= row < size and 0 <= col < size:
             if board[row][col] == ' ':
                 board[row][col] = player
-                return True
-        return False
+                if key is None:
+                    return True
+                return get_table(size).update(key, row, col, player)
+        return False if key is None else None
+
+    @staticmethod
+    def zobrist_key(board):
+        """Compute the Zobrist hash of a board from scratch.
+
+        Args:
+            board: Current board state
+
+        Returns:
+            64-bit hash, equal to GameState.zobrist_key for the same board
+        """
+        return get_table(len(board)).hash_board(board)
 
     @staticmethod
     def get_available_moves(board):
@@ -93,8 +394,23 @@ class TicTacToeRules:
         Returns:
             List of (row, col) tuples for empty cells
         """
-        return [(i, j) for i in range(BOARD_SIZE)
-                for j in range(BOARD_SIZE) if board[i][j] == ' ']
+        return [(i, j) for i, row in enumerate(board)
+                for j, cell in enumerate(row) if cell == ' ']
+
+    @staticmethod
+    def get_legal_moves(board, last_move=None, rule_set=None):
+        """Get the cells the side to move may play under a rule set.
+
+        Args:
+            board: Current board state
+            last_move: (row, col) of the previous move, or None
+            rule_set: RuleSet in play, defaults to a full line on the board
+
+        Returns:
+            List of (row, col) tuples
+        """
+        rules = rule_set or line_rule_set(len(board))
+        return rules.legal_moves(board, last_move)
 
     @staticmethod
     def check_game_over(board, player_won, computer_won):
@@ -0,0 +1,275 @@
+"""Transposition table in shared memory, for a fleet of worker processes.
+
+Worker processes that each build their own TranspositionTable repeat
+one another's searches. A SharedTranspositionTable lives in one
+``multiprocessing.shared_memory`` block that every process attaches to
+by name, so results found by one worker are reused by all of them and
+the cache is held once per host rather than once per process. It has the
+interface of TranspositionTable, so it can be handed to HardStrategy as
+its `table`.
+
+Layout: a header of 8-byte words (magic, version, bucket count, bucket
+size, generation) followed by three parallel arrays of 8-byte words, one
+entry per slot:
+
+- ``check``: key XOR data XOR meta
+- ``data``: value (32 bits), depth (16 bits) and move (16 bits), each
+  stored with a bias so that it unpacks without a sign fix-up
+- ``meta``: generation (16 bits, 0 for an empty slot) and flag (8 bits)
+
+Neither reads nor writes take a lock. Aligned 8-byte words are written
+whole, so a writer racing another on the same slot (or a reader) can at
+worst see words from different stores side by side. The check word
+then no longer matches the key and the probe is a miss, so a torn entry
+is never returned. The eviction policy is the 'age' policy
+of TranspositionTable, so results from earlier generations go first:
+stale entries are replaced before current ones, shallowest first.
+
+Counters in stats() are per process, apart from 'filled', which is
+counted from the shared slots.
+"""
+
+from multiprocessing import resource_tracker, shared_memory
+from .transposition import EXACT, NO_MOVE
+
+MAGIC = 0x5454545443414348  # 'TTTTCACH'
+LAYOUT_VERSION = 1
+HEADER_WORDS = 8
+# Header word holding the shared generation counter.
+_GENERATION = 4
+# Bytes per slot: check, data and meta words.
+ENTRY_BYTES = 24
+
+
+# Biases that make the signed fields of the data word non-negative.
+_VALUE_BIAS = 1 << 31
+_SHORT_BIAS = 1 << 15
+
+
+class SharedTranspositionTable:
+    """Lock-free fixed-size hash table of search results in shared memory."""
+
+    def __init__(self, shm, owner):
+        """Wrap a shared memory block; use create() or attach() instead.
+
+        Args:
+            shm: SharedMemory block holding the table
+            owner: Whether this process created the block and unlinks it
+        """
+        words = shm.buf.cast('Q')
+        if words[0] != MAGIC or words[1] != LAYOUT_VERSION:
+            words.release()
+            shm.close()
+            raise ValueError(f"Shared memory {shm.name} does not hold a table")
+        self.owner = owner
+        self.bucket_count = words[2]
+        self.bucket_size = words[3]
+        self.capacity = self.bucket_count * self.bucket_size
+        self._header = words[:HEADER_WORDS]
+        self._check = words[HEADER_WORDS:HEADER_WORDS + self.capacity]
+        self._data = words[HEADER_WORDS + self.capacity:HEADER_WORDS + 2 * self.capacity]
+        self._meta = words[HEADER_WORDS + 2 * self.capacity:HEADER_WORDS + 3 * self.capacity]
+        self._words = words
+        self._shm = shm
+
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+
+    @classmethod
+    def create(cls, max_mb=8.0, bucket_size=4, name=None):
+        """Allocate a new table.
+
+        Args:
+            max_mb: Memory cap in megabytes
+            bucket_size: Slots per bucket
+            name: Shared memory name, or None for a generated one
+
+        Returns:
+            SharedTranspositionTable owned by this process
+        """
+        bucket_count = max(1, int(max_mb * 1024 * 1024) // (ENTRY_BYTES * bucket_size))
+        size = 8 * HEADER_WORDS + ENTRY_BYTES * bucket_count * bucket_size
+        shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        # A new block is zero-filled, so every slot starts empty.
+        header = shm.buf.cast('Q')
+        header[1] = LAYOUT_VERSION
+        header[2] = bucket_count
+        header[3] = bucket_size
+        header[_GENERATION] = 1
+        header[0] = MAGIC
+        header.release()
+        return cls(shm, owner=True)
+
+    @classmethod
+    def attach(cls, name, untrack=False):
+        """Open a table created by another process.
+
+        Args:
+            name: Shared memory name, see the `name` property
+            untrack: Set in processes that were not started by the
+                creator (such as pool workers are), so that their own
+                resource tracker does not free the block when they exit
+
+        Returns:
+            SharedTranspositionTable that this process only closes
+
+        Raises:
+            FileNotFoundError: If no block has that name
+            ValueError: If the block does not hold a table
+        """
+        shm = shared_memory.SharedMemory(name=name)
+        if untrack:
+            resource_tracker.unregister(shm._name, 'shared_memory')
+        return cls(shm, owner=False)
+
+    @property
+    def name(self):
+        """Shared memory name that other processes attach to."""
+        return self._shm.name
+
+    @property
+    def generation(self):
+        """Current search generation, shared by every process."""
+        return self._header[_GENERATION]
+
+    @property
+    def memory_bytes(self):
+        """Bytes of the entry arrays."""
+        return self.capacity * ENTRY_BYTES
+
+    def probe(self, key):
+        """Look up a position.
+
+        Args:
+            key: 64-bit position hash
+
+        Returns:
+            Tuple of (value, depth, flag, move) or None; move is a flat cell
+            index or NO_MOVE
+        """
+        start = (key % self.bucket_count) * self.bucket_size
+        check = self._check
+        data = self._data
+        meta = self._meta
+        for slot in range(start, start + self.bucket_size):
+            info = meta[slot]
+            if not info & 0xFFFF:
+                continue
+            word = data[slot]
+            if check[slot] ^ word ^ info == key:
+                self.hits += 1
+                return ((word & 0xFFFFFFFF) - _VALUE_BIAS, (word >> 32 & 0xFFFF) - _SHORT_BIAS,
+                        info >> 16, (word >> 48) - _SHORT_BIAS)
+        self.misses += 1
+        return None
+
+    def store(self, key, value, depth, flag=EXACT, move=NO_MOVE):
+        """Record a search result.
+
+        Args:
+            key: 64-bit position hash
+            value: Integer score
+            depth: Search depth (or remaining plies) behind the score
+            flag: EXACT, LOWER or UPPER bound
+            move: Best move as a flat cell index, or NO_MOVE
+        """
+        start = (key % self.bucket_count) * self.bucket_size
+        check = self._check
+        data = self._data
+        meta = self._meta
+        generation = self._header[_GENERATION]
+
+        slot = None
+        victim = None
+        victim_rank = None
+        for candidate in range(start, start + self.bucket_size):
+            info = meta[candidate]
+            age = info & 0xFFFF
+            if not age:
+                if slot is None:
+                    slot = candidate
+                continue
+            word = data[candidate]
+            if check[candidate] ^ word ^ info == key:
+                slot = candidate
+                break
+            rank = (age == generation, word >> 32 & 0xFFFF)
+            if victim_rank is None or rank < victim_rank:
+                victim, victim_rank = candidate, rank
+        if slot is None:
+            slot = victim
+            self.evictions += 1
+
+        word = (value + _VALUE_BIAS) | (depth + _SHORT_BIAS) << 32 | (move + _SHORT_BIAS) << 48
+        info = generation | flag << 16
+        data[slot] = word
+        meta[slot] = info
+        check[slot] = key ^ word ^ info
+        self.stores += 1
+
+    def new_generation(self):
+        """Start a new search generation for every process.
+
+        Entries stay usable but are evicted before current ones.
+        """
+        self._header[_GENERATION] = self._header[_GENERATION] % 0xFFFF + 1
+
+    def clear(self):
+        """Empty the table in place for every process."""
+        meta = self._meta
+        for slot in range(self.capacity):
+            meta[slot] = 0
+        self._header[_GENERATION] = 1
+
+    def filled(self):
+        """Count occupied slots (scans the table)."""
+        meta = self._meta
+        return sum(1 for slot in range(self.capacity) if meta[slot] & 0xFFFF)
+
+    def stats(self):
+        """Get usage counters.
+
+        Returns:
+            Dictionary with this process's hits, misses, hit_rate, stores
+            and evictions, plus the shared filled slots, capacity and
+            memory_bytes
+        """
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'stores': self.stores,
+            'evictions': self.evictions,
+            'filled': self.filled(),
+            'capacity': self.capacity,
+            'memory_bytes': self.memory_bytes,
+        }
+
+    def _release_views(self):
+        for view in (self._header, self._check, self._data, self._meta, self._words):
+            view.release()
+
+    def close(self):
+        """Detach from the block; the owner also frees it."""
+        if self._shm is None:
+            return
+        self._release_views()
+        self._shm.close()
+        if self.owner:
+            self._shm.unlink()
+        self._shm = None
+
+    def __del__(self):
+        # Let SharedMemory close itself; a block left open is the
+        # resource tracker's to report.
+        if getattr(self, '_shm', None) is not None:
+            self._release_views()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
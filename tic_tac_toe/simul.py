@@ -0,0 +1,242 @@
+"""Simultaneous exhibition: one human against the AI on many boards.
+
+A SimulGame runs one TicTacToeGame (and so one GameState) per board.
+The human moves on every board that is waiting for them; the computer's
+replies are then computed together as one batch and shown together,
+instead of one get_move() per board while the human waits.
+
+A batch goes through the strategy's get_moves(), which strategies can
+override to evaluate several boards faster than one at a time
+(HardStrategy searches identical boards once). With ``workers`` set,
+the batch is split over a process pool instead, each worker process
+keeping its own strategy between batches.
+
+Run with ``python -m tic_tac_toe.simul --help``.
+"""
+
+import argparse
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from .ai_strategy import AIStrategyFactory
+from .constants import GAME_LOG_FILE, PLAYER, COMPUTER, Difficulty, GameResult
+from .game_coordinator import TicTacToeGame
+from .game_log import append_games
+from .input import get_player_move
+from .rules import RULE_SETS, get_rule_set, line_rule_set
+from .score_tracker import ScoreTracker
+from .strategy_pool import shared_pool
+from .ui import display_result, display_scores, print_header
+
+DEFAULT_BOARDS = 4
+RESULT_LABELS = {
+    GameResult.PLAYER_WIN: "you win",
+    GameResult.COMPUTER_WIN: "computer wins",
+    GameResult.DRAW: "draw",
+}
+
+# Strategies of a worker process, kept between batches.
+_strategies = {}
+
+
+def _rules_spec(rule_set):
+    """Describe a rule set compactly for a worker process."""
+    return rule_set.name, rule_set.size, rule_set.win_length
+
+
+def _rules_from_spec(spec):
+    """Rebuild a rule set described by _rules_spec()."""
+    name, size, win_length = spec
+    if name in RULE_SETS and get_rule_set(name).size == size:
+        return get_rule_set(name)
+    return line_rule_set(size, win_length)
+
+
+def batch_moves(difficulty, rules_spec, boards, last_moves=None):
+    """Compute moves for a batch of boards. Runs inside a worker process.
+
+    Args:
+        difficulty: Difficulty registered with AIStrategyFactory
+        rules_spec: Rule set as (name, size, win_length)
+        boards: Board states, the computer to move on each
+        last_moves: Previous move per board, or None
+
+    Returns:
+        List of moves, one per board
+    """
+    if (difficulty, rules_spec) not in _strategies:
+        _strategies[difficulty, rules_spec] = AIStrategyFactory.create(
+            difficulty, rule_set=_rules_from_spec(rules_spec))
+    return _strategies[difficulty, rules_spec].get_moves(boards, last_moves)
+
+
+class SimulGame:
+    """Coordinates one human's games on several boards."""
+
+    def __init__(self, score_tracker, boards=DEFAULT_BOARDS, difficulty=Difficulty.HARD,
+                 rule_set=None, workers=0, strategy_pool=None):
+        """Start a new game on every board.
+
+        Args:
+            score_tracker: ScoreTracker that records each finished board
+            boards: Number of boards
+            difficulty: Difficulty the computer plays at on every board
+            rule_set: RuleSet for the standard board, defaults to the
+                standard rules; variant difficulties use their own
+            workers: Worker processes for the computer's replies; 0
+                computes them in this process
+            strategy_pool: StrategyPool for the strategies, defaults to
+                the process-wide shared_pool
+        """
+        self.score_tracker = score_tracker
+        self.difficulty = difficulty
+        pool = strategy_pool or shared_pool
+        self.games = []
+        for _ in range(boards):
+            game = TicTacToeGame(score_tracker, rule_set=rule_set, strategy_pool=pool)
+            game.set_difficulty(difficulty)
+            game.start_new_game()
+            self.games.append(game)
+        self.rule_set = self.games[0].rule_set
+        self.strategy = pool.create(difficulty, rule_set=self.rule_set)
+        self.results = [None] * boards
+        self._executor = ProcessPoolExecutor(max_workers=workers) if workers else None
+        self.workers = workers
+
+    def close(self):
+        """Shut down the worker processes."""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    @property
+    def finished(self):
+        """Whether every board has a result."""
+        return all(result is not None for result in self.results)
+
+    def waiting_for_player(self):
+        """Indices of the boards where it is the human's move."""
+        return [index for index, game in enumerate(self.games)
+                if self.results[index] is None and game.game_state.current_player == PLAYER]
+
+    def pending_replies(self):
+        """Indices of the boards waiting for the computer's reply."""
+        return [index for index, game in enumerate(self.games)
+                if self.results[index] is None and game.game_state.current_player == COMPUTER]
+
+    def player_move(self, index, move):
+        """Play the human's move on one board.
+
+        Args:
+            index: Board index
+            move: (row, col) or, under wild rules, (row, col, marker)
+
+        Returns:
+            Legacy result dictionary, or None if the move is illegal or
+            it is not the human's turn there
+        """
+        if index not in self.waiting_for_player():
+            return None
+        return self._play(index, move, PLAYER)
+
+    def reply_all(self):
+        """Compute and play the computer's replies on every waiting board.
+
+        Returns:
+            List of (index, move, result dictionary) in board order
+        """
+        indices = self.pending_replies()
+        if not indices:
+            return []
+        states = [self.games[index].game_state for index in indices]
+        boards = [state.board for state in states]
+        last_moves = ([state.last_move for state in states]
+                      if self.rule_set.uses_last_move else None)
+        moves = self._batch(boards, last_moves)
+        return [(index, move, self._play(index, move, COMPUTER))
+                for index, move in zip(indices, moves)]
+
+    def _batch(self, boards, last_moves):
+        """Get the computer's moves for a batch, in this process or the pool."""
+        if self._executor is None:
+            return self.strategy.get_moves(boards, last_moves)
+        spec = _rules_spec(self.rule_set)
+        size = -(-len(boards) // self.workers)
+        futures = [self._executor.submit(batch_moves, self.difficulty, spec,
+                                         boards[start:start + size],
+                                         last_moves[start:start + size] if last_moves else None)
+                   for start in range(0, len(boards), size)]
+        return [move for future in futures for move in future.result()]
+
+    def _play(self, index, move, side):
+        """Play a move on a board and record the board's result when it ends."""
+        game = self.games[index]
+        result = game.play_move(move, side)
+        if result is not None and result['reason'] in ('win', 'draw'):
+            self.results[index] = result['result']
+            self.score_tracker.record_result(result['result'])
+        return result
+
+    def display(self):
+        """Draw every board."""
+        for index, game in enumerate(self.games):
+            result = self.results[index]
+            status = "" if result is None else f" - {RESULT_LABELS[result].upper()}"
+            print_header(f"BOARD {index + 1}{status}")
+            game.display_board()
+
+
+def play_simul(boards=DEFAULT_BOARDS, difficulty=Difficulty.HARD, workers=0):
+    """Interactive simul: the human moves on each board, then all replies come at once.
+
+    Args:
+        boards: Number of boards
+        difficulty: Difficulty the computer plays at
+        workers: Worker processes for the computer's replies
+    """
+    score_tracker = ScoreTracker()
+    with SimulGame(score_tracker, boards, difficulty, workers=workers) as simul:
+        while not simul.finished:
+            for index in simul.waiting_for_player():
+                game = simul.games[index]
+                print_header(f"BOARD {index + 1} - YOUR MOVE")
+                game.display_board()
+                state = game.game_state
+                while simul.player_move(
+                        index, get_player_move(state.board, last_move=state.last_move)) is None:
+                    pass
+            simul.reply_all()
+            simul.display()
+
+        for index, game in enumerate(simul.games):
+            print_header(f"BOARD {index + 1}")
+            display_result(simul.results[index])
+        try:
+            append_games(GAME_LOG_FILE, [game.game_record() for game in simul.games])
+        except OSError:
+            pass  # The move log is optional
+        display_scores(score_tracker)
+
+
+def main(argv=None):
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Play the computer on several boards at once.")
+    parser.add_argument('--boards', type=int, default=DEFAULT_BOARDS, help="number of boards")
+    parser.add_argument('--difficulty', default=Difficulty.HARD,
+                        choices=AIStrategyFactory.registered(), help="computer difficulty")
+    parser.add_argument('--workers', type=int, default=0,
+                        help="worker processes for the computer's replies (0 = this process)")
+    args = parser.parse_args(argv)
+    try:
+        play_simul(args.boards, args.difficulty, args.workers)
+    except KeyboardInterrupt:
+        sys.stdout.write("\n\nSimul interrupted. Thanks for playing!\n")
+
+
+if __name__ == "__main__":
+    main()
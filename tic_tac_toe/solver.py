@@ -0,0 +1,288 @@
+"""Perfect-play tables for Tic-Tac-Toe.
+
+Every position reachable from the empty board is solved once, by
+negamax over base-3 board codes (see encoding.py), into a flat signed
+byte table. The value is for the side to move: 1 win, 0 draw, -1 loss.
+The side to move follows from the board, since X always moves first.
+
+Tables too big to solve in one go (4x4 boards) are built offline by
+offline_solver.py and saved with save_table(). A table remembers the win
+length it was solved for, and saved files start with a header holding
+it, since the board size alone does not tell the rules apart.
+install_table() saves a table under a name derived from its rules, where
+installed_table() finds it again for HardStrategy (see strategy_pool.py).
+"""
+
+import os
+from array import array
+from functools import lru_cache
+from .constants import BOARD_SIZE, SOLVED_TABLE_DIR, PLAYER, COMPUTER
+from .encoding import DIGITS, POWERS_OF_3
+from .rules import line_rule_set
+
+WIN = 1
+DRAW = 0
+LOSS = -1
+# Marks codes that cannot occur in a game.
+UNREACHABLE = -2
+
+# Start of a saved table file, followed by one win length byte.
+TABLE_MAGIC = b"TTTSOLV1"
+
+
+class SolvedTable(array):
+    """Signed byte table of solved values, with the win length it was solved for."""
+
+    def __new__(cls, win_length, values=b''):
+        """Create a table.
+
+        Args:
+            win_length: Markers in a row needed to win
+            values: Table contents as bytes
+        """
+        table = super().__new__(cls, 'b')
+        table.frombytes(values)
+        table.win_length = win_length
+        return table
+
+
+def side_to_move(cells):
+    """Get the marker to move on a board given as a flat cell sequence."""
+    return PLAYER if cells.count(PLAYER) == cells.count(COMPUTER) else COMPUTER
+
+
+def new_table(rule_set):
+    """Allocate an empty table for a rule set.
+
+    Args:
+        rule_set: Normal (not misère or wild) RuleSet
+
+    Returns:
+        SolvedTable of length 3 ** cells filled with UNREACHABLE
+    """
+    if rule_set.misere or rule_set.wild:
+        raise ValueError("The solver supports normal rules only")
+    filler = array('b', [UNREACHABLE]).tobytes()
+    return SolvedTable(rule_set.win_length, filler * (3 ** (rule_set.size * rule_set.size)))
+
+
+def solve_position(table, rule_set, moves=(), record=None):
+    """Solve a position and every position below it into a table.
+
+    Values already in the table are trusted, so one table can be reused
+    to solve many positions that share sub-trees.
+
+    Args:
+        table: Table from new_table(), updated in place
+        rule_set: Normal RuleSet the table belongs to
+        moves: Flat cell indices played from the empty board, X first;
+            none of them may complete a line
+        record: Optional callable(code, value) told about every new entry
+
+    Returns:
+        Value of the position for the side to move
+    """
+    cells = rule_set.size * rule_set.size
+    completes = rule_set.completes_mask
+    bits = {PLAYER: 0, COMPUTER: 0}
+    code = 0
+    side = PLAYER
+    for index in moves:
+        bits[side] |= 1 << index
+        code += DIGITS[side] * POWERS_OF_3[index]
+        side = COMPUTER if side == PLAYER else PLAYER
+
+    def store(code, value):
+        table[code] = value
+        if record is not None:
+            record(code, value)
+
+    def negamax(code, side, empties):
+        """Value for `side` to move; the previous move did not win."""
+        value = table[code]
+        if value != UNREACHABLE:
+            return value
+        if not empties:
+            store(code, DRAW)
+            return DRAW
+        other = COMPUTER if side == PLAYER else PLAYER
+        digit = DIGITS[side]
+        occupied = bits[PLAYER] | bits[COMPUTER]
+        best = LOSS
+        for index in range(cells):
+            bit = 1 << index
+            if occupied & bit:
+                continue
+            child = code + digit * POWERS_OF_3[index]
+            bits[side] |= bit
+            if completes(bits[side], index):
+                # The side to move in the child has lost.
+                if table[child] == UNREACHABLE:
+                    store(child, LOSS)
+                score = WIN
+            else:
+                score = -negamax(child, other, empties - 1)
+            bits[side] ^= bit
+            if score > best:
+                best = score
+        store(code, best)
+        return best
+
+    return negamax(code, side, cells - len(moves))
+
+
+def solve(rule_set=None):
+    """Solve every reachable position of a rule set.
+
+    Args:
+        rule_set: Normal (not misère or wild) RuleSet, defaults to the
+            standard rules
+
+    Returns:
+        SolvedTable of length 3 ** cells indexed by base-3 board code
+    """
+    rules = rule_set or line_rule_set()
+    table = new_table(rules)
+    solve_position(table, rules)
+    return table
+
+
+def save_table(table, path):
+    """Write a table to disk atomically.
+
+    Args:
+        table: Table from solve() or offline_solver.merge_parts()
+        path: Destination file path
+    """
+    temp = f"{path}.tmp"
+    with open(temp, 'wb') as f:
+        f.write(TABLE_MAGIC + bytes([table.win_length]))
+        table.tofile(f)
+    os.replace(temp, path)
+
+
+def load_table(path):
+    """Read a table written by save_table().
+
+    Args:
+        path: Table file path
+
+    Returns:
+        SolvedTable
+
+    Raises:
+        ValueError: If the file has no header or its size is not 3 ** cells
+            for a square board
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+    header = len(TABLE_MAGIC) + 1
+    if not data.startswith(TABLE_MAGIC):
+        raise ValueError(f"{path} is not a solved table")
+    table = SolvedTable(data[header - 1], data[header:])
+    if table_size(table) is None:
+        raise ValueError(f"{path} is not a solved table")
+    return table
+
+
+def installed_path(size, win_length, directory=SOLVED_TABLE_DIR):
+    """Get the path a table for k-in-a-row rules is installed at.
+
+    Args:
+        size: Board dimension
+        win_length: Markers in a row needed to win
+        directory: Directory of installed tables
+
+    Returns:
+        File path
+    """
+    return os.path.join(directory, f"{size}x{size}-k{win_length}.bin")
+
+
+def install_table(table, directory=SOLVED_TABLE_DIR):
+    """Save a table where installed_table() looks for it.
+
+    Args:
+        table: Table from solve() or offline_solver.merge_parts()
+        directory: Directory of installed tables, created if missing
+
+    Returns:
+        Path the table was saved to
+    """
+    os.makedirs(directory, exist_ok=True)
+    path = installed_path(table_size(table), table.win_length, directory)
+    save_table(table, path)
+    return path
+
+
+def installed_table(rule_set, directory=SOLVED_TABLE_DIR):
+    """Get the installed table for a rule set, if there is one.
+
+    Only normal k-in-a-row rule sets (see rules.line_rule_set()) have
+    tables; each file is read once per process.
+
+    Args:
+        rule_set: RuleSet in play
+        directory: Directory of installed tables
+
+    Returns:
+        SolvedTable, or None if none is installed for the rules
+    """
+    if rule_set is not line_rule_set(rule_set.size, rule_set.win_length):
+        return None
+    path = installed_path(rule_set.size, rule_set.win_length, directory)
+    if not os.path.exists(path):
+        return None
+    return _load_installed(os.path.abspath(path))
+
+
+@lru_cache(maxsize=None)
+def _load_installed(path):
+    """Load an installed table once per process."""
+    return load_table(path)
+
+
+def table_size(table):
+    """Get the board dimension a table was solved for.
+
+    Args:
+        table: Table from solve() or load_table()
+
+    Returns:
+        Board dimension, or None if the length does not fit a square board
+    """
+    for size in range(1, 5):
+        if len(table) == 3 ** (size * size):
+            return size
+    return None
+
+
+@lru_cache(maxsize=None)
+def perfect_table(size=BOARD_SIZE):
+    """Get the shared solved table for a square board.
+
+    Args:
+        size: Board dimension
+
+    Returns:
+        Table from solve() for full-line rules on that board
+    """
+    return solve(line_rule_set(size))
+
+
+def move_values(table, code, cells, side):
+    """Get the perfect-play value of every legal move.
+
+    Args:
+        table: Table from solve()
+        code: Base-3 code of the position
+        cells: Flat cell sequence of the position
+        side: Marker to move
+
+    Returns:
+        Dictionary mapping flat cell index to the value of playing there,
+        for `side`
+    """
+    digit = DIGITS[side]
+    return {index: -table[code + digit * POWERS_OF_3[index]]
+            for index, cell in enumerate(cells) if cell == ' '}
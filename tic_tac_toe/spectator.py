@@ -0,0 +1,176 @@
+"""Spectator broadcast of live games.
+
+The coordinator publishes one small delta per move to a SpectatorHub,
+which fans it out to every subscriber. Each update is serialized once
+and the same bytes object is queued for all subscribers, so the cost of
+a move is one encode plus one append per subscriber.
+
+Updates are text lines:
+
+    <seq> move <row>,<col> <marker> <result>
+    <seq> board <cells> <result>
+
+``cells`` is the board row by row with ``.`` for an empty cell, and
+``result`` is the coordinator's 'continue', 'win' or 'draw'. A ``board``
+keyframe replaces everything before it.
+
+Publishing never blocks on a subscriber. One that falls more than
+``max_pending`` updates behind has its queue dropped and receives a
+single keyframe of the current board on its next poll, shared by every
+subscriber that lagged at the same point.
+"""
+
+import threading
+from collections import deque
+
+DEFAULT_MAX_PENDING = 64
+
+
+class SpectatorHub:
+    """Fan-out of board updates to local subscribers."""
+
+    def __init__(self, max_pending=DEFAULT_MAX_PENDING):
+        """Create an empty hub.
+
+        Args:
+            max_pending: Default number of updates a subscriber may fall
+                behind before its updates are coalesced
+        """
+        self.max_pending = max_pending
+        self.seq = 0
+        self.size = 0
+        self.published = 0
+        self._cells = []
+        self._result = 'continue'
+        self._keyframe = None
+        self._subscribers = []
+        self._changed = threading.Condition()
+
+    def subscribe(self, max_pending=None):
+        """Add a subscriber that starts from the current board.
+
+        Args:
+            max_pending: Updates it may fall behind, defaults to the hub's
+
+        Returns:
+            Subscription
+        """
+        with self._changed:
+            subscription = Subscription(self, max_pending or self.max_pending)
+            if self.size:
+                subscription._queue.append(self._keyframe_locked())
+            self._subscribers.append(subscription)
+            return subscription
+
+    def unsubscribe(self, subscription):
+        """Remove a subscriber."""
+        with self._changed:
+            if subscription in self._subscribers:
+                self._subscribers.remove(subscription)
+
+    @property
+    def subscriber_count(self):
+        """Number of current subscribers."""
+        return len(self._subscribers)
+
+    def reset(self, board, result='continue'):
+        """Publish a whole board, e.g. for a new game or after an undo.
+
+        Args:
+            board: Current board state (not modified)
+            result: Game status after the last move
+        """
+        with self._changed:
+            self.size = len(board)
+            self._cells = [cell for row in board for cell in row]
+            self._result = result
+            self.seq += 1
+            message = self._keyframe_locked()
+            for subscription in self._subscribers:
+                subscription._queue.clear()
+                subscription._queue.append(message)
+                subscription.lagging = False
+            self.published += 1
+            self._changed.notify_all()
+
+    def publish(self, row, col, marker, result='continue'):
+        """Publish one move.
+
+        Args:
+            row: Row of the move
+            col: Column of the move
+            marker: Marker placed
+            result: Game status after the move: 'continue', 'win' or 'draw'
+        """
+        with self._changed:
+            self._cells[row * self.size + col] = marker
+            self._result = result
+            self.seq += 1
+            message = f"{self.seq} move {row},{col} {marker} {result}\n".encode()
+            for subscription in self._subscribers:
+                subscription._push(message)
+            self.published += 1
+            self._changed.notify_all()
+
+    def _keyframe_locked(self):
+        """Encode the current board once per sequence number."""
+        if self._keyframe is None or self._keyframe[0] != self.seq:
+            cells = "".join(cell if cell != ' ' else '.' for cell in self._cells)
+            self._keyframe = (self.seq, f"{self.seq} board {cells} {self._result}\n".encode())
+        return self._keyframe[1]
+
+
+class Subscription:
+    """One spectator's queue of pending updates."""
+
+    def __init__(self, hub, max_pending):
+        self.hub = hub
+        self.max_pending = max_pending
+        self.lagging = False
+        self.coalesced = 0
+        self._queue = deque()
+
+    def _push(self, message):
+        """Queue an update; called by the hub with its lock held."""
+        if self.lagging:
+            return
+        if len(self._queue) >= self.max_pending:
+            self._queue.clear()
+            self.lagging = True
+            self.coalesced += 1
+            return
+        self._queue.append(message)
+
+    def _take_locked(self):
+        if self.lagging:
+            self.lagging = False
+            return [self.hub._keyframe_locked()]
+        messages = list(self._queue)
+        self._queue.clear()
+        return messages
+
+    def poll(self):
+        """Take every pending update without waiting.
+
+        Returns:
+            List of encoded update lines, oldest first
+        """
+        with self.hub._changed:
+            return self._take_locked()
+
+    def wait(self, timeout=None):
+        """Wait for updates, then take them.
+
+        Args:
+            timeout: Seconds to wait, or None to wait until one arrives
+
+        Returns:
+            List of encoded update lines, empty on timeout
+        """
+        with self.hub._changed:
+            self.hub._changed.wait_for(lambda: self._queue or self.lagging, timeout)
+            return self._take_locked()
+
+    def close(self):
+        """Stop receiving updates."""
+        self.hub.unsubscribe(self)
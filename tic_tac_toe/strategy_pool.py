@@ -0,0 +1,145 @@
+"""Shared strategy caches that survive across games and sessions.
+
+AIStrategyFactory builds a fresh strategy for every game, so anything a
+strategy memoizes is lost when the game ends. A StrategyPool hands out
+strategies wired to one shared cache per (difficulty, rule set): a
+StripedTranspositionTable whose shards are locked separately, so
+concurrent sessions can search it at once.
+
+Strategy instances themselves are not shared: each game gets its own,
+with its own cancellation token, and only the cache behind it is pooled.
+Strategies without a shareable cache (see AIStrategy.shares_table) are
+created exactly as the factory would.
+
+Strategies that can play from a solved table (see AIStrategy.plays_solved)
+are given the table installed for the rules in play, if any, so Hard on a
+4x4 board looks moves up once offline_solver.py has solved it.
+
+Caches are bounded three ways: each holds at most ``table_mb``
+megabytes, at most ``max_caches`` are kept (least recently used go
+first), and a cache unused for ``idle_ttl`` seconds is dropped.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from .ai_strategy import AIStrategyFactory, RandomMoveStrategy
+from .constants import SOLVED_TABLE_DIR
+from .rules import line_rule_set
+from .solver import installed_table
+from .transposition import StripedTranspositionTable
+
+DEFAULT_TABLE_MB = 8.0
+DEFAULT_STRIPES = 16
+DEFAULT_MAX_CACHES = 8
+
+
+class StrategyPool:
+    """Creates strategies that share thread-safe caches."""
+
+    def __init__(self, table_mb=DEFAULT_TABLE_MB, stripes=DEFAULT_STRIPES,
+                 max_caches=DEFAULT_MAX_CACHES, idle_ttl=None, clock=time.monotonic,
+                 solved_dir=SOLVED_TABLE_DIR):
+        """Create an empty pool.
+
+        Args:
+            table_mb: Memory cap of each shared cache, in megabytes
+            stripes: Locked shards per cache
+            max_caches: Most caches kept at once
+            idle_ttl: Seconds a cache may go unused before it is dropped,
+                or None to keep it
+            clock: Time source, for tests
+            solved_dir: Directory of installed solved tables, or None to
+                always search
+        """
+        self.table_mb = table_mb
+        self.solved_dir = solved_dir
+        self.stripes = stripes
+        self.max_caches = max_caches
+        self.idle_ttl = idle_ttl
+        self._clock = clock
+        self._caches = OrderedDict()
+        self._lock = threading.Lock()
+        self.created = 0
+        self.reused = 0
+        self.dropped = 0
+
+    def create(self, difficulty, rule_set=None):
+        """Create a strategy backed by the pool's shared cache.
+
+        Args:
+            difficulty: Difficulty registered with AIStrategyFactory
+            rule_set: RuleSet in play, defaults to the standard rules
+
+        Returns:
+            New strategy instance
+        """
+        strategy_class = AIStrategyFactory.registered().get(difficulty, RandomMoveStrategy)
+        if not strategy_class.shares_table:
+            return AIStrategyFactory.create(difficulty, rule_set=rule_set)
+        rules = rule_set or line_rule_set()
+        options = {'rule_set': rule_set, 'keep_cache': True}
+        if strategy_class.plays_solved and self.solved_dir is not None:
+            solved = installed_table(rules, self.solved_dir)
+            if solved is not None:
+                options.update(rule_set=rules, solved=solved)
+        options['table'] = self._table((difficulty, rules.name, rules.size))
+        return AIStrategyFactory.create(difficulty, **options)
+
+    def _table(self, key):
+        """Get the cache for a key, creating it and applying the limits."""
+        now = self._clock()
+        with self._lock:
+            self._expire_locked(now)
+            entry = self._caches.pop(key, None)
+            if entry is None:
+                table = StripedTranspositionTable(self.table_mb, self.stripes)
+                self.created += 1
+            else:
+                table = entry[0]
+                self.reused += 1
+            self._caches[key] = (table, now)
+            while len(self._caches) > self.max_caches:
+                self._caches.popitem(last=False)
+                self.dropped += 1
+            return table
+
+    def _expire_locked(self, now):
+        """Drop caches idle for longer than idle_ttl."""
+        if self.idle_ttl is None:
+            return
+        for key in [key for key, (_, used) in self._caches.items()
+                    if now - used > self.idle_ttl]:
+            del self._caches[key]
+            self.dropped += 1
+
+    def expire(self):
+        """Drop idle caches now rather than on the next create()."""
+        with self._lock:
+            self._expire_locked(self._clock())
+
+    def clear(self):
+        """Drop every cache."""
+        with self._lock:
+            self.dropped += len(self._caches)
+            self._caches.clear()
+
+    def stats(self):
+        """Get pool counters and per-cache statistics.
+
+        Returns:
+            Dictionary with created, reused, dropped and a 'caches' mapping
+            from (difficulty, rules, size) to the cache's stats()
+        """
+        with self._lock:
+            caches = list(self._caches.items())
+        return {
+            'created': self.created,
+            'reused': self.reused,
+            'dropped': self.dropped,
+            'caches': {key: table.stats() for key, (table, _) in caches},
+        }
+
+
+# Pool shared by every game in the process.
+shared_pool = StrategyPool()
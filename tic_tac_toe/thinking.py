@@ -0,0 +1,152 @@
+"""Background AI thinking with cooperative cancellation.
+
+The AI move runs on a worker thread so the terminal stays responsive.
+Strategies that search read their ``cancel_token`` and, once it is
+cancelled or its think time is up, stop and return the best move found
+so far. Cancelling never kills a thread: it asks the search to finish.
+"""
+
+import threading
+import time
+
+
+class SearchCancelled(Exception):
+    """Raised inside a search to unwind it once its token has expired."""
+
+
+class CancellationToken:
+    """Cancellation flag with an optional think-time deadline."""
+
+    def __init__(self, max_time=None):
+        """Create a token.
+
+        Args:
+            max_time: Seconds until the token expires by itself, or None
+        """
+        self._event = threading.Event()
+        self.deadline = None if max_time is None else time.perf_counter() + max_time
+
+    def cancel(self):
+        """Ask the search to stop as soon as it can."""
+        self._event.set()
+
+    @property
+    def cancelled(self):
+        """True once cancel() has been called."""
+        return self._event.is_set()
+
+    def expired(self):
+        """Check whether the search should stop.
+
+        Returns:
+            True if cancelled or past the deadline
+        """
+        return self._event.is_set() or (
+            self.deadline is not None and time.perf_counter() > self.deadline)
+
+    def check(self):
+        """Raise SearchCancelled if the token has expired."""
+        if self.expired():
+            raise SearchCancelled
+
+
+# Default token of every strategy: never expires.
+NEVER_CANCELLED = CancellationToken()
+
+
+class MoveWorker:
+    """Runs one strategy.get_move() call on a daemon thread."""
+
+    def __init__(self, strategy, board, think_time=None, on_done=None, **kwargs):
+        """Prepare the call.
+
+        Args:
+            strategy: Strategy to ask for a move
+            board: Board handed to get_move()
+            think_time: Think-time cap in seconds, or None for no cap
+            on_done: Optional callable(worker) run on the worker thread
+                once the move (or error) is ready
+            **kwargs: Extra keyword arguments for get_move(), such as last_move
+        """
+        self.strategy = strategy
+        self.board = board
+        self.on_done = on_done
+        self.kwargs = kwargs
+        self.token = CancellationToken(think_time)
+        self._move = None
+        self._error = None
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        self.strategy.cancel_token = self.token
+        try:
+            self._move = self.strategy.get_move(self.board, **self.kwargs)
+        except BaseException as error:  # Re-raised on the waiting thread
+            self._error = error
+        finally:
+            self.strategy.cancel_token = NEVER_CANCELLED
+        if self.on_done is not None:
+            self.on_done(self)
+
+    def start(self):
+        """Start thinking."""
+        self._thread.start()
+        return self
+
+    def cancel(self):
+        """Ask the strategy to return its best move so far."""
+        self.token.cancel()
+
+    def done(self):
+        """Check whether the move is ready."""
+        return not self._thread.is_alive()
+
+    def wait(self, timeout=None):
+        """Wait for the move.
+
+        Args:
+            timeout: Seconds to wait, or None to wait until done
+
+        Returns:
+            True if the move is ready
+        """
+        self._thread.join(timeout)
+        return self.done()
+
+    def result(self):
+        """Get the move, re-raising any error from the strategy.
+
+        Returns:
+            Move returned by get_move()
+        """
+        if threading.current_thread() is not self._thread:
+            self._thread.join()
+        if self._error is not None:
+            raise self._error
+        return self._move
+
+
+def wait_for_move(worker, on_tick=None, interval=0.1):
+    """Wait for a worker's move while keeping the caller responsive.
+
+    Ctrl+C cancels the search instead of the program: the strategy is
+    told to stop and its best move so far is returned.
+
+    Args:
+        worker: Started MoveWorker
+        on_tick: Optional callable(elapsed_seconds) run every interval,
+            e.g. to draw a spinner
+        interval: Seconds between ticks
+
+    Returns:
+        Move returned by the strategy
+    """
+    start = time.perf_counter()
+    while True:
+        try:
+            if worker.wait(interval):
+                return worker.result()
+            if on_tick:
+                on_tick(time.perf_counter() - start)
+        except KeyboardInterrupt:
+            worker.cancel()
@@ -0,0 +1,265 @@
+"""End-to-end headless throughput benchmark.
+
+Plays whole games through the same path as play_game(): a new
+TicTacToeGame per game, TicTacToeGame.play_turn() for every move with
+the board drawn before each turn, then ScoreTracker.record_result() and
+the move log. The human is replaced by a scripted player (a strategy
+from AIStrategyFactory playing X), the board is drawn into a null sink
+instead of the terminal, and scores and the move log are written to real
+files in a scratch directory.
+
+Time is split by layer:
+
+- ``ai``: computer moves, including the worker thread hand-off
+- ``player``: the scripted player's moves
+- ``rules``: judging each move (TicTacToeGame._judge_move)
+- ``render``: drawing the board
+- ``persist``: saving the score file and appending to the move log
+- ``other``: everything else, such as game set-up
+
+Games per second are then measured with 1, 2, ... processes playing at
+once, to show how throughput scales with the process count.
+
+Run with ``python -m tic_tac_toe.throughput --help``.
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
+from .ai_strategy import AIStrategyFactory
+from .constants import AI_THINK_TIME, PLAYER, COMPUTER, Difficulty
+from .game_coordinator import TicTacToeGame
+from .game_log import append_games
+from .headless import swap_markers
+from .rules import line_rule_set
+from .score_tracker import JsonFileScoreStorage, ScoreTracker
+
+LAYERS = ('ai', 'player', 'rules', 'render', 'persist', 'other')
+
+DEFAULT_GAMES = 200
+
+
+class NullSink:
+    """Text stream that discards everything written to it."""
+
+    def write(self, text):
+        return len(text)
+
+    def flush(self):
+        pass
+
+
+def scripted_player(difficulty=Difficulty.EASY, rule_set=None):
+    """Build a player_input callable that plays X with a strategy.
+
+    Args:
+        difficulty: Difficulty registered with AIStrategyFactory
+        rule_set: RuleSet of the game, defaults to a full line on the
+            standard board
+
+    Returns:
+        Callable(board, last_move=None) returning a move
+
+    Raises:
+        ValueError: If the strategy cannot play the rules
+    """
+    rules = rule_set or line_rule_set()
+    strategy = AIStrategyFactory.create(difficulty, rule_set=rules)
+    if rules.uses_last_move and not strategy.uses_last_move:
+        raise ValueError(f"strategy {difficulty} cannot play {rules.name} rules")
+    swap = {PLAYER: COMPUTER, COMPUTER: PLAYER}
+
+    def play(board, last_move=None):
+        # Strategies play COMPUTER; show them the board from X's side.
+        view = swap_markers(board)
+        if rules.uses_last_move:
+            move = strategy.get_move(view, last_move=last_move)
+        else:
+            move = strategy.get_move(view)
+        if move is not None and len(move) > 2:
+            # Moves name markers from the strategy's own point of view.
+            move = (move[0], move[1], swap[move[2]])
+        return move
+    return play
+
+
+def _timed(timings, layer, func):
+    """Wrap a callable so its run time is added to a layer."""
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            timings[layer] += time.perf_counter() - start
+    return wrapper
+
+
+def run_games(games=DEFAULT_GAMES, difficulty=Difficulty.HARD, player=Difficulty.EASY,
+              out_dir=None):
+    """Play games end to end and time each layer.
+
+    Args:
+        games: Number of games to play
+        difficulty: Difficulty the computer plays at
+        player: Difficulty of the scripted player
+        out_dir: Directory for the score file and move log, defaults to
+            a temporary directory
+
+    Returns:
+        Dictionary with 'games', 'seconds', 'games_per_second', 'layers'
+        (seconds per layer) and 'results' (count per GameResult)
+
+    Raises:
+        ValueError: If the scripted player cannot play the difficulty's
+            rules, or plays a move the game rejects
+    """
+    if out_dir is None:
+        with tempfile.TemporaryDirectory() as scratch:
+            return run_games(games, difficulty, player, scratch)
+
+    timings = dict.fromkeys(LAYERS, 0.0)
+    results = {}
+    tracker = ScoreTracker(JsonFileScoreStorage(os.path.join(out_dir, 'scores.json')))
+    record_result = _timed(timings, 'persist', tracker.record_result)
+    log_games = _timed(timings, 'persist', append_games)
+    log_path = os.path.join(out_dir, 'games.jsonl')
+    player_input = None
+
+    start = time.perf_counter()
+    with redirect_stdout(NullSink()):
+        for _ in range(games):
+            game = TicTacToeGame(tracker, think_time=AI_THINK_TIME)
+            game._computer_move = _timed(timings, 'ai', game._computer_move)
+            game._judge_move = _timed(timings, 'rules', game._judge_move)
+            game.display_board = _timed(timings, 'render', game.display_board)
+            game.set_difficulty(difficulty)
+            if player_input is None:
+                # Every game plays the same rules, so one player serves them all.
+                player_input = _timed(timings, 'player', scripted_player(player, game.rule_set))
+            game.player_input = player_input
+            game.start_new_game()
+
+            result = None
+            while not (result and result['reason'] in ('win', 'draw')):
+                game.display_board()
+                player_turn = game.game_state.is_player_turn()
+                result = game.play_turn()
+                if result is None and player_turn:
+                    # A scripted player would repeat the same move forever.
+                    raise ValueError(f"scripted player {player} made an illegal move")
+            game.display_board()
+
+            record_result(result['result'])
+            log_games(log_path, [game.game_record()])
+            results[result['result']] = results.get(result['result'], 0) + 1
+    seconds = time.perf_counter() - start
+    timings['other'] = max(seconds - sum(timings.values()), 0.0)
+    return {
+        'games': games,
+        'seconds': seconds,
+        'games_per_second': games / seconds if seconds else 0.0,
+        'layers': timings,
+        'results': results,
+    }
+
+
+def _run_worker(games, difficulty, player, out_dir, index):
+    """Play one process's share of a scaling run."""
+    worker_dir = os.path.join(out_dir, f"worker{index}")
+    os.makedirs(worker_dir, exist_ok=True)
+    return run_games(games, difficulty, player, worker_dir)
+
+
+def measure_scaling(process_counts=(1, 2, 4), games=DEFAULT_GAMES, difficulty=Difficulty.HARD,
+                    player=Difficulty.EASY):
+    """Measure total throughput with several processes playing at once.
+
+    Args:
+        process_counts: Process counts to try
+        games: Games played by each process
+        difficulty: Difficulty the computer plays at
+        player: Difficulty of the scripted player
+
+    Returns:
+        List of dictionaries with 'processes', 'games', 'seconds' (wall
+        time) and 'games_per_second' (over all processes)
+    """
+    rows = []
+    for processes in process_counts:
+        with tempfile.TemporaryDirectory() as scratch:
+            with ProcessPoolExecutor(max_workers=processes) as pool:
+                # Start the workers before the clock so start-up is not timed.
+                for future in [pool.submit(os.getpid) for _ in range(processes)]:
+                    future.result()
+                start = time.perf_counter()
+                futures = [pool.submit(_run_worker, games, difficulty, player, scratch, index)
+                           for index in range(processes)]
+                for future in futures:
+                    future.result()
+                seconds = time.perf_counter() - start
+        total = games * processes
+        rows.append({
+            'processes': processes,
+            'games': total,
+            'seconds': seconds,
+            'games_per_second': total / seconds if seconds else 0.0,
+        })
+    return rows
+
+
+def format_report(report, scaling=()):
+    """Format a benchmark run as plain-text tables.
+
+    Args:
+        report: Dictionary from run_games()
+        scaling: Rows from measure_scaling()
+
+    Returns:
+        Tables as a string
+    """
+    lines = [f"Games: {report['games']}  Seconds: {report['seconds']:.2f}  "
+             f"Games/s: {report['games_per_second']:,.1f}",
+             "",
+             f"{'Layer':<8} {'Seconds':>9} {'Share':>7} {'us/game':>10}"]
+    for layer in LAYERS:
+        seconds = report['layers'][layer]
+        share = seconds / report['seconds'] if report['seconds'] else 0.0
+        lines.append(f"{layer:<8} {seconds:>9.3f} {share:>7.1%} "
+                     f"{seconds / report['games'] * 1e6:>10,.0f}")
+    if scaling:
+        base = scaling[0]['games_per_second'] / scaling[0]['processes']
+        lines += ["", f"{'Processes':>9} {'Games':>8} {'Seconds':>9} {'Games/s':>10} {'Speed-up':>9}"]
+        for row in scaling:
+            speedup = row['games_per_second'] / base if base else 0.0
+            lines.append(f"{row['processes']:>9} {row['games']:>8} {row['seconds']:>9.2f} "
+                         f"{row['games_per_second']:>10,.1f} {speedup:>8.2f}x")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Measure whole-game throughput.")
+    parser.add_argument('--games', type=int, default=DEFAULT_GAMES,
+                        help="games per process (default: %(default)s)")
+    parser.add_argument('--difficulty', default=Difficulty.HARD,
+                        choices=AIStrategyFactory.registered(), help="computer difficulty")
+    parser.add_argument('--player', default=Difficulty.EASY,
+                        choices=AIStrategyFactory.registered(), help="scripted player strategy")
+    parser.add_argument('--processes', type=int, nargs='*', default=[1, 2, 4],
+                        help="process counts for the scaling table (none to skip)")
+    args = parser.parse_args(argv)
+
+    try:
+        report = run_games(args.games, args.difficulty, args.player)
+    except ValueError as error:
+        parser.error(str(error))
+    scaling = measure_scaling(args.processes, args.games, args.difficulty, args.player)
+    sys.stdout.write(format_report(report, scaling) + "\n")
+
+
+if __name__ == "__main__":
+    main()
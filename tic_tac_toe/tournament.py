@@ -0,0 +1,388 @@
+"""Round-robin strategy tournament for Tic-Tac-Toe.
+
+Plays every pair of strategies against each other on a process pool,
+streams each finished game to CSV, and estimates Elo ratings with
+bootstrap confidence intervals alongside the CPU cost per move.
+
+Games can be played on several rule variants (see VARIANTS); a strategy
+that cannot play a variant's rules sits that variant out.
+
+Run with ``python -m tic_tac_toe.tournament --help``.
+"""
+
+import argparse
+import csv
+import math
+import random
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from itertools import combinations
+from .ai_strategy import AIStrategyFactory
+from .constants import BOARD_VARIANTS, RULE_VARIANTS, PLAYER, COMPUTER
+from .game_log import format_record, game_record
+from .headless import new_board, play_headless_game
+from .rules import STANDARD, MISERE, WILD, get_rule_set, line_rule_set
+
+# Rule variants the tournament can schedule, mapped to their RuleSet.
+VARIANTS = {
+    'standard': get_rule_set(STANDARD),
+    'misere': get_rule_set(MISERE),
+    'wild': get_rule_set(WILD),
+    '4x4': line_rule_set(4),
+    '4x4-k3': line_rule_set(4, 3),
+}
+
+BASE_ELO = 1500
+
+CSV_FIELDS = [
+    'game_id', 'variant', 'x', 'o', 'seed', 'winner', 'reason',
+    'plies', 'x_cpu_ms', 'o_cpu_ms', 'x_moves', 'o_moves',
+]
+
+
+def plays_rules(strategy_class, rule_set):
+    """Check whether a strategy can play a rule set.
+
+    Args:
+        strategy_class: AIStrategy subclass
+        rule_set: RuleSet to play
+
+    Returns:
+        True if the strategy accepts the rules
+    """
+    if rule_set.uses_last_move and not strategy_class.uses_last_move:
+        return False
+    try:
+        strategy_class(rule_set=rule_set)
+    except ValueError:
+        return False
+    return True
+
+
+def schedule_games(entrants, games_per_pair, variants=('standard',), seed=0):
+    """Build the list of games for a round-robin tournament.
+
+    Sides alternate within each pairing so both strategies play X equally
+    often, and each game gets its own reproducible random seed. On each
+    variant only the entrants that can play its rules are paired.
+
+    Args:
+        entrants: Dictionary mapping strategy name to strategy class
+        games_per_pair: Games played by each pair on each variant
+        variants: Variant names from VARIANTS
+        seed: Base seed for the whole schedule
+
+    Returns:
+        List of task dictionaries accepted by play_scheduled_game()
+    """
+    rng = random.Random(seed)
+    tasks = []
+    for variant in variants:
+        if variant not in VARIANTS:
+            raise ValueError(f"Unknown variant: {variant}")
+        rules = VARIANTS[variant]
+        players = [name for name in sorted(entrants) if plays_rules(entrants[name], rules)]
+        for first, second in combinations(players, 2):
+            for n in range(games_per_pair):
+                x_name, o_name = (first, second) if n % 2 == 0 else (second, first)
+                tasks.append({
+                    'game_id': len(tasks),
+                    'variant': variant,
+                    'x': x_name,
+                    'o': o_name,
+                    'x_class': entrants[x_name],
+                    'o_class': entrants[o_name],
+                    'seed': rng.getrandbits(32),
+                })
+    return tasks
+
+
+def play_scheduled_game(task):
+    """Play one scheduled game. Runs inside a worker process.
+
+    Args:
+        task: Task dictionary from schedule_games()
+
+    Returns:
+        Result row with the fields listed in CSV_FIELDS, plus the moves
+    """
+    random.seed(task['seed'])
+    rules = VARIANTS[task['variant']]
+    outcome = play_headless_game(task['x_class'](rule_set=rules), task['o_class'](rule_set=rules),
+                                 board=new_board(rules.size), rule_set=rules)
+
+    winner = ''
+    if outcome['winner'] == PLAYER:
+        winner = task['x']
+    elif outcome['winner'] == COMPUTER:
+        winner = task['o']
+
+    return {
+        'game_id': task['game_id'],
+        'variant': task['variant'],
+        'x': task['x'],
+        'o': task['o'],
+        'seed': task['seed'],
+        'winner': winner,
+        'reason': outcome['reason'],
+        'plies': len(outcome['moves']),
+        'x_cpu_ms': outcome['cpu_time'][PLAYER] * 1000.0,
+        'o_cpu_ms': outcome['cpu_time'][COMPUTER] * 1000.0,
+        'x_moves': outcome['move_count'][PLAYER],
+        'o_moves': outcome['move_count'][COMPUTER],
+        'moves': outcome['moves'],
+    }
+
+
+def run_tournament(entrants=None, games_per_pair=10, variants=('standard',),
+                   workers=None, seed=0, csv_path=None, log_path=None):
+    """Run a round-robin tournament.
+
+    Args:
+        entrants: Dictionary mapping name to strategy class. Defaults to
+            every strategy registered with AIStrategyFactory for the
+            standard board (modes in BOARD_VARIANTS and RULE_VARIANTS are
+            left out). Custom classes
+            must be importable at module level so workers can unpickle them.
+        games_per_pair: Games played by each pair on each variant
+        variants: Variant names from VARIANTS
+        workers: Worker process count; 0 plays every game in this process,
+            None lets the pool choose
+        seed: Base seed for the schedule
+        csv_path: Optional CSV file that receives each game as it finishes
+        log_path: Optional move log (see game_log.py) the games are
+            appended to; each record names its O side as the difficulty,
+            as a game against the computer does, so the blunder analyzer
+            grades every strategy on the games it played as O
+
+    Returns:
+        List of result rows in completion order
+    """
+    if entrants is None:
+        entrants = {name: strategy for name, strategy in AIStrategyFactory.registered().items()
+                    if name not in BOARD_VARIANTS and name not in RULE_VARIANTS}
+    tasks = schedule_games(entrants, games_per_pair, variants, seed)
+    results = []
+
+    csv_file = open(csv_path, 'w', newline='') if csv_path else None
+    log_file = open(log_path, 'a') if log_path else None
+    try:
+        writer = None
+        if csv_file:
+            writer = csv.DictWriter(csv_file, fieldnames=CSV_FIELDS, extrasaction='ignore')
+            writer.writeheader()
+
+        def collect(row):
+            results.append(row)
+            if writer:
+                writer.writerow(row)
+                csv_file.flush()
+            if log_file:
+                log_file.write(format_record(game_record(
+                    row['moves'], row['x'], row['o'], difficulty=row['o'],
+                    rules=VARIANTS[row['variant']].name)))
+
+        if workers == 0:
+            for task in tasks:
+                collect(play_scheduled_game(task))
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = [pool.submit(play_scheduled_game, task) for task in tasks]
+                for future in as_completed(futures):
+                    collect(future.result())
+    finally:
+        if csv_file:
+            csv_file.close()
+        if log_file:
+            log_file.close()
+
+    return results
+
+
+def _pair_scores(games, prior_draws):
+    """Accumulate points and game counts per pair of strategies."""
+    points = {}
+    played = {}
+    for game in games:
+        x, o = game['x'], game['o']
+        if game['winner'] == x:
+            x_points = 1.0
+        elif game['winner'] == o:
+            x_points = 0.0
+        else:
+            x_points = 0.5
+        points[(x, o)] = points.get((x, o), 0.0) + x_points
+        points[(o, x)] = points.get((o, x), 0.0) + 1.0 - x_points
+        played[(x, o)] = played.get((x, o), 0) + 1
+        played[(o, x)] = played.get((o, x), 0) + 1
+
+    # Virtual draws keep ratings finite for strategies that never score.
+    for pair in list(played):
+        points[pair] += prior_draws / 2.0
+        played[pair] += prior_draws
+    return points, played
+
+
+def fit_elo(games, names=None, prior_draws=1.0, iterations=500):
+    """Fit Elo ratings to game results with the Bradley-Terry model.
+
+    Uses the minorization-maximization algorithm; draws count as half a
+    point for each side. Ratings are centred on BASE_ELO.
+
+    Args:
+        games: Result rows with 'x', 'o' and 'winner' keys
+        names: Strategy names to rate; defaults to every name in games
+        prior_draws: Virtual drawn games added to every pairing
+        iterations: Maximum number of update rounds
+
+    Returns:
+        Dictionary mapping name to Elo rating
+    """
+    if names is None:
+        names = sorted({g['x'] for g in games} | {g['o'] for g in games})
+    points, played = _pair_scores(games, prior_draws)
+    strength = {name: 1.0 for name in names}
+
+    for _ in range(iterations):
+        updated = {}
+        for name in names:
+            wins = 0.0
+            denominator = 0.0
+            for other in names:
+                n = played.get((name, other), 0)
+                if n:
+                    wins += points[(name, other)]
+                    denominator += n / (strength[name] + strength[other])
+            updated[name] = wins / denominator if denominator else strength[name]
+
+        log_mean = sum(math.log(s) for s in updated.values()) / len(updated)
+        scale = math.exp(log_mean)
+        updated = {name: s / scale for name, s in updated.items()}
+        converged = all(abs(updated[n] - strength[n]) < 1e-9 for n in names)
+        strength = updated
+        if converged:
+            break
+
+    return {name: BASE_ELO + 400.0 * math.log10(s) for name, s in strength.items()}
+
+
+def elo_confidence_intervals(games, samples=200, confidence=0.95, seed=0,
+                             prior_draws=1.0):
+    """Estimate Elo confidence intervals by bootstrapping over games.
+
+    Args:
+        games: Result rows with 'x', 'o' and 'winner' keys
+        samples: Number of bootstrap resamples
+        confidence: Two-sided confidence level
+        seed: Seed for the resampling
+        prior_draws: Virtual drawn games added to every pairing
+
+    Returns:
+        Dictionary mapping name to (low, high) Elo bounds
+    """
+    names = sorted({g['x'] for g in games} | {g['o'] for g in games})
+    rng = random.Random(seed)
+    ratings = {name: [] for name in names}
+    for _ in range(samples):
+        resample = [rng.choice(games) for _ in games]
+        for name, elo in fit_elo(resample, names, prior_draws).items():
+            ratings[name].append(elo)
+
+    tail = (1.0 - confidence) / 2.0
+    intervals = {}
+    for name, values in ratings.items():
+        values.sort()
+        low = values[int(tail * (len(values) - 1))]
+        high = values[int((1.0 - tail) * (len(values) - 1))]
+        intervals[name] = (low, high)
+    return intervals
+
+
+def summarize(games, samples=200, seed=0):
+    """Summarize strength and CPU cost per strategy.
+
+    Args:
+        games: Result rows from run_tournament()
+        samples: Bootstrap resamples for the confidence intervals
+        seed: Seed for the resampling
+
+    Returns:
+        List of per-strategy dictionaries sorted by Elo, strongest first
+    """
+    if not games:
+        return []
+    elo = fit_elo(games)
+    intervals = elo_confidence_intervals(games, samples=samples, seed=seed)
+
+    stats = {name: {'games': 0, 'points': 0.0, 'cpu_ms': 0.0, 'moves': 0} for name in elo}
+    for game in games:
+        for side in ('x', 'o'):
+            name = game[side]
+            stats[name]['games'] += 1
+            stats[name]['cpu_ms'] += game[f'{side}_cpu_ms']
+            stats[name]['moves'] += game[f'{side}_moves']
+            if game['winner'] == name:
+                stats[name]['points'] += 1.0
+            elif not game['winner']:
+                stats[name]['points'] += 0.5
+
+    summary = []
+    for name, s in stats.items():
+        summary.append({
+            'name': name,
+            'elo': elo[name],
+            'elo_low': intervals[name][0],
+            'elo_high': intervals[name][1],
+            'games': s['games'],
+            'score': s['points'] / s['games'] if s['games'] else 0.0,
+            'cpu_ms_per_move': s['cpu_ms'] / s['moves'] if s['moves'] else 0.0,
+        })
+    summary.sort(key=lambda row: row['elo'], reverse=True)
+    return summary
+
+
+def format_summary(summary):
+    """Format a summary as a plain-text table.
+
+    Args:
+        summary: Rows from summarize()
+
+    Returns:
+        Table as a string
+    """
+    lines = [f"{'Strategy':<12} {'Elo':>6} {'95% CI':>15} {'Games':>6} "
+             f"{'Score':>6} {'CPU ms/move':>12}"]
+    for row in summary:
+        ci = f"{row['elo_low']:.0f}..{row['elo_high']:.0f}"
+        lines.append(
+            f"{row['name']:<12} {row['elo']:>6.0f} {ci:>15} {row['games']:>6} "
+            f"{row['score']:>6.2f} {row['cpu_ms_per_move']:>12.3f}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Round-robin AI strategy tournament.")
+    parser.add_argument('--games', type=int, default=20, help="games per pair per variant")
+    parser.add_argument('--variants', nargs='+', default=['standard'], choices=sorted(VARIANTS))
+    parser.add_argument('--workers', type=int, default=None, help="worker processes (0 = serial)")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--csv', dest='csv_path', default=None, help="stream results to this CSV file")
+    parser.add_argument('--log', dest='log_path', default=None, help="append games to this move log")
+    parser.add_argument('--bootstrap', type=int, default=200, help="bootstrap resamples for Elo CI")
+    args = parser.parse_args(argv)
+
+    games = run_tournament(
+        games_per_pair=args.games,
+        variants=args.variants,
+        workers=args.workers,
+        seed=args.seed,
+        csv_path=args.csv_path,
+        log_path=args.log_path,
+    )
+    sys.stdout.write(format_summary(summarize(games, samples=args.bootstrap, seed=args.seed)) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,203 @@
+"""Low-overhead tracing of the game loop.
+
+Code marks the phases it wants timed with spans:
+
+    with span('ai'):
+        move = strategy.get_move(board)
+
+While tracing is off (the default) span() returns one shared do-nothing
+context manager, so a traced phase costs one attribute check. Once
+enabled, every finished span is appended to a ring buffer of the most
+recent events; old events are dropped instead of growing memory in a
+long session.
+
+The buffer exports as Chrome trace JSON, which chrome://tracing and
+Perfetto (ui.perfetto.dev) open as a timeline with nested spans per
+thread. The game loop records these phases:
+
+- ``game``: one whole game
+- ``turn``: one TicTacToeGame.play_turn()
+- ``input``: waiting for the player's move
+- ``ai``: the computer thinking, including the worker thread hand-off
+- ``rules``: judging a move
+- ``render``: drawing the board
+- ``persist``: saving the score file and appending to the move log
+
+Run the game with ``python run_game.py --trace trace.json`` to write a
+trace when it ends.
+"""
+
+import json
+import os
+import threading
+import time
+from collections import deque
+
+DEFAULT_TRACE_EVENTS = 100_000
+
+
+class _Span:
+    """Times one phase and records it in a tracer when it ends."""
+
+    __slots__ = ('tracer', 'name', 'args', 'start')
+
+    def __init__(self, tracer, name, args):
+        self.tracer = tracer
+        self.name = name
+        self.args = args
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.tracer.record(self.name, self.start, time.perf_counter_ns() - self.start, self.args)
+        return False
+
+
+class _NullSpan:
+    """Span used while tracing is off."""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+NULL_SPAN = _NullSpan()
+
+
+class Tracer:
+    """Ring buffer of finished spans."""
+
+    def __init__(self, capacity=DEFAULT_TRACE_EVENTS):
+        """Create a disabled tracer.
+
+        Args:
+            capacity: Most events kept; older events are dropped
+        """
+        self.enabled = False
+        self.recorded = 0
+        self._events = deque(maxlen=capacity)
+
+    @property
+    def capacity(self):
+        """Most events kept."""
+        return self._events.maxlen
+
+    @property
+    def dropped(self):
+        """Events recorded but no longer in the buffer."""
+        return self.recorded - len(self._events)
+
+    def enable(self, capacity=None):
+        """Start recording spans.
+
+        Args:
+            capacity: New buffer size, or None to keep the current one
+        """
+        if capacity is not None and capacity != self.capacity:
+            self._events = deque(self._events, maxlen=capacity)
+        self.enabled = True
+
+    def disable(self):
+        """Stop recording spans; recorded events are kept."""
+        self.enabled = False
+
+    def clear(self):
+        """Drop all recorded events."""
+        self._events.clear()
+        self.recorded = 0
+
+    def span(self, name, **args):
+        """Context manager timing one phase.
+
+        Args:
+            name: Phase name
+            **args: Details shown with the span in the trace viewer
+
+        Returns:
+            Context manager; a shared no-op while tracing is off
+        """
+        if not self.enabled:
+            return NULL_SPAN
+        return _Span(self, name, args)
+
+    def record(self, name, start, duration, args=None):
+        """Add a finished span to the buffer.
+
+        Args:
+            name: Phase name
+            start: Start time from time.perf_counter_ns()
+            duration: Duration in nanoseconds
+            args: Optional dictionary of details
+        """
+        # deque.append is atomic, so worker threads may record too.
+        self._events.append((name, start, duration, threading.get_ident(), args))
+        self.recorded += 1
+
+    def events(self):
+        """Recorded events, oldest first.
+
+        Returns:
+            List of (name, start_ns, duration_ns, thread_id, args) tuples
+        """
+        return list(self._events)
+
+    def chrome_trace(self):
+        """Build a Chrome trace of the recorded events.
+
+        Returns:
+            Dictionary in the Chrome trace event format
+        """
+        pid = os.getpid()
+        trace_events = []
+        for name, start, duration, thread_id, args in self._events:
+            event = {
+                'name': name,
+                'cat': 'game',
+                'ph': 'X',
+                'ts': start / 1000,
+                'dur': duration / 1000,
+                'pid': pid,
+                'tid': thread_id,
+            }
+            if args:
+                event['args'] = args
+            trace_events.append(event)
+        return {
+            'traceEvents': trace_events,
+            'displayTimeUnit': 'ms',
+            'otherData': {'recorded': self.recorded, 'dropped': self.dropped},
+        }
+
+    def export_chrome(self, path):
+        """Write the recorded events as a Chrome trace JSON file.
+
+        Args:
+            path: Output file path
+        """
+        with open(path, 'w') as f:
+            json.dump(self.chrome_trace(), f, default=str)
+
+
+# Process-wide tracer used by the game loop.
+tracer = Tracer()
+
+
+def span(name, **args):
+    """Context manager timing one phase with the process-wide tracer.
+
+    Args:
+        name: Phase name
+        **args: Details shown with the span in the trace viewer
+
+    Returns:
+        Context manager; a shared no-op while tracing is off
+    """
+    if not tracer.enabled:
+        return NULL_SPAN
+    return _Span(tracer, name, args)
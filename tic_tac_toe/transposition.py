@@ -0,0 +1,255 @@
+"""Bounded transposition table for game-tree search.
+
+Entries live in preallocated parallel arrays sized from a memory cap, so
+the table never grows. Slots are grouped into buckets; when a bucket is
+full the replacement policy picks a victim:
+
+- ``'depth'``: evict the shallowest entry (the cheapest to recompute),
+  preferring entries left over from earlier searches on ties.
+- ``'age'``: evict an entry from an earlier search first, shallowest
+  among those, and fall back to the shallowest entry.
+
+A search result is stored with a bound flag so alpha-beta callers can
+reuse results found with a narrower window.
+"""
+
+import threading
+from array import array
+
+EXACT = 0
+LOWER = 1
+UPPER = 2
+
+NO_MOVE = -1
+
+# Bytes per slot: key (8) + value (4) + depth (2) + move (2) + age (2) + flag (1)
+ENTRY_BYTES = 19
+
+REPLACEMENT_POLICIES = ('depth', 'age')
+
+# Zeroes copied over the age array by clear(), a block at a time.
+_ZERO_BLOCK = memoryview(bytes(4096))
+
+
+class TranspositionTable:
+    """Fixed-size hash table of search results."""
+
+    def __init__(self, max_mb=2.0, bucket_size=4, policy='depth'):
+        """Allocate the table.
+
+        Args:
+            max_mb: Memory cap in megabytes
+            bucket_size: Slots per bucket
+            policy: Replacement policy, 'depth' or 'age'
+        """
+        if policy not in REPLACEMENT_POLICIES:
+            raise ValueError(f"Unknown replacement policy: {policy}")
+        self.policy = policy
+        self.bucket_size = bucket_size
+        self.bucket_count = max(1, int(max_mb * 1024 * 1024) // (ENTRY_BYTES * bucket_size))
+        self.capacity = self.bucket_count * bucket_size
+
+        self._keys = array('Q', [0]) * self.capacity
+        self._values = array('i', [0]) * self.capacity
+        self._depths = array('h', [0]) * self.capacity
+        self._moves = array('h', [NO_MOVE]) * self.capacity
+        # Age 0 marks an empty slot; searches count generations from 1.
+        self._ages = array('H', [0]) * self.capacity
+        self._flags = array('b', [0]) * self.capacity
+
+        self.generation = 1
+        self.filled = 0
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+
+    @property
+    def memory_bytes(self):
+        """Bytes held by the entry arrays."""
+        return self.capacity * ENTRY_BYTES
+
+    def probe(self, key):
+        """Look up a position.
+
+        Args:
+            key: 64-bit position hash
+
+        Returns:
+            Tuple of (value, depth, flag, move) or None; move is a flat cell
+            index or NO_MOVE
+        """
+        start = (key % self.bucket_count) * self.bucket_size
+        keys = self._keys
+        ages = self._ages
+        for slot in range(start, start + self.bucket_size):
+            if ages[slot] and keys[slot] == key:
+                self.hits += 1
+                return self._values[slot], self._depths[slot], self._flags[slot], self._moves[slot]
+        self.misses += 1
+        return None
+
+    def store(self, key, value, depth, flag=EXACT, move=NO_MOVE):
+        """Record a search result.
+
+        Args:
+            key: 64-bit position hash
+            value: Integer score
+            depth: Search depth (or remaining plies) behind the score
+            flag: EXACT, LOWER or UPPER bound
+            move: Best move as a flat cell index, or NO_MOVE
+        """
+        start = (key % self.bucket_count) * self.bucket_size
+        keys = self._keys
+        ages = self._ages
+        depths = self._depths
+        generation = self.generation
+
+        slot = None
+        victim = None
+        victim_rank = None
+        for candidate in range(start, start + self.bucket_size):
+            if not ages[candidate]:
+                if slot is None:
+                    slot = candidate
+                continue
+            if keys[candidate] == key:
+                slot = candidate
+                break
+            stale = ages[candidate] != generation
+            if self.policy == 'age':
+                rank = (not stale, depths[candidate])
+            else:
+                rank = (depths[candidate], not stale)
+            if victim_rank is None or rank < victim_rank:
+                victim, victim_rank = candidate, rank
+
+        if slot is None:
+            slot = victim
+            self.evictions += 1
+        elif not ages[slot]:
+            self.filled += 1
+
+        keys[slot] = key
+        self._values[slot] = value
+        depths[slot] = depth
+        self._flags[slot] = flag
+        self._moves[slot] = move
+        ages[slot] = generation
+        self.stores += 1
+
+    def new_generation(self):
+        """Mark existing entries as belonging to an earlier search.
+
+        Entries stay usable but become preferred victims under the 'age'
+        policy and tie-break victims under 'depth'.
+        """
+        self.generation = self.generation % 0xFFFF + 1
+
+    def clear(self):
+        """Empty the table in place, without allocating."""
+        ages = memoryview(self._ages).cast('B')
+        block = len(_ZERO_BLOCK)
+        for start in range(0, len(ages), block):
+            end = min(start + block, len(ages))
+            ages[start:end] = _ZERO_BLOCK[:end - start]
+        self.generation = 1
+        self.filled = 0
+
+    def stats(self):
+        """Get usage counters.
+
+        Returns:
+            Dictionary with hits, misses, hit_rate, stores, evictions,
+            filled slots, capacity and memory_bytes
+        """
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'stores': self.stores,
+            'evictions': self.evictions,
+            'filled': self.filled,
+            'capacity': self.capacity,
+            'memory_bytes': self.memory_bytes,
+        }
+
+
+class StripedTranspositionTable:
+    """Thread-safe transposition table made of locked shards.
+
+    Keys are spread over independent TranspositionTable shards, each with
+    its own lock, so concurrent searches rarely wait on each other. The
+    interface matches TranspositionTable, so it can be shared by several
+    strategies and sessions.
+    """
+
+    def __init__(self, max_mb=8.0, stripes=16, bucket_size=4, policy='depth'):
+        """Allocate the shards.
+
+        Args:
+            max_mb: Memory cap in megabytes, split evenly over the shards
+            stripes: Number of shards (and locks)
+            bucket_size: Slots per bucket
+            policy: Replacement policy, 'depth' or 'age'
+        """
+        self.stripes = stripes
+        self._shards = [TranspositionTable(max_mb / stripes, bucket_size, policy)
+                        for _ in range(stripes)]
+        self._locks = [threading.Lock() for _ in range(stripes)]
+
+    def _stripe(self, key):
+        # Shards index buckets with the low bits; pick the shard with the high ones.
+        return (key >> 40) % self.stripes
+
+    @property
+    def capacity(self):
+        """Total slots over all shards."""
+        return sum(shard.capacity for shard in self._shards)
+
+    @property
+    def memory_bytes(self):
+        """Bytes held by the entry arrays of all shards."""
+        return sum(shard.memory_bytes for shard in self._shards)
+
+    def probe(self, key):
+        """Look up a position; see TranspositionTable.probe()."""
+        stripe = self._stripe(key)
+        with self._locks[stripe]:
+            return self._shards[stripe].probe(key)
+
+    def store(self, key, value, depth, flag=EXACT, move=NO_MOVE):
+        """Record a search result; see TranspositionTable.store()."""
+        stripe = self._stripe(key)
+        with self._locks[stripe]:
+            self._shards[stripe].store(key, value, depth, flag, move)
+
+    def new_generation(self):
+        """Age the entries of every shard."""
+        for lock, shard in zip(self._locks, self._shards):
+            with lock:
+                shard.new_generation()
+
+    def clear(self):
+        """Empty every shard in place."""
+        for lock, shard in zip(self._locks, self._shards):
+            with lock:
+                shard.clear()
+
+    def stats(self):
+        """Get usage counters summed over the shards.
+
+        Returns:
+            Dictionary with the keys of TranspositionTable.stats()
+        """
+        totals = {'hits': 0, 'misses': 0, 'stores': 0, 'evictions': 0, 'filled': 0}
+        for lock, shard in zip(self._locks, self._shards):
+            with lock:
+                for name in totals:
+                    totals[name] += getattr(shard, name)
+        lookups = totals['hits'] + totals['misses']
+        totals['hit_rate'] = totals['hits'] / lookups if lookups else 0.0
+        totals['capacity'] = self.capacity
+        totals['memory_bytes'] = self.memory_bytes
+        return totals
@@ -15,6 +15,11 @@ from .constants import (
     TITLE,
     UI_WIDTH,
     BORDER_CHAR,
+    GOMOKU_SIZE,
+    GOMOKU_WIN_LENGTH,
+    ULTIMATE_SIZE,
+    QUBIC_SIZE,
+    SPINNER_FRAMES,
 )
 
 
@@ -53,11 +58,20 @@ def display_menu():
     )
     sys.stdout.write("\nNumber positions:\n")
     sys.stdout.write(" 1 2 3\n 4 5 6\n 7 8 9\n")
+    sys.stdout.write("\nModes:\n")
+    sys.stdout.write("  Classic 3x3 against Easy, Medium, Hard or Trained AI\n")
+    sys.stdout.write(f"  Gomoku: {GOMOKU_SIZE}x{GOMOKU_SIZE} board, {GOMOKU_WIN_LENGTH} in a row wins\n")
+    sys.stdout.write("  Solve: Gomoku against an AI that searches for forced wins\n")
+    sys.stdout.write(f"  Ultimate: {ULTIMATE_SIZE}x{ULTIMATE_SIZE} board of nine games; your move\n")
+    sys.stdout.write("    picks the small board your opponent plays in next\n")
+    sys.stdout.write(f"  Qubic: {QUBIC_SIZE} in a row in a {QUBIC_SIZE}x{QUBIC_SIZE}x{QUBIC_SIZE} cube;"
+                     " the input grid shows\n    the layers as quadrants, layer 1 top left\n")
     sys.stdout.write("\nControls:\n")
     sys.stdout.write("  Arrow keys: Navigate cursor\n")
     sys.stdout.write(f"  Enter: Place your {style(PLAYER, bold=True)}\n")
     sys.stdout.write("  Ctrl+C: Cancel move or quit game\n")
     sys.stdout.write("  'q': Quit move selection mode\n")
+    sys.stdout.write("  'u' / 'r': Undo / redo your last turn\n")
     print_footer()
 
 
@@ -69,9 +83,36 @@ def display_instructions():
     sys.stdout.write(f"  Enter: Place your {style(PLAYER, bold=True)}\n")
     sys.stdout.write("  Ctrl+C: Cancel move or quit game\n")
     sys.stdout.write("  'q': Quit move selection mode\n")
+    sys.stdout.write("  'u' / 'r': Undo / redo your last turn\n")
     print_footer()
 
 
+def display_illegal_move():
+    """Explain a move outside the sub-board the last move sent to."""
+    sys.stdout.write(
+        style("You must play in the small board matching your opponent's last cell "
+              "(anywhere if that board is finished).", RED) + "\n"
+    )
+
+
+def display_thinking(elapsed):
+    """Redraw the spinner shown while the computer thinks.
+
+    Args:
+        elapsed: Seconds spent thinking so far
+    """
+    frame = SPINNER_FRAMES[int(elapsed * 10) % len(SPINNER_FRAMES)]
+    sys.stdout.write(style(f"\rComputer is thinking {frame} {elapsed:4.1f}s  "
+                           "(Ctrl+C to move now)", dim=True))
+    sys.stdout.flush()
+
+
+def clear_thinking():
+    """Erase the spinner line."""
+    sys.stdout.write("\r\033[K")
+    sys.stdout.flush()
+
+
 def display_result(result):
     """Display game result.
 
@@ -113,6 +154,11 @@ def get_difficulty_input():
         '1': Difficulty.EASY,
         '2': Difficulty.MEDIUM,
         '3': Difficulty.HARD,
+        '4': Difficulty.TRAINED,
+        '5': Difficulty.GOMOKU,
+        '6': Difficulty.ULTIMATE,
+        '7': Difficulty.QUBIC,
+        '8': Difficulty.SOLVE,
     }
     while True:
         choice = input(
@@ -120,11 +166,16 @@ def get_difficulty_input():
             "1 - Easy (random moves)\n"
             "2 - Medium (basic strategy)\n"
             "3 - Hard (perfect play)\n"
-            "Enter your choice (1-3): "
+            "4 - Trained (self-play learner, between Medium and Hard)\n"
+            "5 - Gomoku (15x15 board, five in a row)\n"
+            "6 - Ultimate (nine boards in one)\n"
+            "7 - Qubic (4x4x4 cube, four in a row)\n"
+            "8 - Solve (15x15 five in a row, proves forced wins)\n"
+            "Enter your choice (1-8): "
         ).strip()
         if choice in choices:
             return choices[choice]
-        sys.stdout.write(style("Invalid choice. Please enter 1, 2, or 3.", RED) + "\n")
+        sys.stdout.write(style("Invalid choice. Please enter a number from 1 to 8.", RED) + "\n")
 
 
 def display_play_again_prompt():
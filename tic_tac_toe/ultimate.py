@@ -0,0 +1,320 @@
+"""Ultimate Tic-Tac-Toe engine.
+
+The 9x9 board is nine 3x3 sub-boards. Winning a sub-board claims that
+cell of a 3x3 meta-board, and three claimed cells in a row win the game.
+A move in cell `pos` of a sub-board sends the opponent to sub-board
+`pos`; if that sub-board is already won or full they may play in any
+open sub-board.
+
+Each side's stones are one 9-bit mask per sub-board plus a 9-bit mask of
+won sub-boards, so line checks are table lookups and a move or an undo
+touches a handful of integers. Sub-boards and cells inside them are
+numbered 0-8 row by row.
+"""
+
+import time
+from .constants import PLAYER, COMPUTER
+
+SUB_SIZE = 3
+FULL = 0x1FF
+
+# The eight lines of a 3x3 board as 9-bit masks.
+LINES = (0x007, 0x038, 0x1C0, 0x049, 0x092, 0x124, 0x111, 0x054)
+
+# WINNING[mask]: True if the mask contains a complete line.
+WINNING = tuple(any(mask & line == line for line in LINES) for mask in range(FULL + 1))
+
+POPCOUNT = tuple(bin(mask).count('1') for mask in range(FULL + 1))
+
+# Centre sub-boards take part in more meta lines than corners, corners more than sides.
+SUB_WEIGHTS = (3, 2, 3, 2, 4, 2, 3, 2, 3)
+
+WIN_SCORE = 100000
+SUB_WIN_SCORE = 20
+META_TWO_SCORE = 60
+SUB_TWO_SCORE = 2
+
+DEFAULT_SEARCH_DEPTH = 6
+DEFAULT_THINK_TIME = 1.0
+
+
+def split_cell(row, col):
+    """Convert board coordinates to (sub-board, cell) numbers."""
+    return (row // SUB_SIZE) * SUB_SIZE + col // SUB_SIZE, (row % SUB_SIZE) * SUB_SIZE + col % SUB_SIZE
+
+
+def join_cell(sub, pos):
+    """Convert (sub-board, cell) numbers to board coordinates."""
+    return ((sub // SUB_SIZE) * SUB_SIZE + pos // SUB_SIZE,
+            (sub % SUB_SIZE) * SUB_SIZE + pos % SUB_SIZE)
+
+
+def opponent(marker):
+    """Get the other side's marker."""
+    return COMPUTER if marker == PLAYER else PLAYER
+
+
+class UltimateBoard:
+    """Bitmask position of an Ultimate Tic-Tac-Toe game."""
+
+    __slots__ = ('subs', 'meta', 'closed', 'forced', '_history')
+
+    def __init__(self):
+        """Create an empty position."""
+        self.subs = {PLAYER: [0] * 9, COMPUTER: [0] * 9}
+        self.meta = {PLAYER: 0, COMPUTER: 0}
+        self.closed = 0
+        self.forced = -1
+        self._history = []
+
+    @classmethod
+    def from_board(cls, board, last_move=None):
+        """Load a 9x9 nested-list board.
+
+        Args:
+            board: Current board state
+            last_move: (row, col) of the move just played, which decides
+                the sub-board to play in; None allows any open sub-board
+
+        Returns:
+            UltimateBoard instance
+        """
+        position = cls()
+        for row, cells in enumerate(board):
+            for col, cell in enumerate(cells):
+                if cell != ' ':
+                    sub, pos = split_cell(row, col)
+                    position.subs[cell][sub] |= 1 << pos
+        for sub in range(9):
+            for marker in (PLAYER, COMPUTER):
+                if WINNING[position.subs[marker][sub]]:
+                    position.meta[marker] |= 1 << sub
+            if position._decided(sub):
+                position.closed |= 1 << sub
+        if last_move is not None:
+            target = split_cell(*last_move)[1]
+            position.forced = -1 if position.closed >> target & 1 else target
+        return position
+
+    def _decided(self, sub):
+        """Check whether a sub-board is won or full."""
+        x, o = self.subs[PLAYER][sub], self.subs[COMPUTER][sub]
+        return WINNING[x] or WINNING[o] or (x | o) == FULL
+
+    def open_subs(self):
+        """Get the sub-boards the side to move may play in."""
+        if self.forced >= 0:
+            return (self.forced,)
+        closed = self.closed
+        return tuple(sub for sub in range(9) if not closed >> sub & 1)
+
+    def moves(self):
+        """Get the legal moves.
+
+        Returns:
+            List of (sub, pos) tuples; empty once the game is over
+        """
+        if WINNING[self.meta[PLAYER]] or WINNING[self.meta[COMPUTER]]:
+            return []
+        x, o = self.subs[PLAYER], self.subs[COMPUTER]
+        moves = []
+        for sub in self.open_subs():
+            free = ~(x[sub] | o[sub]) & FULL
+            while free:
+                bit = free & -free
+                moves.append((sub, bit.bit_length() - 1))
+                free ^= bit
+        return moves
+
+    def play(self, sub, pos, marker):
+        """Make a move; undo() takes it back.
+
+        Args:
+            sub: Sub-board number
+            pos: Cell number inside the sub-board
+            marker: Marker to place
+
+        Returns:
+            True if the move wins the game
+        """
+        self._history.append((sub, pos, marker, self.forced, self.closed, self.meta[marker]))
+        stones = self.subs[marker]
+        stones[sub] |= 1 << pos
+        if WINNING[stones[sub]]:
+            self.meta[marker] |= 1 << sub
+            self.closed |= 1 << sub
+        elif (stones[sub] | self.subs[opponent(marker)][sub]) == FULL:
+            self.closed |= 1 << sub
+        self.forced = -1 if self.closed >> pos & 1 else pos
+        return WINNING[self.meta[marker]]
+
+    def undo(self):
+        """Take back the most recent move."""
+        sub, pos, marker, self.forced, self.closed, self.meta[marker] = self._history.pop()
+        self.subs[marker][sub] &= ~(1 << pos)
+
+    def winner(self):
+        """Get the marker that has won the meta-board, or None."""
+        for marker in (PLAYER, COMPUTER):
+            if WINNING[self.meta[marker]]:
+                return marker
+        return None
+
+    def winning_cells(self, marker):
+        """Get the board cells that show a meta-board win.
+
+        Args:
+            marker: Marker that won
+
+        Returns:
+            List of (row, col) tuples covering the winning line of each
+            claimed sub-board on the winning meta line, or None
+        """
+        meta = self.meta[marker]
+        for meta_line in LINES:
+            if meta & meta_line == meta_line:
+                cells = []
+                for sub in range(9):
+                    if meta_line >> sub & 1:
+                        stones = self.subs[marker][sub]
+                        line = next(line for line in LINES if stones & line == line)
+                        cells.extend(join_cell(sub, pos) for pos in range(9) if line >> pos & 1)
+                return sorted(cells)
+        return None
+
+    def evaluate(self, marker):
+        """Score the position heuristically for one side.
+
+        Counts won sub-boards, weighted by position, open two-in-a-rows on
+        the meta-board, and open two-in-a-rows inside undecided sub-boards.
+
+        Args:
+            marker: Side to score for
+
+        Returns:
+            Integer score, positive when `marker` stands better
+        """
+        score = 0
+        other = opponent(marker)
+        drawn = self.closed & ~(self.meta[PLAYER] | self.meta[COMPUTER])
+        for side, sign in ((marker, 1), (other, -1)):
+            meta = self.meta[side]
+            blocked = self.meta[opponent(side)] | drawn
+            own, theirs = self.subs[side], self.subs[opponent(side)]
+            for sub in range(9):
+                if meta >> sub & 1:
+                    score += sign * SUB_WIN_SCORE * SUB_WEIGHTS[sub]
+                elif not self.closed >> sub & 1:
+                    mine, against = own[sub], theirs[sub]
+                    for line in LINES:
+                        if not against & line and POPCOUNT[mine & line] == 2:
+                            score += sign * SUB_TWO_SCORE * SUB_WEIGHTS[sub]
+            for line in LINES:
+                if not blocked & line and POPCOUNT[meta & line] == 2:
+                    score += sign * META_TWO_SCORE
+        return score
+
+
+class SearchTimeout(Exception):
+    """Raised inside the search when the think time runs out."""
+
+
+def search_move(position, marker, max_depth=DEFAULT_SEARCH_DEPTH, max_time=DEFAULT_THINK_TIME,
+                stop=None):
+    """Choose a move with iterative-deepening alpha-beta search.
+
+    Each completed depth replaces the chosen move, and its best move is
+    searched first at the next depth. When the think time runs out, or
+    `stop` says so, the move from the deepest completed search is returned.
+
+    Args:
+        position: UltimateBoard with `marker` to move (restored on return)
+        marker: Side to move
+        max_depth: Deepest search in plies
+        max_time: Think time in seconds, or None for no limit
+        stop: Optional callable polled during the search; True ends it
+
+    Returns:
+        (sub, pos) of the chosen move, or None if there are no moves
+    """
+    moves = position.moves()
+    if not moves:
+        return None
+    deadline = None if max_time is None else time.perf_counter() + max_time
+    nodes = [0]
+
+    def out_of_time():
+        return ((deadline is not None and time.perf_counter() > deadline)
+                or (stop is not None and stop()))
+
+    def ordered(moves, side):
+        """Sort moves: sub-board wins, then blocks, then the rest;
+        moves that free the opponent to play anywhere go last."""
+        own, theirs = position.subs[side], position.subs[opponent(side)]
+        closed = position.closed
+
+        def key(move):
+            sub, pos = move
+            bit = 1 << pos
+            rank = 0
+            if WINNING[own[sub] | bit]:
+                rank -= 4
+            elif WINNING[theirs[sub] | bit]:
+                rank -= 2
+            if closed >> pos & 1 or pos == sub:
+                rank += 1
+            return rank
+
+        return sorted(moves, key=key)
+
+    def negamax(side, depth, alpha, beta, ply):
+        nodes[0] += 1
+        if nodes[0] & 1023 == 0 and out_of_time():
+            raise SearchTimeout
+        moves = position.moves()
+        if not moves:
+            return 0
+        if depth == 0:
+            return position.evaluate(side)
+        other = opponent(side)
+        best = -WIN_SCORE - 1
+        for sub, pos in ordered(moves, side):
+            if position.play(sub, pos, side):
+                score = WIN_SCORE - ply
+            else:
+                score = -negamax(other, depth - 1, -beta, -alpha, ply + 1)
+            position.undo()
+            if score > best:
+                best = score
+            if best > alpha:
+                alpha = best
+            if alpha >= beta:
+                break
+        return best
+
+    best_move = ordered(moves, marker)[0]
+    other = opponent(marker)
+    for depth in range(1, max_depth + 1):
+        root = ordered(moves, marker)
+        root.remove(best_move)
+        root.insert(0, best_move)
+        alpha = -WIN_SCORE - 1
+        chosen = None
+        history_length = len(position._history)
+        try:
+            for sub, pos in root:
+                if position.play(sub, pos, marker):
+                    score = WIN_SCORE
+                else:
+                    score = -negamax(other, depth - 1, -WIN_SCORE - 1, -alpha, 1)
+                position.undo()
+                if score > alpha:
+                    alpha, chosen = score, (sub, pos)
+        except SearchTimeout:
+            while len(position._history) > history_length:
+                position.undo()
+            break
+        best_move = chosen
+        if alpha >= WIN_SCORE - depth:
+            break
+    return best_move
@@ -0,0 +1,175 @@
+"""Self-play training of afterstate value tables for Tic-Tac-Toe.
+
+A value table holds one float per base-3 board encoding: the expected
+result (1 win, 0.5 draw, 0 loss) for the side that has just moved, with
+the board always seen from that side as COMPUTER. Both sides of a
+self-play game therefore share one table, and picking a move is a single
+lookup per legal move.
+
+Training is TD(0) over the headless game loop with epsilon-greedy
+exploration.
+"""
+
+import random
+from array import array
+from functools import lru_cache
+from .constants import BOARD_SIZE, PLAYER, COMPUTER
+from .encoding import encode_base3, POWERS_OF_3, DIGITS
+from .headless import play_headless_game
+
+TABLE_SIZE = 3 ** (BOARD_SIZE * BOARD_SIZE)
+DEFAULT_EPISODES = 10000
+DEFAULT_SEED = 2024
+
+
+def new_value_table():
+    """Create an untrained table with every value at 0.5.
+
+    Returns:
+        array('f') of length TABLE_SIZE
+    """
+    return array('f', [0.5]) * TABLE_SIZE
+
+
+def afterstate_values(table, board):
+    """Look up the value of every legal COMPUTER move.
+
+    Args:
+        table: Value table
+        board: Current board state (not modified)
+
+    Returns:
+        List of (value, (row, col), afterstate code) tuples
+    """
+    code = encode_base3(board)
+    step = DIGITS[COMPUTER]
+    options = []
+    index = 0
+    for i, row in enumerate(board):
+        for j, cell in enumerate(row):
+            if cell == ' ':
+                child = code + step * POWERS_OF_3[index]
+                options.append((table[child], (i, j), child))
+            index += 1
+    return options
+
+
+class _SelfPlayLearner:
+    """Epsilon-greedy player that records its afterstates for training."""
+
+    def __init__(self, table, epsilon, rng):
+        self.table = table
+        self.epsilon = epsilon
+        self.rng = rng
+        self.afterstates = []
+
+    def get_move(self, board):
+        options = afterstate_values(self.table, board)
+        if not options:
+            return None
+        if self.rng.random() < self.epsilon:
+            _, move, child = self.rng.choice(options)
+            greedy = False
+        else:
+            best = max(value for value, _, _ in options)
+            _, move, child = self.rng.choice([o for o in options if o[0] == best])
+            greedy = True
+        self.afterstates.append((child, greedy))
+        return move
+
+
+def _td_update(table, afterstates, reward, moved_last, alpha):
+    """Back up one game's result through a player's afterstates.
+
+    Args:
+        table: Value table (modified in place)
+        afterstates: List of (code, greedy) in the order they were played
+        reward: Final result for this player
+        moved_last: True if this player's last afterstate ended the game
+        alpha: Learning rate
+    """
+    if not afterstates:
+        return
+    last, _ = afterstates[-1]
+    if moved_last:
+        table[last] = reward
+    else:
+        table[last] += alpha * (reward - table[last])
+
+    # Exploratory moves do not back up into the state that preceded them.
+    for i in range(len(afterstates) - 2, -1, -1):
+        code, _ = afterstates[i]
+        next_code, next_greedy = afterstates[i + 1]
+        if next_greedy:
+            table[code] += alpha * (table[next_code] - table[code])
+
+
+def train_value_table(episodes=DEFAULT_EPISODES, alpha=0.2, epsilon=0.1,
+                      seed=DEFAULT_SEED, table=None):
+    """Train a value table through self-play.
+
+    Args:
+        episodes: Number of self-play games
+        alpha: Learning rate
+        epsilon: Probability of an exploratory random move
+        seed: Seed for exploration and tie-breaking
+        table: Existing table to keep training, or None to start fresh
+
+    Returns:
+        Trained value table
+    """
+    table = table if table is not None else new_value_table()
+    rng = random.Random(seed)
+
+    for _ in range(episodes):
+        x_learner = _SelfPlayLearner(table, epsilon, rng)
+        o_learner = _SelfPlayLearner(table, epsilon, rng)
+        outcome = play_headless_game(x_learner, o_learner)
+        last_marker = PLAYER if len(outcome['moves']) % 2 == 1 else COMPUTER
+
+        for marker, learner in ((PLAYER, x_learner), (COMPUTER, o_learner)):
+            if outcome['winner'] is None:
+                reward = 0.5
+            else:
+                reward = 1.0 if outcome['winner'] == marker else 0.0
+            _td_update(table, learner.afterstates, reward, marker == last_marker, alpha)
+
+    return table
+
+
+def save_value_table(table, path):
+    """Write a value table to a binary file.
+
+    Args:
+        table: Value table
+        path: Destination file path
+    """
+    with open(path, 'wb') as f:
+        table.tofile(f)
+
+
+def load_value_table(path):
+    """Read a value table written by save_value_table().
+
+    Args:
+        path: Source file path
+
+    Returns:
+        Value table
+    """
+    table = array('f')
+    with open(path, 'rb') as f:
+        table.fromfile(f, TABLE_SIZE)
+    return table
+
+
+@lru_cache(maxsize=None)
+def default_value_table():
+    """Get the shared table trained with the default settings.
+
+    Training is deterministic and runs once per process.
+
+    Returns:
+        Value table (treat as read-only)
+    """
+    return train_value_table()
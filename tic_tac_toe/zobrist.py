@@ -0,0 +1,160 @@
+"""Zobrist hashing for Tic-Tac-Toe positions.
+
+Each (cell, marker) pair owns a random 64-bit key and a position hashes
+to the XOR of the keys of its occupied cells, so a move or an undo
+updates the hash with a single XOR. Keys come from a fixed seed and are
+therefore stable across processes and runs, which makes them usable as
+persistent cache and archive keys.
+
+The side to move is not part of the board hash: in normal play it
+follows from the number of markers on the board. Search code that can
+meet one board with either side to move XORs in ``side_key``.
+"""
+
+import random
+from functools import lru_cache
+from .constants import BOARD_SIZE, PLAYER, COMPUTER
+
+ZOBRIST_SEED = 0x7AC7AC70E
+
+
+def symmetry_permutations(size=BOARD_SIZE):
+    """Get the eight board symmetries as cell index permutations.
+
+    Args:
+        size: Board dimension
+
+    Returns:
+        Tuple of 8 tuples; entry t maps a cell index to its image under
+        symmetry t. Entry 0 is the identity.
+    """
+    last = size - 1
+    transforms = (
+        lambda r, c: (r, c),
+        lambda r, c: (c, last - r),
+        lambda r, c: (last - r, last - c),
+        lambda r, c: (last - c, r),
+        lambda r, c: (r, last - c),
+        lambda r, c: (last - r, c),
+        lambda r, c: (c, r),
+        lambda r, c: (last - c, last - r),
+    )
+    perms = []
+    for transform in transforms:
+        perm = []
+        for index in range(size * size):
+            r, c = transform(*divmod(index, size))
+            perm.append(r * size + c)
+        perms.append(tuple(perm))
+    return tuple(perms)
+
+
+class ZobristTable:
+    """Random keys for one board size."""
+
+    def __init__(self, size=BOARD_SIZE, seed=ZOBRIST_SEED):
+        """Generate keys for a board size.
+
+        Args:
+            size: Board dimension
+            seed: Seed for the key generator
+        """
+        rng = random.Random(seed + size)
+        cells = size * size
+        self.size = size
+        self.keys = {
+            PLAYER: tuple(rng.getrandbits(64) for _ in range(cells)),
+            COMPUTER: tuple(rng.getrandbits(64) for _ in range(cells)),
+        }
+        self.side_key = rng.getrandbits(64)
+        self.permutations = symmetry_permutations(size)
+        # symmetric_keys[marker][index][t]: key of `index` under symmetry t
+        self.symmetric_keys = {
+            marker: tuple(
+                tuple(keys[perm[index]] for perm in self.permutations)
+                for index in range(cells)
+            )
+            for marker, keys in self.keys.items()
+        }
+
+    def hash_cells(self, cells):
+        """Hash a flat list of cells from scratch.
+
+        Args:
+            cells: Flat sequence of markers, row by row
+
+        Returns:
+            64-bit hash
+        """
+        key = 0
+        for index, marker in enumerate(cells):
+            if marker != ' ':
+                key ^= self.keys[marker][index]
+        return key
+
+    def hash_board(self, board):
+        """Hash a nested-list board from scratch.
+
+        Args:
+            board: Current board state
+
+        Returns:
+            64-bit hash
+        """
+        return self.hash_cells([cell for row in board for cell in row])
+
+    def symmetric_hashes(self, cells):
+        """Hash a flat list of cells under all eight symmetries.
+
+        Args:
+            cells: Flat sequence of markers, row by row
+
+        Returns:
+            List of 8 hashes; index 0 is the plain hash
+        """
+        hashes = [0] * 8
+        for index, marker in enumerate(cells):
+            if marker != ' ':
+                for t, key in enumerate(self.symmetric_keys[marker][index]):
+                    hashes[t] ^= key
+        return hashes
+
+    def canonical_hash(self, board):
+        """Hash a board so that all symmetric positions share one key.
+
+        Args:
+            board: Current board state
+
+        Returns:
+            Smallest of the eight symmetric hashes
+        """
+        return min(self.symmetric_hashes([cell for row in board for cell in row]))
+
+    def update(self, key, row, col, marker):
+        """Toggle a marker on a cell in a plain hash.
+
+        The same call adds the marker after a move and removes it on undo.
+
+        Args:
+            key: Current hash
+            row: Row position
+            col: Column position
+            marker: Marker placed or removed
+
+        Returns:
+            Updated hash
+        """
+        return key ^ self.keys[marker][row * self.size + col]
+
+
+@lru_cache(maxsize=None)
+def get_table(size=BOARD_SIZE):
+    """Get the shared ZobristTable for a board size.
+
+    Args:
+        size: Board dimension
+
+    Returns:
+        ZobristTable instance
+    """
+    return ZobristTable(size)